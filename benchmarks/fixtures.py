@@ -0,0 +1,147 @@
+"""Synthetic command outputs shaped like the ones a Pardus/Debian host prints"""
+from datetime import datetime, timedelta, timezone
+from random import Random
+from typing import Iterable, List
+
+ARCHITECTURES = ["amd64", "all", "i386"]
+REPOSITORIES = ["yirmiuc", "yirmiuc-updates", "yirmiuc-security", "yirmiuc-backports"]
+TAGS = ["", "[installed]", "[installed,automatic]", "[upgradable from: 1.0-1]", "[installed,local]"]
+STATES = [("loaded", "active", "running"), ("loaded", "active", "exited"), ("loaded", "inactive", "dead"),
+          ("not-found", "inactive", "dead"), ("loaded", "failed", "failed")]
+
+
+def package_names(count: int) -> List[str]:
+    return [f"pkg{i:06d}-lib" for i in range(count)]
+
+
+def apt_list(count: int, seed: int = 0) -> bytes:
+    rng = Random(seed)
+    lines = ["Listing..."]
+    for name in package_names(count):
+        version = f"{rng.randint(0, 9)}.{rng.randint(0, 99)}.{rng.randint(0, 9)}-{rng.randint(1, 5)}"
+        tags = rng.choice(TAGS)
+        line = f"{name}/{rng.choice(REPOSITORIES)} {version} {rng.choice(ARCHITECTURES)}"
+        lines.append(f"{line} {tags}" if tags else line)
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+def versions(count: int, seed: int = 0) -> List[str]:
+    rng = Random(seed)
+    result = []
+    for _ in range(count):
+        version = f"{rng.randint(0, 9)}.{rng.randint(0, 99)}.{rng.randint(0, 9)}"
+        if rng.random() < 0.1:
+            version = f"{rng.randint(1, 3)}:{version}"
+
+        if rng.random() < 0.2:
+            version += rng.choice(["~rc1", "~beta2", "+dfsg", "+git20230101", "a"])
+
+        version += f"-{rng.randint(1, 5)}"
+        if rng.random() < 0.3:
+            version += rng.choice(["+deb12u1", "ubuntu1", "~bpo12+1", "pardus1"])
+
+        result.append(version)
+
+    return result
+
+
+def dpkg_query(count: int, seed: int = 0) -> bytes:
+    # Installed half of the packages of `apt_list`, as printed by the query of Apt.shared_list_records
+    rng = Random(seed)
+    lines = []
+    for name in package_names(count):
+        version = f"{rng.randint(0, 9)}.{rng.randint(0, 99)}.{rng.randint(0, 9)}-{rng.randint(1, 5)}"
+        if rng.random() < 0.5:
+            lines.append(f"{name}\t{version}\tinstalled\t{rng.choice(ARCHITECTURES)}")
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+def apt_search(count: int, seed: int = 0) -> bytes:
+    rng = Random(seed)
+    lines = ["Sorting...", "Full Text Search..."]
+    for name in package_names(count):
+        version = f"{rng.randint(0, 9)}.{rng.randint(0, 99)}-{rng.randint(1, 5)}"
+        tags = rng.choice(TAGS)
+        line = f"{name}/{rng.choice(REPOSITORIES)} {version} {rng.choice(ARCHITECTURES)}"
+        lines += [f"{line} {tags}" if tags else line, f"  Synthetic library number {name[3:9]} for benchmarks", ""]
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+def apt_cache_search(count: int, seed: int = 0, vocabulary: int = 5000) -> bytes:
+    rng = Random(seed)
+    words = [f"{rng.choice('bcdfglmnprst')}{rng.choice('aeiou')}{rng.choice('klmnrst')}{i}" for i in range(vocabulary)]
+    lines = []
+    for name in package_names(count):
+        lines.append(f"{name} - {' '.join(rng.choices(words, k=rng.randint(3, 8)))}")
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+def apt_show(depends: int = 40) -> bytes:
+    lines = [
+        "Package: pardus-benchmark",
+        "Version: 1.0-1",
+        "Priority: optional",
+        "Section: utils",
+        "Maintainer: Pardus <dev@pardus.org.tr>",
+        "Installed-Size: 1024 kB",
+        "Depends: " + ", ".join(f"pkg{i:06d}-lib (>= 1.0)" for i in range(depends)),
+        "Homepage: https://www.pardus.org.tr",
+        "APT-Sources: http://depo.pardus.org.tr/pardus yirmiuc/main amd64 Packages",
+        "Description: Synthetic package for benchmarks",
+        " A long description that spans",
+        " several continuation lines.",
+        "",
+    ]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def sources(count: int) -> bytes:
+    lines = []
+    for i in range(count):
+        options = "[arch=amd64 signed-by=/usr/share/keyrings/pardus.gpg] " if i % 2 else ""
+        lines.append(f"deb {options}http://mirror{i}.pardus.org.tr/pardus {REPOSITORIES[i % 4]} main contrib non-free")
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+def apt_policy(packages: Iterable[str], installed: bool = False) -> bytes:
+    lines = []
+    for name in packages:
+        lines += [
+            f"{name}:",
+            f"  Installed: {'1.0-1' if installed else '(none)'}",
+            "  Candidate: 1.0-1",
+            "  Version table:",
+            "     1.0-1 500",
+            "        500 http://depo.pardus.org.tr/pardus yirmiuc/main amd64 Packages",
+        ]
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+def units(count: int, seed: int = 0) -> bytes:
+    rng = Random(seed)
+    lines = []
+    for i in range(count):
+        load, active, sub = rng.choice(STATES)
+        lines.append(f"unit{i:04d}.service {load} {active} {sub} Synthetic unit number {i}")
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+def journal(count: int, seed: int = 0) -> bytes:
+    rng = Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=3)))
+    lines = [f"-- Journal begins at {start.isoformat()} --"]
+    for i in range(count):
+        timestamp = (start + timedelta(seconds=i)).strftime("%Y-%m-%dT%H:%M:%S%z")
+        lines.append(f"{timestamp} host{rng.randint(0, 9)} systemd[1]: Synthetic message {i} of unit{i % 600:04d}.service")
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+CONFIG = b"[global]\nworkgroup = PARDUS\nserver string = Samba %v\n\n[share]\npath = /srv/share\nread only = no\n"
@@ -0,0 +1,113 @@
+"""Fleet scale benchmark of the *List classes against simulated hosts
+
+    PYTHONPATH=src python -m benchmarks.fleet --hosts 10 100 1000 --latency 0.05 --output fleet.json
+"""
+import argparse
+import logging
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional
+
+from pardus import AptList, ConfigList, ServiceList
+from pardus.apt.package_index import PACKAGE_INDEXES
+from pardus.connection.model_connector import ModelConnector
+
+from benchmarks import report
+from benchmarks.simulated import CONFIG_PATH, SimulatedConnector, responses
+
+OPERATIONS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "apt.update": lambda fleet: fleet["apt"].update(),
+    "apt.update_fresh": lambda fleet: fleet["apt"].update(max_age=3600),
+    "apt.list": lambda fleet: fleet["apt"].list(),
+    "apt.shared_list": lambda fleet: fleet["apt"].shared_list_records(),
+    "apt.install": lambda fleet: fleet["apt"].install("pardus-benchmark"),
+    "service.restart": lambda fleet: fleet["service"].restart("pardus.service"),
+    "service.logs": lambda fleet: fleet["service"].logs("pardus.service"),
+    "config.setitem": lambda fleet: fleet["config"].__setitem__("benchmark", {"key": "value"}),
+}
+
+
+def build(connectors: List[ModelConnector], operation: str, workers: int,
+          timeout: Optional[float]) -> Dict[str, Any]:
+    logger = logging.getLogger("benchmarks")
+    if operation.startswith("apt."):
+        return {"apt": AptList.from_connections(connectors, logger=logger, max_workers=workers, timeout=timeout)}
+
+    if operation.startswith("service."):
+        return {"service": ServiceList.from_connections(connectors, logger=logger, max_workers=workers, timeout=timeout)}
+
+    return {"config": ConfigList.from_connections(connectors, CONFIG_PATH, logger=logger)}
+
+
+def failures(result: Any) -> int:
+    if isinstance(result, dict):
+        return len([each for each in result.values() if not getattr(each, "ok", True)])
+
+    return 0
+
+
+def measure(operation: str, hosts: int, args: argparse.Namespace) -> Dict[str, Any]:
+    outputs = responses(packages=args.packages, log_lines=args.log_lines)
+    connectors = [
+        SimulatedConnector(f"host-{i}", outputs, latency=args.latency, jitter=args.jitter,
+                           bandwidth=args.bandwidth, failure_rate=args.failure_rate, seed=args.seed + i)
+        for i in range(hosts)
+    ]
+    fleet = build(list(connectors), operation, args.workers, args.timeout)
+    # Every run starts without parsed package lists
+    PACKAGE_INDEXES.clear()
+
+    for connector in connectors:
+        connector.reset()
+        connector.active = True
+
+    error = None
+    start = monotonic()
+    try:
+        result = OPERATIONS[operation](fleet)
+    except Exception as e:
+        result = None
+        error = repr(e)
+    wall = monotonic() - start
+
+    for connector in connectors:
+        connector.active = False
+
+    # The latency of a host is the time from the start of the operation until its last round trip finished
+    completions = [connector.finished - start for connector in connectors if connector.finished is not None]
+    return {
+        "operation": operation,
+        "hosts": hosts,
+        "wall": wall,
+        "throughput": hosts / wall if wall else 0.0,
+        "latency": report.summary(completions),
+        "round_trips": sum(connector.round_trips for connector in connectors),
+        "failures": failures(result),
+        "error": error,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--operations", nargs="+", choices=sorted(OPERATIONS), default=list(OPERATIONS))
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per round trip")
+    parser.add_argument("--jitter", type=float, default=0.01, help="seconds added or removed at random")
+    parser.add_argument("--bandwidth", type=float, default=None, help="bytes per second, unlimited by default")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="probability of a round trip failing")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=None, help="deadline of a fleet operation")
+    parser.add_argument("--packages", type=int, default=5000, help="lines of `apt list` output")
+    parser.add_argument("--log-lines", type=int, default=2000, help="lines of `journalctl` output")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file to write, stdout by default")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("benchmarks").setLevel(logging.CRITICAL)
+
+    results = [measure(operation, hosts, args) for hosts in args.hosts for operation in args.operations]
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    report.write("fleet", config, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Micro-benchmark of the output parsers
+
+    PYTHONPATH=src python -m benchmarks.parsers --repeat 5 --output parsers.json
+
+A directory of captured outputs can replace the synthetic fixtures. Files are looked up by fixture name, for example
+`apt_list.txt` holding the output of `apt list` taken from a real host.
+"""
+import argparse
+import gc
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pardus.apt.parsers import parse_list, parse_repositories, parse_search, parse_show
+from pardus.service.parsers import parse_logs, parse_units
+from pardus.utils.common import iter_lines
+
+from benchmarks import fixtures, report
+
+FIXTURES: Dict[str, Callable[[], bytes]] = {
+    "apt_list": lambda: fixtures.apt_list(70000),
+    "apt_search": lambda: fixtures.apt_search(10000),
+    "apt_show": lambda: fixtures.apt_show(),
+    "sources": lambda: fixtures.sources(50),
+    "units": lambda: fixtures.units(600),
+    "journal": lambda: fixtures.journal(50000),
+}
+
+PARSERS: Dict[str, Any] = {
+    "apt.list": ("apt_list", lambda lines: list(parse_list(lines))),
+    "apt.search": ("apt_search", lambda lines: list(parse_search(lines))),
+    "apt.show": ("apt_show", parse_show),
+    "apt.repositories": ("sources", lambda lines: list(parse_repositories(lines))),
+    "service.list": ("units", lambda lines: list(parse_units(lines))),
+    "service.logs": ("journal", lambda lines: list(parse_logs(lines))),
+}
+
+
+def load(name: str, captures: Optional[Path]) -> bytes:
+    if captures is not None and (captures / f"{name}.txt").exists():
+        return (captures / f"{name}.txt").read_bytes()
+
+    return FIXTURES[name]()
+
+
+def timed(parser: Callable[[Iterable[str]], Any], lines: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = perf_counter()
+        parser(iter(lines))
+        best = min(best, perf_counter() - start)
+
+    return best
+
+
+def allocations(parser: Callable[[Iterable[str]], Any], lines: List[str]) -> Dict[str, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = parser(iter(lines))
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    statistics = snapshot.statistics("filename")
+    del result
+    return {
+        "peak_bytes": peak,
+        "retained_bytes": sum(stat.size for stat in statistics),
+        "retained_blocks": sum(stat.count for stat in statistics),
+    }
+
+
+def measure(name: str, parser: Callable[[Iterable[str]], Any], output: bytes, repeat: int) -> Dict[str, Any]:
+    lines = list(iter_lines(output.splitlines(keepends=True)))
+    seconds = timed(parser, lines, repeat)
+    return {
+        "parser": name,
+        "lines": len(lines),
+        "bytes": len(output),
+        "seconds": seconds,
+        "lines_per_second": len(lines) / seconds if seconds else 0.0,
+        **allocations(parser, lines),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parsers", nargs="+", choices=sorted(PARSERS), default=list(PARSERS))
+    parser.add_argument("--repeat", type=int, default=5, help="the best of this many runs is reported")
+    parser.add_argument("--captures", type=Path, default=None, help="directory of captured outputs")
+    parser.add_argument("--output", default=None, help="JSON file to write, stdout by default")
+    args = parser.parse_args(argv)
+
+    outputs: Dict[str, bytes] = {}
+    results = []
+    for name in args.parsers:
+        fixture, function = PARSERS[name]
+        if fixture not in outputs:
+            outputs[fixture] = load(fixture, args.captures)
+
+        results.append(measure(name, function, outputs[fixture], args.repeat))
+
+    config = {"repeat": args.repeat, "captures": None if args.captures is None else str(args.captures)}
+    report.write("parsers", config, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import json
+import platform
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    index = min(int(round(q / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summary(values: Sequence[float]) -> Dict[str, float]:
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values, default=0.0),
+    }
+
+
+def write(benchmark: str, config: Dict[str, Any], results: List[Dict[str, Any]], output: Optional[str] = None) -> None:
+    document = {
+        "benchmark": benchmark,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+    if output is None:
+        json.dump(document, sys.stdout, indent=1)
+        sys.stdout.write("\n")
+        return
+
+    with open(output, "w") as f:
+        json.dump(document, f, indent=1)
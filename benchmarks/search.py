@@ -0,0 +1,58 @@
+"""Micro-benchmark of the local package search index
+
+    PYTHONPATH=src python -m benchmarks.search --packages 70000 --queries 200 --output search.json
+
+The index is built from a synthetic `apt-cache search .` output, then random token, prefix and substring queries are
+timed one by one. The latency percentiles of each query kind are reported.
+"""
+import argparse
+from random import Random
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from pardus.apt.parsers import parse_cache_search
+from pardus.apt.search_index import SearchIndex, tokens_of
+from pardus.utils.common import iter_lines
+
+from benchmarks import fixtures, report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packages", type=int, default=70000)
+    parser.add_argument("--queries", type=int, default=200, help="queries of each kind")
+    parser.add_argument("--limit", type=int, default=None, help="hits returned per query")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file to write, stdout by default")
+    args = parser.parse_args(argv)
+
+    rng = Random(args.seed)
+    output = fixtures.apt_cache_search(args.packages, seed=args.seed)
+
+    start = perf_counter()
+    index = SearchIndex(parse_cache_search(iter_lines(output.splitlines(keepends=True))))
+    results: List[Dict[str, Any]] = [{"query": "build", "packages": len(index), "seconds": perf_counter() - start}]
+
+    words = [token for description in rng.sample(index.descriptions, args.queries) for token in tokens_of(description)]
+    queries = {
+        "token": [rng.choice(words) for _ in range(args.queries)],
+        "prefix": [rng.choice(words)[:rng.randint(2, 4)] for _ in range(args.queries)],
+        "substring": [rng.choice(index.names)[3:rng.randint(6, 9)] for _ in range(args.queries)],
+    }
+    for kind, texts in queries.items():
+        search = getattr(index, kind)
+        latencies = []
+        hits = 0
+        for text in texts:
+            start = perf_counter()
+            hits += len(search(text, limit=args.limit))
+            latencies.append(perf_counter() - start)
+
+        results.append({"query": kind, "queries": len(texts), "mean_hits": hits / len(texts), **report.summary(latencies)})
+
+    config = {"packages": args.packages, "queries": args.queries, "limit": args.limit, "seed": args.seed}
+    report.write("search", config, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from random import Random
+from threading import Lock
+from time import monotonic, sleep
+from typing import List, Optional, Sequence, Tuple
+
+from pardus.connection.model_connector import ModelConnector
+from pardus.connection.result import CommandResult
+
+from benchmarks import fixtures
+
+
+CONFIG_PATH = "/etc/pardus/benchmark.conf"
+
+
+class SimulatedFailure(ConnectionError):
+    """The simulated host dropped the command"""
+
+
+class SimulatedConnector(ModelConnector):
+    """A fake host answering like a Pardus machine after a simulated network delay
+
+    Every round trip costs `latency` seconds, give or take up to `jitter`, plus the time it takes to move the
+    output at `bandwidth` bytes per second. A round trip fails with `failure_rate` probability. Delays and failures
+    only happen while `active` is set, so fleets can be set up for free.
+    """
+
+    def __init__(self, address: str, responses: Sequence[Tuple[str, bytes]], latency: float = 0.05,
+                 jitter: float = 0.0, bandwidth: Optional[float] = None, failure_rate: float = 0.0,
+                 seed: int = 0) -> None:
+        self.address = address
+        self.responses = responses
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.failure_rate = failure_rate
+        self.active = False
+
+        self.round_trips = 0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.__random = Random(seed)
+        self.__lock = Lock()
+
+    def reset(self) -> None:
+        self.round_trips = 0
+        self.started = None
+        self.finished = None
+
+    def close(self) -> None:
+        pass
+
+    def run(self, command: str, timeout: Optional[float] = None) -> CommandResult:
+        return self.__round_trip([command], timeout)[0]
+
+    def sudo_run(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> CommandResult:
+        return self.__round_trip([command], timeout)[0]
+
+    def run_many(self, commands: Sequence[str], timeout: Optional[float] = None) -> List[CommandResult]:
+        return self.__round_trip(commands, timeout)
+
+    def sudo_run_many(self, commands: Sequence[str], passwd: Optional[str] = None,
+                      timeout: Optional[float] = None) -> List[CommandResult]:
+        return self.__round_trip(commands, timeout)
+
+    def respond(self, command: str) -> bytes:
+        for needle, output in self.responses:
+            if needle in command:
+                return output
+
+        return b""
+
+    def __round_trip(self, commands: Sequence[str], timeout: Optional[float] = None) -> List[CommandResult]:
+        outputs = [self.respond(command) for command in commands]
+        if not self.active:
+            return [CommandResult(command=command, stdout=output) for command, output in zip(commands, outputs)]
+
+        with self.__lock:
+            start = monotonic()
+            if self.started is None:
+                self.started = start
+            self.round_trips += 1
+            delay = max(self.latency + self.__random.uniform(-self.jitter, self.jitter), 0.0)
+            failed = self.__random.random() < self.failure_rate
+
+        if self.bandwidth:
+            delay += sum(len(output) for output in outputs) / self.bandwidth
+
+        sleep(delay)
+        with self.__lock:
+            self.finished = monotonic()
+
+        if failed:
+            raise SimulatedFailure(f"{self.address} dropped `{commands[0]}`")
+
+        return [
+            CommandResult(command=command, stdout=output, duration=monotonic() - start)
+            for command, output in zip(commands, outputs)
+        ]
+
+
+def responses(packages: int = 5000, log_lines: int = 2000, unit_count: int = 600) -> List[Tuple[str, bytes]]:
+    """Canned outputs, looked up in order by a substring of the command"""
+    return [
+        # Every host has the same package lists
+        ("sha256sum", b"e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855  -\n"),
+        ("dpkg-query", fixtures.dpkg_query(packages)),
+        # Package lists were refreshed recently everywhere
+        ("-mmin", b"PARDUS_LISTS_FRESH\n"),
+        ("apt list", fixtures.apt_list(packages)),
+        ("apt-cache policy", fixtures.apt_policy(["pardus-benchmark"])),
+        ("journalctl", fixtures.journal(log_lines)),
+        ("systemctl list-units --all --no-pager --no-legend ", b"pardus.service loaded active running Pardus\n"),
+        ("systemctl list-units", fixtures.units(unit_count)),
+        # Only the config itself exists, so every backup name is free
+        (f"test -e {CONFIG_PATH} &&", b"exist\n"),
+        ("cat ", fixtures.CONFIG),
+    ]
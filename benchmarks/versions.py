@@ -0,0 +1,77 @@
+"""Micro-benchmark of the Debian version comparison
+
+    PYTHONPATH=src python -m benchmarks.versions --comparisons 1000000 --distinct 5000 --output versions.json
+
+Random pairs are drawn from a pool of `--distinct` versions, the way fleet diffing sees the same few versions over and
+over. `cold` computes every sort key again, `memoized` goes through the cache of `version_key`.
+"""
+import argparse
+import gc
+from random import Random
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pardus.apt.version import compare_versions, version_key
+
+from benchmarks import fixtures, report
+
+
+def cold(first: str, second: str) -> int:
+    first_key = version_key.__wrapped__(first)  # type: ignore[attr-defined]
+    second_key = version_key.__wrapped__(second)  # type: ignore[attr-defined]
+    return (first_key > second_key) - (first_key < second_key)
+
+
+def timed(compare: Callable[[str, str], int], pairs: List[Tuple[str, str]]) -> float:
+    gc.collect()
+    start = perf_counter()
+    for first, second in pairs:
+        compare(first, second)
+
+    return perf_counter() - start
+
+
+def measure(name: str, compare: Callable[[str, str], int], pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
+    version_key.cache_clear()
+    seconds = timed(compare, pairs)
+    info = version_key.cache_info()
+    return {
+        "mode": name,
+        "comparisons": len(pairs),
+        "seconds": seconds,
+        "comparisons_per_second": len(pairs) / seconds if seconds else 0.0,
+        "cache_hits": info.hits,
+        "cache_misses": info.misses,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--comparisons", type=int, default=1000000)
+    parser.add_argument("--distinct", type=int, default=5000, help="number of distinct versions in the pool")
+    parser.add_argument("--cold", type=int, default=100000, help="comparisons of the uncached run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file to write, stdout by default")
+    args = parser.parse_args(argv)
+
+    rng = Random(args.seed)
+    pool = fixtures.versions(args.distinct, seed=args.seed)
+    pairs = [(rng.choice(pool), rng.choice(pool)) for _ in range(args.comparisons)]
+
+    results = [
+        measure("cold", cold, pairs[:args.cold]),
+        measure("memoized", compare_versions, pairs),
+    ]
+
+    version_key.cache_clear()
+    versions = [first for first, _ in pairs]
+    start = perf_counter()
+    sorted(versions, key=version_key)
+    results.append({"mode": "sort", "versions": len(versions), "seconds": perf_counter() - start})
+
+    config = {"comparisons": args.comparisons, "distinct": args.distinct, "cold": args.cold, "seed": args.seed}
+    report.write("versions", config, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
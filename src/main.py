@@ -10,10 +10,11 @@ from sys import argv
 from PyQt5 import QtWidgets, QtCore, Qt
 from PyQt5.QtCore import QSize
 
-from pardus import SSHConnector, Service, Apt, Config, ConfigRaw
+from pardus import SSHConnector, SSHPool, Service, ServiceList, Apt, Config, ConfigRaw
 from pardus.gui import Ui_MainWindow, Ui_FormAdd, GUIFunctions, Ui_FormServices, Ui_FormLog, Ui_FormApt, \
     Ui_FormPackageInfo, Ui_FormConfig
 from pardus.gui.functions import CustomQTreeWidgetItem
+from pardus.apt.search_index import SearchIndex
 
 
 def paginate_dict(d, items_per_page):
@@ -49,14 +50,15 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.gui_functions = GUIFunctions(self.logger)
 
         self.connections = {}
+        self.pool = SSHPool(logger=self.logger)
         self.mdiArea.subWindowList()
 
         self.treeWidget.installEventFilter(self)
 
     def load_it(self):
-        connection = SSHConnector("172.16.102.241", 22, "dns", "landofcanaan", self.logger)
+        connection = SSHConnector("172.16.102.241", 22, "dns", "landofcanaan", self.logger, pool=self.pool)
         self.gui_functions.add_to_connections(self, connection, self.treeWidget)
-        connection = SSHConnector("172.16.102.130", 22, "samba", "landofcanaan", self.logger)
+        connection = SSHConnector("172.16.102.130", 22, "samba", "landofcanaan", self.logger, pool=self.pool)
         self.gui_functions.add_to_connections(self, connection, self.treeWidget)
 
     def show_window(self, window):
@@ -71,7 +73,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             port = int(values[0].text(1))
             user_name = values[1].text(1)
             passwd = key.password
-            connection = SSHConnector(host, port, user_name, passwd, self.logger)
+            connection = SSHConnector(host, port, user_name, passwd, self.logger, pool=self.pool)
             connections_to_use.append(connection)
         self.show_window(ServicesForm(self, connections_to_use))
 
@@ -83,7 +85,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             port = int(values[0].text(1))
             user_name = values[1].text(1)
             passwd = key.password
-            connection = SSHConnector(host, port, user_name, passwd, self.logger)
+            connection = SSHConnector(host, port, user_name, passwd, self.logger, pool=self.pool)
             connections_to_use.append(connection)
         # {'package': 'zziplib-bin', 'repo': 'jammy',
         # 'version': '0.13.72+dfsg.1-1.1', 'arch': 'i386', 'tags': []}
@@ -97,7 +99,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             port = int(values[0].text(1))
             user_name = values[1].text(1)
             passwd = key.password
-            connection = SSHConnector(host, port, user_name, passwd, self.logger)
+            connection = SSHConnector(host, port, user_name, passwd, self.logger, pool=self.pool)
             connections_to_use.append(connection)
         self.show_window(ConfigureForm(self, connections_to_use))
 
@@ -220,13 +222,13 @@ class LogForm(QtWidgets.QWidget, Ui_FormLog):
 
     def load(self):
         data = []
-        for service in self.services:
-            try:
-                logs = service.logs(self.service_name)
-                for l in logs:
-                    data.append([service.connector.address] + list(l.values()))
-            except Exception as e:
-                self.parent.gui_functions.toast(self, f"{str(e)}@{service.connector.address}")
+        for service, result in self.services.logs(self.service_name).items():
+            if not result.ok:
+                self.parent.gui_functions.toast(self, f"{str(result.exception)}@{service.connector.address}")
+                continue
+
+            for l in result.value:
+                data.append([service.connector.address] + list(l.values()))
 
         self.parent.gui_functions.clear_table(self.tableWidget)
         self.parent.gui_functions.add_to_table(data, self.tableWidget)
@@ -261,6 +263,7 @@ class AptForm(QtWidgets.QWidget, Ui_FormApt):
 
         self.packages = self.load()
         self.filtered_packages = self.packages
+        self.all_packages, self.search_index = self.index(self.packages)
 
         self.fill()
         self.pushButtonNext.clicked.connect(self.next_page)
@@ -413,13 +416,23 @@ class AptForm(QtWidgets.QWidget, Ui_FormApt):
 
     def show_package(self):
         selected = self.parent.gui_functions.get_selected_packages(self.treeWidget)
+        package_names = [package_name.text(0) for package_name in selected.keys()]
 
-        for package_name in selected.keys():
-            for apt in self.apts:
-                try:
-                    self.parent.show_window(PackageInformationForm(self.parent, apt, package_name.text(0)))
-                except Exception as e:
-                    self.parent.gui_functions.toast(self, f"{str(e)}@{apt.connector.address}")
+        # One apt-cache call per host for all the selected packages
+        for apt in self.apts:
+            address = apt.connector.address
+            try:
+                information = apt.show_many(package_names)
+            except Exception as e:
+                self.parent.gui_functions.toast(self, f"{str(e)}@{address}")
+                continue
+
+            for package_name in package_names:
+                if package_name not in information:
+                    self.parent.gui_functions.toast(self, f"Package `{package_name}` not found@{address}")
+                    continue
+
+                self.parent.show_window(PackageInformationForm(self.parent, apt, package_name, information[package_name]))
 
     def fill(self):
         try:
@@ -461,13 +474,17 @@ class AptForm(QtWidgets.QWidget, Ui_FormApt):
 
         return paginate_dict(result, self.elements_per_page)
 
+    @staticmethod
+    def index(pages):
+        all_packages = {package: hosts for page in pages for package, hosts in page.items()}
+        return all_packages, SearchIndex((package, "") for package in all_packages)
+
     def search(self):
-        search_text = self.lineEditSearch.text().lower()
-        found_package = {}
-        for packages in self.packages:
-            for package in packages.keys():
-                if search_text in package:
-                    found_package[package] = packages[package]
+        # The names are indexed once after loading, not walked page by page on every keystroke
+        found_package = {
+            hit["name"]: self.all_packages[hit["name"]]
+            for hit in self.search_index.substring(self.lineEditSearch.text())
+        }
 
         self.current_page = 0
         self.filtered_packages = paginate_dict(found_package, self.elements_per_page)
@@ -475,7 +492,7 @@ class AptForm(QtWidgets.QWidget, Ui_FormApt):
 
 
 class PackageInformationForm(QtWidgets.QWidget, Ui_FormPackageInfo):
-    def __init__(self, parent, apt, package_name):
+    def __init__(self, parent, apt, package_name, information=None):
         super(PackageInformationForm, self).__init__(parent)
         self.parent = parent
         self.apt = apt
@@ -485,12 +502,15 @@ class PackageInformationForm(QtWidgets.QWidget, Ui_FormPackageInfo):
 
         self.setWindowTitle(f"Package Information @ {self.apt.connector.address}")
 
-        self.load()
+        self.load(information)
 
-        self.pushButtonReload.clicked.connect(self.load)
+        self.pushButtonReload.clicked.connect(lambda: self.load())
 
-    def load(self):
-        information = self.apt.show(self.package_name)
+    def load(self, information=None):
+        if information is None:
+            information = self.apt.show_many([self.package_name]).get(self.package_name, {})
+
+        information = dict(information)
         description = information.pop('Description', "")
         self.plainTextEditDescription.setPlainText(description)
         data = [
@@ -511,6 +531,7 @@ class ServicesForm(QtWidgets.QWidget, Ui_FormServices):
             Service(connection, logger=self.parent.logger)
             for connection in self.connections
         ]
+        self.service_list = ServiceList(self.services, logger=self.parent.logger)
         self.setupUi(self)
 
         self.load()
@@ -548,11 +569,7 @@ class ServicesForm(QtWidgets.QWidget, Ui_FormServices):
     def start(self):
         selected = self.parent.gui_functions.get_selected_services(self.treeWidget)
         for service_name in selected.keys():
-            for service in self.services:
-                try:
-                    service.start(service_name.text(0))
-                except Exception as e:
-                    self.parent.gui_functions.toast(self, f"{str(e)}@{service.connector.address}")
+            self.report(self.service_list.start(service_name.text(0)))
 
         self.load()
         self.search()
@@ -560,11 +577,7 @@ class ServicesForm(QtWidgets.QWidget, Ui_FormServices):
     def stop(self):
         selected = self.parent.gui_functions.get_selected_services(self.treeWidget)
         for service_name in selected.keys():
-            for service in self.services:
-                try:
-                    service.stop(service_name.text(0))
-                except Exception as e:
-                    self.parent.gui_functions.toast(self, f"{str(e)}@{service.connector.address}")
+            self.report(self.service_list.stop(service_name.text(0)))
 
         self.load()
         self.search()
@@ -572,11 +585,7 @@ class ServicesForm(QtWidgets.QWidget, Ui_FormServices):
     def restart(self):
         selected = self.parent.gui_functions.get_selected_services(self.treeWidget)
         for service_name in selected.keys():
-            for service in self.services:
-                try:
-                    service.restart(service_name.text(0))
-                except Exception as e:
-                    self.parent.gui_functions.toast(self, f"{str(e)}@{service.connector.address}")
+            self.report(self.service_list.restart(service_name.text(0)))
 
         self.load()
         self.search()
@@ -584,11 +593,7 @@ class ServicesForm(QtWidgets.QWidget, Ui_FormServices):
     def enable(self):
         selected = self.parent.gui_functions.get_selected_services(self.treeWidget)
         for service_name in selected.keys():
-            for service in self.services:
-                try:
-                    service.enable(service_name.text(0))
-                except Exception as e:
-                    self.parent.gui_functions.toast(self, f"{str(e)}@{service.connector.address}")
+            self.report(self.service_list.enable(service_name.text(0)))
 
         self.load()
         self.search()
@@ -596,25 +601,28 @@ class ServicesForm(QtWidgets.QWidget, Ui_FormServices):
     def disable(self):
         selected = self.parent.gui_functions.get_selected_services(self.treeWidget)
         for service_name in selected.keys():
-            for service in self.services:
-                try:
-                    service.disable(service_name.text(0))
-                except Exception as e:
-                    self.parent.gui_functions.toast(self, f"{str(e)}@{service.connector.address}")
+            self.report(self.service_list.disable(service_name.text(0)))
 
         self.load()
         self.search()
 
+    def report(self, results):
+        for service, result in results.items():
+            if not result.ok:
+                self.parent.gui_functions.toast(self, f"{str(result.exception)}@{service.connector.address}")
+
     def log(self):
         selected = self.parent.gui_functions.get_selected_services(self.treeWidget)
         service_name = list(selected.keys())[0].text(0)
-        self.parent.show_window(LogForm(self.parent, self.services, service_name))
+        self.parent.show_window(LogForm(self.parent, self.service_list, service_name))
 
     def load(self):
         self.treeWidget.clear()
         result = {}
-        for service in self.services:
-            for ser in service.list():
+        lists = self.service_list.list()
+        self.report(lists)
+        for service, units in lists.items():
+            for ser in units.value or []:
                 ser["domain"] = service.connector.address
 
                 unit = ser['unit']
@@ -658,7 +666,7 @@ class AddForm(QtWidgets.QWidget, Ui_FormAdd):
         password = self.lineEditPassword.text()
 
         try:
-            connection = SSHConnector(address, port, username, password, self.parent.logger)
+            connection = SSHConnector(address, port, username, password, self.parent.logger, pool=self.parent.pool)
             self.parent.gui_functions.add_to_connections(self, connection, self.parent.treeWidget)
             self.close()
         except Exception as e:
@@ -671,7 +679,7 @@ class AddForm(QtWidgets.QWidget, Ui_FormAdd):
         password = self.lineEditPassword.text()
 
         try:
-            _ = SSHConnector(address, port, username, password, self.parent.logger)
+            _ = SSHConnector(address, port, username, password, self.parent.logger, pool=self.parent.pool)
             self.parent.gui_functions.information(self, "Connection Established")
         except Exception as e:
             self.parent.gui_functions.error(self, str(e))
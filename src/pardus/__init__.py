@@ -1,10 +1,22 @@
 from .connection.ssh_connector import SSHConnector
+from .connection.local_connector import LocalConnector
+from .connection.recording_connector import RecordingConnector
+from .connection.replay_connector import ReplayConnector
+from .connection.ssh_pool import SSHPool
+from .connection.async_ssh_connector import AsyncSSHConnector
 from .apt.apt import Apt
 from .apt.apt_list import AptList
+from .apt.async_apt import AsyncApt
+from .apt.scheduler import UpdateScheduler
 from .service.service import Service
 from .service.service_list import ServiceList
+from .service.async_service import AsyncService
 from .config.config import Config
 from .config.config_list import ConfigList
 from .config.config_raw import ConfigRaw
+from .config.async_config import AsyncConfig
+from .inventory.inventory import Inventory
 
-__all__ = ["SSHConnector", "Apt", "AptList", "Service", "ServiceList", "Config", "ConfigList", "ConfigRaw"]
+__all__ = ["SSHConnector", "LocalConnector", "RecordingConnector", "ReplayConnector", "SSHPool", "AsyncSSHConnector",
+           "Apt", "AptList", "AsyncApt", "UpdateScheduler", "Service", "ServiceList", "AsyncService",
+           "Config", "ConfigList", "ConfigRaw", "AsyncConfig", "Inventory"]
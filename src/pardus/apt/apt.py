@@ -1,13 +1,25 @@
 import re
 from datetime import datetime
+from itertools import islice
 
 from logging import Logger, getLogger
-from typing import List, Optional, Dict, Union, Any
+from typing import Iterator, List, Optional, Dict, Tuple, Union, Any
 
 from pardus.apt.model_apt import ModelApt
+from pardus.apt.parsers import (parse_cache_search, parse_installed, parse_installed_records, parse_list, parse_list_records, parse_policy, parse_repositories,
+                                parse_repository_records, parse_search, parse_show, parse_stanzas, parse_version_tables)
+from pardus.apt.fingerprint import FINGERPRINT_COMMAND, FingerprintCache
+from pardus.apt.package_index import PACKAGE_INDEXES, PackageIndex
+from pardus.apt.records import PackageRecord, RepoEntry, installed_state
+from pardus.apt.search_index import SEARCH_INDEXES, SearchIndex
 from pardus.connection.model_connector import ModelConnector
-from pardus.utils.common import escape_string
-from pardus.utils.error import AlreadyExist, NotFound
+from pardus.connection.result import CommandResult
+from pardus.utils.common import escape_string, iter_lines
+from pardus.utils.error import AlreadyExist, CommandError, NotFound
+
+# Printed instead of running `apt update` when the package lists are younger than `max_age`
+LISTS_FRESH = "PARDUS_LISTS_FRESH"
+UPDATE_STAMP = "/var/lib/apt/periodic/update-success-stamp"
 
 
 def is_valid_source_line(line: str) -> None:
@@ -21,22 +33,9 @@ def is_valid_source_line(line: str) -> None:
         raise ValueError("Wrong repo line")
 
 
-def option_matcher(option: str) -> Optional[Dict[str, str]]:
-    if not option:
-        return None
-
-    options_to_return = {}
-    options = option.strip().lstrip("[").rstrip("]")
-
-    for option in options.split():
-        key, value = option.split("=")
-        options_to_return[key] = value
-
-    return options_to_return
-
-
 class Apt(ModelApt):
-    def __init__(self, connector: ModelConnector, sudo_passwd: Optional[str] = None, logger: Optional[Logger] = None) -> None:
+    def __init__(self, connector: ModelConnector, sudo_passwd: Optional[str] = None, logger: Optional[Logger] = None,
+                 timeout: Optional[float] = None) -> None:
         if logger is None:
             self.logger = getLogger(__name__)
         else:
@@ -44,60 +43,133 @@ class Apt(ModelApt):
 
         self.sudo_passwd = sudo_passwd
         self.connector = connector
+        self.timeout = timeout
+
+        self.__index: Optional[Dict[str, Tuple[str, ...]]] = None
+
+    def index(self) -> Dict[str, Tuple[str, ...]]:
+        """Tags of every known package, read with one `apt list` and kept for repeated name lookups
+
+        The copy is dropped by every change made through this Apt. Changes made elsewhere are only seen after `refresh`.
+        """
+        if self.__index is None:
+            return self.refresh()
+
+        return self.__index
+
+    def refresh(self) -> Dict[str, Tuple[str, ...]]:
+        self.__index = {p.package: p.tags for p in parse_list_records(self.connector.run_lines("apt list"), self.logger)}
+        return self.__index
+
+    def invalidate(self) -> None:
+        self.__index = None
+
+    @staticmethod
+    def __available(state: Optional[Dict[str, Optional[str]]]) -> bool:
+        return state is not None and (state["installed"] is not None or state["candidate"] is not None)
+
+    def state(self, packages: Union[str, List[str]]) -> Dict[str, Dict[str, Optional[str]]]:
+        if isinstance(packages, list):
+            package_names = packages
+        else:
+            package_names = [packages]
+
+        if not package_names:
+            return {}
+
+        for p in package_names:
+            escape_string(p)
+
+        lines = self.connector.run_lines(f"LC_ALL=C apt-cache policy {' '.join(package_names)}")
+        return {str(state["package"]): state for state in parse_policy(lines)}
 
     def repositories(self) -> List[Dict[str, Any]]:
-        output = self.connector.run("grep --no-filename -r '^deb ' /etc/apt/sources.list /etc/apt/sources.list.d/")
-
-        pattern = re.compile(r'^(deb|deb-src)\s+'
-                             r'(\[.*?\]\s+)?'
-                             r'(\S+)\s+'
-                             r'(\S+)\s+'
-                             r'(.+)$')
-        repositories = []
-
-        repos = output.read().decode().split("\n")
-        for repo in repos:
-            line = repo.strip()
-            match = pattern.match(line)
-            if match:
-                entry = {
-                    'kind': match.group(1),
-                    'options': option_matcher(match.group(2)),
-                    'url': match.group(3),
-                    'distribution': match.group(4),
-                    'components': match.group(5).strip()
-                }
-                repositories.append(entry)
-
-        return repositories
+        return list(parse_repositories(self.connector.run_lines(self.__repository_command())))
+
+    def repository_records(self) -> List[RepoEntry]:
+        return list(parse_repository_records(self.connector.run_lines(self.__repository_command())))
+
+    @staticmethod
+    def __repository_command() -> str:
+        # grep fails without a match and when sources.list is missing, the sources are read from what it found
+        return "grep --no-filename -rs '^deb ' /etc/apt/sources.list /etc/apt/sources.list.d/ || true"
 
     def add_repository(self, repository: str) -> None:
         is_valid_source_line(repository)
         repos = self.repositories()
 
-        search = re.search(r"(?P<url>https?://\s+)", repository)
+        search = re.search(r"(?P<url>https?://\S+)", repository)
         if search is None:
             return
 
         if search.group("url") in [r["url"] for r in repos]:
             raise AlreadyExist("Repo Already exist")
 
-        self.connector.sudo_run(f"echo '# Added By Pardus @ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}'"
-                                " >> /etc/apt/sources.list.d/pardus.list", passwd=self.sudo_passwd)
-        self.connector.sudo_run(f"echo {repository} >> /etc/apt/sources.list.d/pardus.list", passwd=self.sudo_passwd)
+        results = self.connector.sudo_run_many([
+            f"echo '# Added By Pardus @ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}' >> /etc/apt/sources.list.d/pardus.list",
+            f"echo '{repository}' >> /etc/apt/sources.list.d/pardus.list",
+        ], passwd=self.sudo_passwd)
+        for result in results:
+            result.check()
+        self.invalidate()
+
+    def update(self, max_age: Optional[float] = None) -> bool:
+        """Runs `apt update`, skipped when the package lists were refreshed less than `max_age` seconds ago
+
+        Returns whether the lists were downloaded.
+        """
+        if max_age is None:
+            command = "apt update"
+        else:
+            command = self.__update_command(max_age)
+
+        result = self.connector.sudo_run(command, passwd=self.sudo_passwd, timeout=self.timeout).check()
+        if LISTS_FRESH.encode() in result.read():
+            return False
+
+        self.invalidate()
+        return True
 
-    def update(self) -> None:
-        _ = self.connector.run("apt update")
+    def lists_fresh(self, max_age: float) -> bool:
+        """Whether the package lists were refreshed less than `max_age` seconds ago, without updating them"""
+        return self.connector.run(self.__fresh_command(max_age), timeout=self.timeout).exit_status == 0
+
+    @staticmethod
+    def __fresh_command(max_age: float) -> str:
+        if max_age < 0:
+            raise ValueError("max_age must not be negative")
+
+        # `apt update` rewrites the lists directory and the stamp is the one apt's periodic jobs touch,
+        # either being recent means the lists are fresh
+        return f"find /var/lib/apt/lists {UPDATE_STAMP} -maxdepth 1 -mmin -{max_age / 60:.3f} -print -quit 2>/dev/null | grep -q ."
+
+    @classmethod
+    def __update_command(cls, max_age: float) -> str:
+        # The freshness check runs in the same round trip as the update
+        return (f"{cls.__fresh_command(max_age)} && echo {LISTS_FRESH} "
+                f"|| {{ apt update && mkdir -p /var/lib/apt/periodic && touch {UPDATE_STAMP}; }}")
 
     def upgrade(self, package_name: Optional[str] = None) -> None:
         if isinstance(package_name, str):
             escape_string(package_name)
-            _ = self.connector.sudo_run(f"sudo apt upgrade -y --only-upgrade {package_name}", passwd=self.sudo_passwd)
+            self.connector.sudo_run(
+                f"sudo apt upgrade -y --only-upgrade {package_name}", passwd=self.sudo_passwd, timeout=self.timeout
+            ).check()
+            self.invalidate()
             return
 
-        _ = self.connector.sudo_run("sudo apt upgrade -y", passwd=self.sudo_passwd)
+        self.connector.sudo_run("sudo apt upgrade -y", passwd=self.sudo_passwd, timeout=self.timeout).check()
+        self.invalidate()
+
+    def list(self, installed: bool = False, upgradeable: bool = False) -> List[Dict[str, Any]]:
+        return list(parse_list(self.connector.run_lines(self.__list_command(installed, upgradeable)), self.logger))
 
-    def list(self, installed: bool = False, upgradeable: bool = False) -> List[Dict[str, str]]:
+    def list_records(self, installed: bool = False, upgradeable: bool = False) -> List[PackageRecord]:
+        lines = self.connector.run_lines(self.__list_command(installed, upgradeable))
+        return list(parse_list_records(lines, self.logger))
+
+    @staticmethod
+    def __list_command(installed: bool = False, upgradeable: bool = False) -> str:
         command = "apt list"
         if installed:
             command += " --installed"
@@ -105,54 +177,76 @@ class Apt(ModelApt):
         if upgradeable:
             command += " --upgradeable"
 
-        packages = self.connector.run(command)
-
-        parsed_data = []
-        for line in packages.read().decode().split("\n"):
-            try:
-
-                if "/" not in line.strip():
-                    continue
-                package, rest = line.strip().split("/")
-                exp = re.findall(r'\[[^\]]*\]|\S+', rest)
-                if len(exp) == 3:
-                    repo, version, arch = exp
-                    tags = ""
-                else:
-                    repo, version, arch, tags = exp
-
-                parsed_data.append(
-                    {
-                        "package": package,
-                        "repo": repo,
-                        "version": version,
-                        "arch": arch,
-                        "tags": [each.strip() for each in tags.lstrip("[").rstrip("]").split(",") if each.strip()]
-                    }
-                )
-            except Exception as e:
-                self.logger.warning(e)
-
-        return parsed_data
+        return command
+
+    def shared_list_records(self, installed: bool = False, upgradeable: bool = False,
+                            cache: Optional[FingerprintCache[PackageIndex]] = None) -> List[PackageRecord]:
+        """Same records as `list_records`, the package lists are parsed once for every host with the same fingerprint
+
+        The `automatic` tag is not known without the full listing of the host.
+        """
+        if cache is None:
+            cache = PACKAGE_INDEXES
+
+        # The fingerprint and the installed packages come back in one round trip
+        fingerprint, packages = self.connector.run_many([FINGERPRINT_COMMAND, self.__installed_command()], timeout=self.timeout)
+        index = cache.get(self.__digest(fingerprint.check()), self.__package_index)
+
+        records = index.merge(parse_installed_records(iter_lines(packages)))
+        if installed:
+            records = [record for record in records if installed_state(record.tags) is not False]
+
+        if upgradeable:
+            records = [record for record in records if isinstance(installed_state(record.tags), str)]
+
+        return records
+
+    def __package_index(self) -> PackageIndex:
+        index = PackageIndex(parse_list_records(self.connector.run_lines("apt list"), self.logger))
+        if index.local:
+            for package, arch in index.local:
+                escape_string(package)
+                escape_string(arch)
+
+            names = [f"{package}:{arch}" for package, arch in index.local]
+            index.resolve(parse_version_tables(self.connector.run_lines(f"LC_ALL=C apt-cache policy {' '.join(names)}")))
+
+        return index
+
+    def installed_versions(self, packages: Optional[List[str]] = None) -> Dict[str, str]:
+        # Unknown names only print a warning on stderr
+        return dict(parse_installed(self.connector.run_lines(self.__installed_command(packages))))
+
+    @staticmethod
+    def __installed_command(packages: Optional[List[str]] = None) -> str:
+        package_names = packages or []
+        for p in package_names:
+            escape_string(p)
+
+        # One dpkg-query answers for every package. It exits with 1 when some of them are unknown
+        return " ".join(
+            ["dpkg-query -W -f='${Package}\\t${Version}\\t${db:Status-Status}\\t${Architecture}\\n'"] + package_names
+            + ["|| [ $? -eq 1 ]"]
+        )
 
     def install(self, package_name: Union[str, List[str]]) -> None:
-        available_packages = {p["package"]: p["tags"] for p in self.list()}
         if isinstance(package_name, list):
             package_names = package_name
         else:
             package_names = [package_name]
 
+        states = self.state(package_names)
+
         package_to_be_installed = []
         for p in package_names:
-            if p not in available_packages.keys():
+            if not self.__available(states.get(p)):
                 self.logger.warning(f"Package `{p}` not found. Skipping")
                 continue
 
-            if "installed" in available_packages[p]:
+            if states[p]["installed"] is not None:
                 self.logger.warning(f"Package `{p}` already installed. Use `reinstall`. Skipping")
                 continue
 
-            escape_string(p)
             package_to_be_installed.append(p)
 
         if len(package_to_be_installed) == 0:
@@ -160,26 +254,27 @@ class Apt(ModelApt):
             raise NotFound("No packages were found")
 
         command = f"apt install {' '.join(package_to_be_installed)} -y"
-        _ = self.connector.sudo_run(command, passwd=self.sudo_passwd)
+        self.connector.sudo_run(command, passwd=self.sudo_passwd, timeout=self.timeout).check()
+        self.invalidate()
 
     def reinstall(self, package_name: Union[str, List[str]]) -> None:
-        available_packages = {p["package"]: p["tags"] for p in self.list()}
         if isinstance(package_name, list):
             package_names = package_name
         else:
             package_names = [package_name]
 
+        states = self.state(package_names)
+
         package_to_be_installed = []
         for p in package_names:
-            if p not in available_packages.keys():
+            if not self.__available(states.get(p)):
                 self.logger.warning(f"Package `{p}` not found. Skipping")
                 continue
 
-            if "installed" not in available_packages[p]:
+            if states[p]["installed"] is None:
                 self.logger.warning(f"Package `{p}` already installed. Use `install`. Skipping")
                 continue
 
-            escape_string(p)
             package_to_be_installed.append(p)
 
         if len(package_to_be_installed) == 0:
@@ -187,26 +282,27 @@ class Apt(ModelApt):
             raise NotFound("No packages were found")
 
         command = f"apt reinstall {' '.join(package_to_be_installed)} -y"
-        _ = self.connector.sudo_run(command, passwd=self.sudo_passwd)
+        self.connector.sudo_run(command, passwd=self.sudo_passwd, timeout=self.timeout).check()
+        self.invalidate()
 
     def remove(self, package_name: Union[str, List[str]]) -> None:
-        available_packages = {p["package"]: p["tags"] for p in self.list()}
         if isinstance(package_name, list):
             package_names = package_name
         else:
             package_names = [package_name]
 
+        states = self.state(package_names)
+
         package_to_be_installed = []
         for p in package_names:
-            if p not in available_packages.keys():
+            if not self.__available(states.get(p)):
                 self.logger.warning(f"Package `{p}` not found. Skipping")
                 continue
 
-            if "installed" not in available_packages[p]:
+            if states[p]["installed"] is None:
                 self.logger.warning(f"Package `{p}` is not installed. Skipping")
                 continue
 
-            escape_string(p)
             package_to_be_installed.append(p)
 
         if len(package_to_be_installed) == 0:
@@ -214,26 +310,27 @@ class Apt(ModelApt):
             raise NotFound("No packages were found")
 
         command = f"apt remove {' '.join(package_to_be_installed)} -y"
-        _ = self.connector.sudo_run(command, passwd=self.sudo_passwd)
+        self.connector.sudo_run(command, passwd=self.sudo_passwd, timeout=self.timeout).check()
+        self.invalidate()
 
     def purge(self, package_name: Union[str, List[str]]) -> None:
-        available_packages = {p["package"]: p["tags"] for p in self.list()}
         if isinstance(package_name, list):
             package_names = package_name
         else:
             package_names = [package_name]
 
+        states = self.state(package_names)
+
         package_to_be_installed = []
         for p in package_names:
-            if p not in available_packages.keys():
+            if not self.__available(states.get(p)):
                 self.logger.warning(f"Package `{p}` not found. Skipping")
                 continue
 
-            if "installed" not in available_packages[p]:
+            if states[p]["installed"] is None:
                 self.logger.warning(f"Package {p} is not installed. Skipping")
                 continue
 
-            escape_string(p)
             package_to_be_installed.append(p)
 
         if len(package_to_be_installed) == 0:
@@ -241,74 +338,87 @@ class Apt(ModelApt):
             raise NotFound("No packages were found")
 
         command = f"apt purge {' '.join(package_to_be_installed)} -y"
-        _ = self.connector.sudo_run(command, passwd=self.sudo_passwd)
+        self.connector.sudo_run(command, passwd=self.sudo_passwd, timeout=self.timeout).check()
+        self.invalidate()
 
-    def search(self, package_name: str) -> List[Dict[str, str]]:
-        available_packages = {p["package"]: p["tags"] for p in self.list()}
+    def search(self, package_name: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        return list(self.iter_search(package_name, limit=limit))
 
+    def iter_search(self, package_name: str, limit: Optional[int] = None) -> Iterator[Dict[str, str]]:
         escape_string(package_name)
 
-        if package_name not in available_packages.keys():
+        # Checked before the first hit is asked for, a limit of 0 would otherwise read nothing and report not found
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be positive")
+
+        return self.__iter_search(package_name, limit)
+
+    def __iter_search(self, package_name: str, limit: Optional[int]) -> Iterator[Dict[str, str]]:
+        # Hits are parsed as they arrive. Closing the lines stops the command once `limit` hits were read
+        lines = self.connector.run_lines(f"apt search {package_name}")
+        found = 0
+        try:
+            for found, hit in enumerate(islice(parse_search(lines), limit), start=1):
+                yield hit
+        finally:
+            close = getattr(lines, "close", None)
+            if close is not None:
+                close()
+
+        if found == 0:
             self.logger.warning(f"Package `{package_name}` not found")
             raise NotFound(f"Package `{package_name}` not found")
 
-        command = f"apt search {package_name}"
-        stdout = self.connector.run(command)
+    def fingerprint(self) -> str:
+        return self.__digest(self.connector.run(FINGERPRINT_COMMAND, timeout=self.timeout).check())
 
-        lines = stdout.read().decode().strip().split('\n')
-        packages_to_return = []
+    @staticmethod
+    def __digest(result: CommandResult) -> str:
+        digest = result.read().decode().split()
+        if not digest:
+            raise CommandError("Could not fingerprint the package lists")
 
-        while lines:
-            name_version_arch = lines.pop(0).strip()
-            description_lines = []
+        return digest[0]
 
-            match = re.match(r'(.+?)/(.+?)\s+([\d\w.:+-]+)\s+(\S+)(?:\s+\[.*\])?', name_version_arch)
-            if match:
-                name, repo, version, arch = match.groups()
-                description = ''
+    def search_index(self, cache: Optional[FingerprintCache[SearchIndex]] = None) -> SearchIndex:
+        if cache is None:
+            cache = SEARCH_INDEXES
 
-                while lines and not lines[0].startswith(' '):
-                    description_lines.append(lines.pop(0).strip())
-
-                if lines:
-                    description = lines.pop(0).strip()
-
-                packages_to_return.append({
-                    'name': name,
-                    'repo': repo,
-                    'version': version,
-                    'architecture': arch,
-                    'description': description
-                })
-
-        return packages_to_return
+        return cache.get(
+            self.fingerprint(),
+            lambda: SearchIndex(parse_cache_search(self.connector.run_lines("apt-cache search ."))),
+        )
 
     def show(self, package_name: str) -> Dict[Union[str, None], Any]:
-        # 920
-        available_packages = {p["package"]: p["tags"] for p in self.list()}
-
         escape_string(package_name)
 
-        if package_name not in available_packages.keys():
+        # apt prints nothing on stdout and fails for an unknown package, no need to list every package first
+        information = parse_show(iter_lines(self.connector.run(f"apt show {package_name}", timeout=self.timeout)))
+        if not information:
             self.logger.warning(f"Package `{package_name}` not found")
             raise NotFound(f"Package `{package_name}` not found")
 
-        command = f"apt show {package_name}"
-        stdout = self.connector.run(command)
-
-        lines = stdout.read().decode().strip().split('\n')
-        parsed_dict: dict[Union[str, None], Any] = {}
-
-        current_key = None
-        for line in lines:
-            if line.startswith(' '):
-                parsed_dict[current_key] += '\n' + line.strip()
-            else:
-                key, value = line.split(': ', 1)
-                current_key = key.strip()
-                if current_key == 'Depends':
-                    parsed_dict[current_key] = [dep.strip() for dep in value.split(',')]
-                else:
-                    parsed_dict[current_key] = value.strip()
-
-        return parsed_dict
+        return information
+
+    def show_many(self, packages: List[str]) -> Dict[str, Dict[Union[str, None], Any]]:
+        if not packages:
+            return {}
+
+        for p in packages:
+            escape_string(p)
+
+        # --no-all-versions keeps one stanza, the candidate, per package. apt-cache fails when none of them is known
+        lines = iter_lines(self.connector.run(f"LC_ALL=C apt-cache show --no-all-versions {' '.join(packages)}",
+                                              timeout=self.timeout))
+        information: Dict[str, Dict[Union[str, None], Any]] = {}
+        for stanza in parse_stanzas(lines):
+            if "Description" not in stanza and "Description-en" in stanza:
+                stanza["Description"] = stanza.pop("Description-en")
+
+            information.setdefault(str(stanza.get("Package")), stanza)
+
+        for p in packages:
+            if p not in information:
+                self.logger.warning(f"Package `{p}` not found. Skipping")
+
+        return information
@@ -1,16 +1,26 @@
+from collections import Counter
 from logging import Logger, getLogger
 
-from typing import List, Dict, Optional, Union, Iterator, Any
+from typing import List, Dict, Optional, Union, Iterator, Any, Callable, TypeVar
 from typing_extensions import Self
 
 from pardus import Apt
+from pardus.apt.drift import DriftEntry, drift
+from pardus.apt.matrix import PackageMatrix
 from pardus.apt.model_apt_list import ModelAptList
+from pardus.apt.records import PackageRecord
+from pardus.apt.search_index import SearchIndex
 from pardus.connection.model_connector import ModelConnector
+from pardus.utils.common import host_name
 from pardus.utils.error import NumberOfElementsError
+from pardus.utils.fanout import HostResult, fan_out, DEFAULT_MAX_WORKERS
+
+T = TypeVar("T")
 
 
 class AptList(ModelAptList):
-    def __init__(self, apts: List[Apt], logger: Optional[Logger] = None) -> None:
+    def __init__(self, apts: List[Apt], logger: Optional[Logger] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, timeout: Optional[float] = None) -> None:
         if logger is None:
             self.logger = getLogger(__name__)
         else:
@@ -20,6 +30,8 @@ class AptList(ModelAptList):
             raise NumberOfElementsError("apts can not be empty")
 
         self.apts = apts
+        self.max_workers = max_workers
+        self.timeout = timeout
 
     def __iter__(self) -> Iterator[Apt]:
         for x in self.apts:
@@ -30,7 +42,7 @@ class AptList(ModelAptList):
         if isinstance(key, int):
             return self.apts[key]
         elif isinstance(key, slice):
-            return self.__class__(self.apts[key])
+            return self.__class__(self.apts[key], logger=self.logger, max_workers=self.max_workers, timeout=self.timeout)
 
         self.logger.error("Wrong slice")
         raise ValueError("Wrong slice")
@@ -42,99 +54,94 @@ class AptList(ModelAptList):
         return len(self.apts)
 
     @classmethod
-    def from_connections(cls, connections: List[ModelConnector], logger: Optional[Logger] = None) -> Self:
+    def from_connections(cls, connections: List[ModelConnector], logger: Optional[Logger] = None,
+                         max_workers: int = DEFAULT_MAX_WORKERS, timeout: Optional[float] = None) -> Self:
         return cls(
             [
                 Apt(connection, logger=logger)
                 for connection in connections
-            ]
+            ],
+            logger=logger, max_workers=max_workers, timeout=timeout
         )
 
-    def repositories(self) -> Dict[Apt, List[Dict[str, str]]]:
-        repositories = {}
-        for apt in self.apts:
-            try:
-                repositories[apt] = apt.repositories()
-            except Exception as e:
-                self.logger.warning(e)
-
-        return repositories
-
-    def add_repository(self, repository: str) -> None:
-        for apt in self.apts:
-            try:
-                apt.add_repository(repository)
-            except Exception as e:
-                self.logger.warning(e)
-
-    def update(self) -> None:
-        for apt in self.apts:
-            try:
-                apt.update()
-            except Exception as e:
-                self.logger.warning(e)
-
-    def upgrade(self, package_name: Optional[str] = None) -> None:
-        for apt in self.apts:
-            try:
-                apt.upgrade(package_name=package_name)
-            except Exception as e:
-                self.logger.warning(e)
-
-    def list(self, installed: bool = False, upgradeable: bool = False) -> Dict[Apt, List[Dict[str, str]]]:
-        list_of_available = {}
-        for apt in self.apts:
-            try:
-                list_of_available[apt] = apt.list(installed=installed, upgradeable=upgradeable)
-            except Exception as e:
-                self.logger.warning(e)
-
-        return list_of_available
-
-    def install(self, package_name: Union[str, List[str]]) -> None:
-        for apt in self.apts:
-            try:
-                apt.install(package_name=package_name)
-            except Exception as e:
-                self.logger.warning(e)
-
-    def reinstall(self, package_name: Union[str, List[str]]) -> None:
-        for apt in self.apts:
-            try:
-                apt.reinstall(package_name=package_name)
-            except Exception as e:
-                self.logger.warning(e)
-
-    def remove(self, package_name: Union[str, List[str]]) -> None:
-        for apt in self.apts:
-            try:
-                apt.remove(package_name=package_name)
-            except Exception as e:
-                self.logger.warning(e)
-
-    def purge(self, package_name: Union[str, List[str]]) -> None:
-        for apt in self.apts:
-            try:
-                apt.purge(package_name=package_name)
-            except Exception as e:
-                self.logger.warning(e)
-
-    def search(self, package_name: str) -> Dict[Apt, List[Dict[str, str]]]:
-        list_of_available = {}
-        for apt in self.apts:
-            try:
-                list_of_available[apt] = apt.search(package_name)
-            except Exception as e:
-                self.logger.warning(e)
-
-        return list_of_available
-
-    def show(self, package_name: str) -> Dict[Apt, Dict[Union[str, None], Any]]:
-        list_of_available = {}
-        for apt in self.apts:
-            try:
-                list_of_available[apt] = apt.show(package_name)
-            except Exception as e:
-                self.logger.warning(e)
-
-        return list_of_available
+    def map(self, func: Callable[[Apt], T]) -> Dict[Apt, HostResult[T]]:
+        return fan_out(self.apts, func, max_workers=self.max_workers, timeout=self.timeout, logger=self.logger)
+
+    def repositories(self) -> Dict[Apt, HostResult[List[Dict[str, Any]]]]:
+        return self.map(lambda apt: apt.repositories())
+
+    def add_repository(self, repository: str) -> Dict[Apt, HostResult[None]]:
+        return self.map(lambda apt: apt.add_repository(repository))
+
+    def update(self, max_age: Optional[float] = None) -> Dict[Apt, HostResult[bool]]:
+        return self.map(lambda apt: apt.update(max_age=max_age))
+
+    def upgrade(self, package_name: Optional[str] = None) -> Dict[Apt, HostResult[None]]:
+        return self.map(lambda apt: apt.upgrade(package_name=package_name))
+
+    def list(self, installed: bool = False, upgradeable: bool = False) -> Dict[Apt, HostResult[List[Dict[str, str]]]]:
+        return self.map(lambda apt: apt.list(installed=installed, upgradeable=upgradeable))
+
+    def list_records(self, installed: bool = False, upgradeable: bool = False) -> Dict[Apt, HostResult[List[PackageRecord]]]:
+        return self.map(lambda apt: apt.list_records(installed=installed, upgradeable=upgradeable))
+
+    def shared_list_records(self, installed: bool = False, upgradeable: bool = False) -> Dict[Apt, HostResult[List[PackageRecord]]]:
+        return self.map(lambda apt: apt.shared_list_records(installed=installed, upgradeable=upgradeable))
+
+    def installed_versions(self, packages: Optional[List[str]] = None) -> Dict[Apt, HostResult[Dict[str, str]]]:
+        return self.map(lambda apt: apt.installed_versions(packages))
+
+    def matrix(self) -> PackageMatrix:
+        records = self.__by_host(self.list_records(installed=True))
+        return PackageMatrix.from_records(records)
+
+    def drift(self, packages: Optional[List[str]] = None, drifting_only: bool = False) -> Iterator[DriftEntry]:
+        installed = self.__by_host(self.installed_versions(packages))
+        return drift(installed, drifting_only=drifting_only)
+
+    @classmethod
+    def __by_host(cls, results: Dict[Apt, HostResult[T]]) -> Dict[str, T]:
+        # Unreachable hosts are left out, fan_out already logged why
+        names = cls.host_names(list(results))
+        return {names[apt]: result.unwrap() for apt, result in results.items() if result.ok}
+
+    @staticmethod
+    def host_names(apts: List[Apt]) -> Dict[Apt, str]:
+        """A distinct name for each host, its address unless other hosts share it
+
+        Hosts on the same address are told apart by `user@address:port`, and by a `#n` suffix if even that is shared.
+        """
+        addresses = [str(getattr(apt.connector, "address", apt)) for apt in apts]
+        shared = Counter(addresses)
+        names: Dict[Apt, str] = {}
+        seen: Dict[str, int] = {}
+        for apt, address in zip(apts, addresses):
+            name = host_name(apt.connector) if shared[address] > 1 else address
+            seen[name] = seen.get(name, 0) + 1
+            names[apt] = name if seen[name] == 1 else f"{name}#{seen[name]}"
+
+        return names
+
+    def install(self, package_name: Union[str, List[str]]) -> Dict[Apt, HostResult[None]]:
+        return self.map(lambda apt: apt.install(package_name=package_name))
+
+    def reinstall(self, package_name: Union[str, List[str]]) -> Dict[Apt, HostResult[None]]:
+        return self.map(lambda apt: apt.reinstall(package_name=package_name))
+
+    def remove(self, package_name: Union[str, List[str]]) -> Dict[Apt, HostResult[None]]:
+        return self.map(lambda apt: apt.remove(package_name=package_name))
+
+    def purge(self, package_name: Union[str, List[str]]) -> Dict[Apt, HostResult[None]]:
+        return self.map(lambda apt: apt.purge(package_name=package_name))
+
+    def search(self, package_name: str, limit: Optional[int] = None) -> Dict[Apt, HostResult[List[Dict[str, str]]]]:
+        return self.map(lambda apt: apt.search(package_name, limit=limit))
+
+    def show(self, package_name: str) -> Dict[Apt, HostResult[Dict[Union[str, None], Any]]]:
+        return self.map(lambda apt: apt.show(package_name))
+
+    def search_index(self) -> Dict[Apt, HostResult[SearchIndex]]:
+        return self.map(lambda apt: apt.search_index())
+
+    def show_many(self, packages: List[str]) -> Dict[Apt, HostResult[Dict[str, Dict[Union[str, None], Any]]]]:
+        return self.map(lambda apt: apt.show_many(packages))
@@ -0,0 +1,62 @@
+from logging import Logger
+from typing import List, Optional, Dict, Tuple, Union, Any
+
+from pardus.apt.apt import Apt
+from pardus.apt.records import PackageRecord
+from pardus.apt.search_index import SearchIndex
+from pardus.connection.async_ssh_connector import AsyncSSHConnector
+
+
+class AsyncApt:
+    def __init__(self, connector: AsyncSSHConnector, sudo_passwd: Optional[str] = None, logger: Optional[Logger] = None) -> None:
+        self.connector = connector
+        self.apt = Apt(connector.connector, sudo_passwd=sudo_passwd, logger=logger)
+        self.logger = self.apt.logger
+
+    async def repositories(self) -> List[Dict[str, Any]]:
+        return await self.connector.call(self.apt.repositories)
+
+    async def state(self, packages: Union[str, List[str]]) -> Dict[str, Dict[str, Optional[str]]]:
+        return await self.connector.call(self.apt.state, packages)
+
+    async def refresh(self) -> Dict[str, Tuple[str, ...]]:
+        return await self.connector.call(self.apt.refresh)
+
+    async def add_repository(self, repository: str) -> None:
+        await self.connector.call(self.apt.add_repository, repository)
+
+    async def update(self, max_age: Optional[float] = None) -> bool:
+        return await self.connector.call(self.apt.update, max_age=max_age)
+
+    async def upgrade(self, package_name: Optional[str] = None) -> None:
+        await self.connector.call(self.apt.upgrade, package_name=package_name)
+
+    async def list(self, installed: bool = False, upgradeable: bool = False) -> List[Dict[str, str]]:
+        return await self.connector.call(self.apt.list, installed=installed, upgradeable=upgradeable)
+
+    async def install(self, package_name: Union[str, List[str]]) -> None:
+        await self.connector.call(self.apt.install, package_name)
+
+    async def reinstall(self, package_name: Union[str, List[str]]) -> None:
+        await self.connector.call(self.apt.reinstall, package_name)
+
+    async def remove(self, package_name: Union[str, List[str]]) -> None:
+        await self.connector.call(self.apt.remove, package_name)
+
+    async def purge(self, package_name: Union[str, List[str]]) -> None:
+        await self.connector.call(self.apt.purge, package_name)
+
+    async def search(self, package_name: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        return await self.connector.call(self.apt.search, package_name, limit=limit)
+
+    async def shared_list_records(self, installed: bool = False, upgradeable: bool = False) -> List[PackageRecord]:
+        return await self.connector.call(self.apt.shared_list_records, installed=installed, upgradeable=upgradeable)
+
+    async def search_index(self) -> SearchIndex:
+        return await self.connector.call(self.apt.search_index)
+
+    async def show(self, package_name: str) -> Dict[Union[str, None], Any]:
+        return await self.connector.call(self.apt.show, package_name)
+
+    async def show_many(self, packages: List[str]) -> Dict[str, Dict[Union[str, None], Any]]:
+        return await self.connector.call(self.apt.show_many, packages)
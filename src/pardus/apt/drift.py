@@ -0,0 +1,56 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, TextIO, Tuple
+
+from pardus.apt.version import version_key
+
+
+class DriftEntry(NamedTuple):
+    package: str
+    versions: Tuple[str, ...]
+    newest: str
+    lagging: Tuple[str, ...]
+    missing: Tuple[str, ...]
+
+    @property
+    def drifting(self) -> bool:
+        return len(self.versions) > 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "package": self.package,
+            "versions": list(self.versions),
+            "newest": self.newest,
+            "lagging": list(self.lagging),
+            "missing": list(self.missing)
+        }
+
+
+def drift(installed: Mapping[str, Mapping[str, str]], drifting_only: bool = False) -> Iterator[DriftEntry]:
+    """Versions of every package over the hosts, `installed` maps each host to its `{package: version}`
+
+    Hosts with a version older than the newest one are lagging. Hosts without the package are missing.
+    """
+    hosts = list(installed)
+    by_package: Dict[str, Dict[str, List[str]]] = {}
+    for host, host_versions in installed.items():
+        for package, version in host_versions.items():
+            by_package.setdefault(package, {}).setdefault(version, []).append(host)
+
+    for package in sorted(by_package):
+        by_version = by_package[package]
+        if drifting_only and len(by_version) < 2:
+            continue
+
+        versions = tuple(sorted(by_version, key=version_key))
+        newest = versions[-1]
+        lagging = tuple(host for version in versions[:-1] for host in by_version[version])
+        having = {host for each in by_version.values() for host in each}
+        yield DriftEntry(package, versions, newest, lagging, tuple(host for host in hosts if host not in having))
+
+
+def write_jsonl(entries: Iterable[DriftEntry], stream: TextIO) -> int:
+    count = 0
+    for count, entry in enumerate(entries, start=1):
+        stream.write(json.dumps(entry.as_dict()) + "\n")
+
+    return count
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Everything that decides which packages and candidate versions apt sees. Hosts on the same suites may enable other
+# components, so the sources and the downloaded package lists count as well. Only the digest travels back
+FINGERPRINT_COMMAND = ("{ dpkg --print-architecture; dpkg --print-foreign-architectures; "
+                       "cat /var/lib/apt/lists/*Release /etc/apt/preferences /etc/apt/preferences.d/* "
+                       "/etc/apt/sources.list /etc/apt/sources.list.d/*; "
+                       "find /var/lib/apt/lists -maxdepth 1 -name '*_Packages*' -printf '%f %s\\n' | sort; } 2>/dev/null "
+                       "| sha256sum")
+
+
+class FingerprintCache(Generic[T]):
+    """Values built from the package lists of a host, shared by every host with the same fingerprint"""
+
+    def __init__(self, max_size: int = 8) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+
+        self.max_size = max_size
+        self.__values: "OrderedDict[str, T]" = OrderedDict()
+        self.__building: Dict[str, Lock] = {}
+        self.__lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def __cached(self, fingerprint: str) -> Optional[T]:
+        with self.__lock:
+            value = self.__values.get(fingerprint)
+            if value is not None:
+                self.__values.move_to_end(fingerprint)
+
+            return value
+
+    def get(self, fingerprint: str, build: Callable[[], T]) -> T:
+        value = self.__cached(fingerprint)
+        if value is not None:
+            return value
+
+        with self.__lock:
+            building = self.__building.setdefault(fingerprint, Lock())
+
+        # Hosts asking for the same fingerprint wait for the first one instead of building it again
+        with building:
+            value = self.__cached(fingerprint)
+            if value is not None:
+                return value
+
+            value = build()
+            with self.__lock:
+                self.__values[fingerprint] = value
+                while len(self.__values) > self.max_size:
+                    self.__values.popitem(last=False)
+
+                self.__building.pop(fingerprint, None)
+
+        return value
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__values.clear()
@@ -0,0 +1,117 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+from pardus.apt.records import PackageRecord, installed_state
+
+
+class PackageMatrix:
+    """Installed package versions of many hosts as one `hosts x packages` array
+
+    Each cell holds an index into `versions`, or -1 when the package is not installed on the host.
+    """
+
+    def __init__(self, hosts: List[str], packages: List[str], versions: List[str], codes: Any) -> None:
+        if np is None:
+            raise ImportError("PackageMatrix needs numpy. Install it with `pip install pardus[matrix]`")
+
+        self.hosts = hosts
+        self.packages = packages
+        self.versions = versions
+        self.codes = codes
+
+        self.__host_index = {host: i for i, host in enumerate(hosts)}
+        self.__package_index = {package: i for i, package in enumerate(packages)}
+        self.__version_index = {version: i for i, version in enumerate(versions)}
+
+    @classmethod
+    def from_records(cls, records: Mapping[str, Iterable[PackageRecord]]) -> "PackageMatrix":
+        if np is None:
+            raise ImportError("PackageMatrix needs numpy. Install it with `pip install pardus[matrix]`")
+
+        packages: Dict[str, int] = {}
+        versions: Dict[str, int] = {}
+        # Records share their tag tuples, the installed state is worked out once per distinct tuple
+        states: Dict[Tuple[str, ...], Union[bool, str]] = {}
+        columns: List[Tuple[List[int], List[int]]] = []
+        for host_records in records.values():
+            package_codes: List[int] = []
+            version_codes: List[int] = []
+            for package, _, version, _, tags in host_records:
+                state = states.get(tags)
+                if state is None:
+                    state = states[tags] = installed_state(tags)
+
+                if state is False:
+                    continue
+
+                if state is not True:
+                    version = state
+
+                package_code = packages.get(package)
+                if package_code is None:
+                    package_code = packages[package] = len(packages)
+
+                version_code = versions.get(version)
+                if version_code is None:
+                    version_code = versions[version] = len(versions)
+
+                package_codes.append(package_code)
+                version_codes.append(version_code)
+
+            columns.append((package_codes, version_codes))
+
+        codes = np.full((len(columns), len(packages)), -1, dtype=np.int32)
+        for row, (package_codes, version_codes) in enumerate(columns):
+            codes[row, package_codes] = version_codes
+
+        return cls(list(records.keys()), list(packages), list(versions), codes)
+
+    @property
+    def installed(self) -> Any:
+        return self.codes >= 0
+
+    def __len__(self) -> int:
+        return len(self.hosts)
+
+    def __column(self, package: str) -> Any:
+        index = self.__package_index.get(package)
+        if index is None:
+            return np.full(len(self.hosts), -1, dtype=np.int32)
+
+        return self.codes[:, index]
+
+    def __hosts(self, mask: Any) -> List[str]:
+        return [self.hosts[i] for i in np.flatnonzero(mask)]
+
+    def __packages(self, mask: Any) -> List[str]:
+        return [self.packages[i] for i in np.flatnonzero(mask)]
+
+    def version(self, host: str, package: str) -> Optional[str]:
+        code = self.__column(package)[self.__host_index[host]]
+        return None if code < 0 else self.versions[code]
+
+    def having(self, package: str) -> List[str]:
+        """Hosts the package is installed on"""
+        return self.__hosts(self.__column(package) >= 0)
+
+    def lacking(self, package: str) -> List[str]:
+        """Hosts the package is not installed on"""
+        return self.__hosts(self.__column(package) < 0)
+
+    def differs(self, package: str, version: str) -> List[str]:
+        """Hosts the package is installed on with a version other than `version`"""
+        column = self.__column(package)
+        code = self.__version_index.get(version, -2)
+        return self.__hosts((column >= 0) & (column != code))
+
+    def on_all(self) -> List[str]:
+        """Packages installed on every host"""
+        return self.__packages(self.installed.all(axis=0))
+
+    def on_any(self) -> List[str]:
+        """Packages installed on at least one host"""
+        return self.__packages(self.installed.any(axis=0))
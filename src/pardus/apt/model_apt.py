@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Optional, Tuple, Union, Any
 
 
 class ModelApt(ABC):
@@ -7,13 +7,21 @@ class ModelApt(ABC):
     def repositories(self) -> List[Dict[str, str]]:
         """Returns available repositories"""
 
+    @abstractmethod
+    def state(self, packages: Union[str, List[str]]) -> Dict[str, Dict[str, Optional[str]]]:
+        """Returns installed and candidate versions of only the given package(s)"""
+
+    @abstractmethod
+    def refresh(self) -> Dict[str, Tuple[str, ...]]:
+        """Reloads the cached package index"""
+
     @abstractmethod
     def add_repository(self, repository: str) -> None:
         """Adds a single apt repository"""
 
     @abstractmethod
-    def update(self) -> None:
-        """Updates repositories (`apt update`)"""
+    def update(self, max_age: Optional[float] = None) -> bool:
+        """Updates repositories (`apt update`) unless they are younger than `max_age` seconds"""
 
     @abstractmethod
     def upgrade(self, package_name: Optional[str] = None) -> None:
@@ -40,8 +48,8 @@ class ModelApt(ABC):
         """Purges a specified package(s) (`apt purge package_name`)"""
 
     @abstractmethod
-    def search(self, package_name: str) -> List[Dict[str, str]]:
-        """Searches the given package (`apt search package_name`)"""
+    def search(self, package_name: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """Searches the given package (`apt search package_name`), reading at most `limit` hits"""
 
     @abstractmethod
     def show(self, package_name: str) -> Dict[Union[str, None], Any]:
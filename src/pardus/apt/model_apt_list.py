@@ -6,6 +6,7 @@ from typing_extensions import Self
 
 from pardus import Apt
 from pardus.connection.model_connector import ModelConnector
+from pardus.utils.fanout import HostResult
 
 
 class ModelAptList(ABC):
@@ -31,41 +32,45 @@ class ModelAptList(ABC):
         """Returns a AptList from a given connection list"""
 
     @abstractmethod
-    def repositories(self) -> Dict[Apt, List[Dict[str, str]]]:
+    def repositories(self) -> Dict[Apt, HostResult[List[Dict[str, Any]]]]:
         """Returns a dict of list of available apt repositories"""
 
     @abstractmethod
-    def add_repository(self, repository: str) -> None:
+    def add_repository(self, repository: str) -> Dict[Apt, HostResult[None]]:
         """Adds a new apt repository to all AptList"""
 
     @abstractmethod
-    def update(self) -> None:
-        """Updates repository of all AptList"""
+    def update(self, max_age: Optional[float] = None) -> Dict[Apt, HostResult[bool]]:
+        """Updates repository of all AptList, skipping hosts with lists younger than `max_age` seconds"""
 
     @abstractmethod
-    def upgrade(self, package_name: Optional[str] = None) -> None:
+    def upgrade(self, package_name: Optional[str] = None) -> Dict[Apt, HostResult[None]]:
         """Upgrades either the whole system of a specified package of all AptList"""
 
     @abstractmethod
-    def list(self, installed: bool = False, upgradeable: bool = False) -> Dict[Apt, List[Dict[str, str]]]:
+    def list(self, installed: bool = False, upgradeable: bool = False) -> Dict[Apt, HostResult[List[Dict[str, str]]]]:
         """Lists either all, installed, or upgradable (Or combination) packages of all AptList"""
 
     @abstractmethod
-    def install(self, package_name: Union[str, List[str]]) -> None:
+    def install(self, package_name: Union[str, List[str]]) -> Dict[Apt, HostResult[None]]:
         """Installs a specified package(s) (`apt install package_name`) on all AptList"""
 
     @abstractmethod
-    def reinstall(self, package_name: Union[str, List[str]]) -> None:
+    def reinstall(self, package_name: Union[str, List[str]]) -> Dict[Apt, HostResult[None]]:
         """Reinstalls a specified package(s) (`apt install package_name`) on all AptList"""
 
     @abstractmethod
-    def remove(self, package_name: Union[str, List[str]]) -> None:
+    def remove(self, package_name: Union[str, List[str]]) -> Dict[Apt, HostResult[None]]:
         """Removes a specified package(s) (`apt install package_name`) from all AptList"""
 
     @abstractmethod
-    def search(self, package_name: str) -> Dict[Apt, List[Dict[str, str]]]:
+    def purge(self, package_name: Union[str, List[str]]) -> Dict[Apt, HostResult[None]]:
+        """Purges a specified package(s) (`apt purge package_name`) from all AptList"""
+
+    @abstractmethod
+    def search(self, package_name: str, limit: Optional[int] = None) -> Dict[Apt, HostResult[List[Dict[str, str]]]]:
         """Search a specified package (`apt install package_name`) on all AptList"""
 
     @abstractmethod
-    def show(self, package_name: str) -> Dict[Apt, Dict[Union[str, None], Any]]:
+    def show(self, package_name: str) -> Dict[Apt, HostResult[Dict[Union[str, None], Any]]]:
         """Shows information about the given package(s) (`apt show package_name`) on all AptList"""
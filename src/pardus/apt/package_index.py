@@ -0,0 +1,76 @@
+import sys
+from operator import itemgetter
+from typing import Dict, Iterable, List, Tuple
+
+from pardus.apt.fingerprint import FingerprintCache
+from pardus.apt.parsers import VersionTable
+from pardus.apt.records import PackageRecord, tags_of
+from pardus.apt.version import compare_versions, version_key
+
+NOW_REPO = "now"
+
+
+class PackageIndex:
+    """Candidate versions of the package lists of one fingerprint
+
+    The installed state of the host the index was read from is dropped. `merge` adds the state of any host sharing
+    the same package lists, so `apt list` is parsed once per fingerprint instead of once per host.
+
+    A package the host has installed at a version newer than its package lists is only listed as `now`, the candidate
+    other hosts see is missing. Such packages are kept in `local` until `resolve` reads their version tables.
+    """
+
+    def __init__(self, records: Iterable[PackageRecord]) -> None:
+        self.candidates: Dict[Tuple[str, str], PackageRecord] = {}
+        self.local: List[Tuple[str, str]] = []
+        for record in records:
+            repos = [repo for repo in record.repo.split(",") if repo != NOW_REPO]
+            if not repos:
+                self.local.append((record.package, record.arch))
+                continue
+
+            self.candidates[(record.package, record.arch)] = record._replace(repo=sys.intern(",".join(repos)), tags=())
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def resolve(self, tables: Iterable[Tuple[str, VersionTable]]) -> None:
+        """Adds the candidates of the `local` packages from `apt-cache policy package:arch ...`
+
+        Like apt, the version with the highest priority wins and the higher version breaks a tie. Packages with no
+        version in the package lists, installed from a `.deb` file, stay out of the index.
+        """
+        by_name = dict(tables)
+        for package, arch in self.local:
+            # apt prints foreign packages as `package:arch` and native ones as `package`
+            table = by_name.get(f"{package}:{arch}", by_name.get(package, []))
+            usable = [entry for entry in table if entry[1] >= 0]
+            if usable:
+                version, _, suites = max(usable, key=lambda entry: (entry[1], version_key(entry[0])))
+                self.candidates[(package, arch)] = PackageRecord(package, sys.intern(",".join(suites)), version, arch, ())
+
+        self.local = []
+
+    def merge(self, installed: Iterable[PackageRecord]) -> List[PackageRecord]:
+        """The records `apt list` would print on a host with these installed packages"""
+        installed_by_key = {(record.package, record.arch): record for record in installed}
+        records = []
+        for key, candidate in self.candidates.items():
+            mine = installed_by_key.pop(key, None)
+            if mine is None:
+                records.append(candidate)
+            elif mine.version == candidate.version:
+                records.append(candidate._replace(repo=sys.intern(f"{candidate.repo},{NOW_REPO}"), tags=tags_of("installed")))
+            elif compare_versions(mine.version, candidate.version) < 0:
+                records.append(candidate._replace(tags=tags_of(f"upgradable from: {mine.version}")))
+            else:
+                records.append(mine._replace(repo=NOW_REPO, tags=tags_of("installed,local")))
+
+        for mine in installed_by_key.values():
+            records.append(mine._replace(repo=NOW_REPO, tags=tags_of("installed,local")))
+
+        records.sort(key=itemgetter(0))
+        return records
+
+
+PACKAGE_INDEXES: FingerprintCache[PackageIndex] = FingerprintCache()
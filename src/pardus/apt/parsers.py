@@ -0,0 +1,250 @@
+import re
+import sys
+from logging import Logger
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pardus.apt.records import PackageRecord, RepoEntry, tags_of
+
+REPOSITORY_PATTERN = re.compile(r'^(deb|deb-src)\s+'
+                                r'(\[.*?\]\s+)?'
+                                r'(\S+)\s+'
+                                r'(\S+)\s+'
+                                r'(.+)$')
+LIST_PATTERN = re.compile(r'\[[^\]]*\]|\S+')
+SEARCH_PATTERN = re.compile(r'(.+?)/(.+?)\s+([\d\w.:+-]+)\s+(\S+)(?:\s+\[.*\])?')
+
+
+def option_matcher(option: str) -> Optional[Dict[str, str]]:
+    if not option:
+        return None
+
+    options_to_return = {}
+    options = option.strip().lstrip("[").rstrip("]")
+
+    for option in options.split():
+        key, value = option.split("=")
+        options_to_return[key] = value
+
+    return options_to_return
+
+
+def parse_repository_records(lines: Iterable[str]) -> Iterator[RepoEntry]:
+    for line in lines:
+        match = REPOSITORY_PATTERN.match(line.strip())
+        if match:
+            yield RepoEntry(
+                sys.intern(match.group(1)),
+                option_matcher(match.group(2)),
+                match.group(3),
+                sys.intern(match.group(4)),
+                match.group(5).strip()
+            )
+
+
+def parse_repositories(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    for record in parse_repository_records(lines):
+        yield record.as_dict()
+
+
+def parse_policy(lines: Iterable[str]) -> Iterator[Dict[str, Optional[str]]]:
+    current: Optional[Dict[str, Optional[str]]] = None
+    for line in lines:
+        if not line.strip():
+            continue
+
+        if not line.startswith(" ") and line.rstrip().endswith(":"):
+            if current is not None:
+                yield current
+
+            current = {"package": line.rstrip()[:-1], "installed": None, "candidate": None}
+            continue
+
+        if current is None:
+            continue
+
+        key, _, value = line.strip().partition(": ")
+        if key in ("Installed", "Candidate"):
+            current[key.lower()] = None if value == "(none)" else value
+
+    if current is not None:
+        yield current
+
+
+VersionTable = List[Tuple[str, int, Tuple[str, ...]]]
+
+
+def _table_entry(version: str, priority: Optional[int], sources: List[Tuple[int, str]]) -> Tuple[str, int, Tuple[str, ...]]:
+    # Older apt does not print the priority of the version itself, it is the highest one of its sources
+    if priority is None:
+        priority = max(each for each, _ in sources)
+
+    return version, priority, tuple(dict.fromkeys(suite for _, suite in sources))
+
+
+def parse_version_tables(lines: Iterable[str]) -> Iterator[Tuple[str, VersionTable]]:
+    """`(version, priority, suites)` of every package in `apt-cache policy` output
+
+    Versions only known from `/var/lib/dpkg/status`, that is installed from outside the package lists, are left out.
+    """
+    package: Optional[str] = None
+    table: VersionTable = []
+    version: Optional[Tuple[str, Optional[int]]] = None
+    sources: List[Tuple[int, str]] = []
+    for line in lines:
+        if not line.strip():
+            continue
+
+        indent = len(line) - len(line.lstrip())
+        fields = line.split()
+        if indent == 0 or indent < 7 and not line.lstrip(" *").startswith(("Installed:", "Candidate:", "Version table:")):
+            # A package or a version starts, the version read so far is complete
+            if version is not None and sources:
+                table.append(_table_entry(version[0], version[1], sources))
+
+            version, sources = None, []
+            if indent == 0:
+                if package is not None:
+                    yield package, table
+
+                package, table = line.rstrip().rstrip(":"), []
+            else:
+                fields = [field for field in fields if field != "***"]
+                version = fields[0], int(fields[1]) if len(fields) > 1 else None
+        elif indent >= 7 and version is not None and fields[1] != "/var/lib/dpkg/status":
+            # `500 http://deb.debian.org/debian bookworm/main amd64 Packages`
+            sources.append((int(fields[0]), sys.intern(fields[2].split("/")[0] if len(fields) > 2 else fields[1])))
+
+    if version is not None and sources:
+        table.append(_table_entry(version[0], version[1], sources))
+
+    if package is not None:
+        yield package, table
+
+
+def parse_list_records(lines: Iterable[str], logger: Optional[Logger] = None) -> Iterator[PackageRecord]:
+    for line in lines:
+        try:
+            line = line.strip()
+            if "/" not in line:
+                continue
+
+            package, rest = line.split("/")
+            exp = LIST_PATTERN.findall(rest)
+            if len(exp) == 3:
+                repo, version, arch = exp
+                tags = ""
+            else:
+                repo, version, arch, tags = exp
+
+            yield PackageRecord(package, sys.intern(repo), version, sys.intern(arch), tags_of(tags))
+        except Exception as e:
+            if logger is not None:
+                logger.warning(e)
+
+
+def parse_list(lines: Iterable[str], logger: Optional[Logger] = None) -> Iterator[Dict[str, Any]]:
+    for record in parse_list_records(lines, logger):
+        yield record.as_dict()
+
+
+def parse_installed_records(lines: Iterable[str]) -> Iterator[PackageRecord]:
+    # Lines of `dpkg-query -W -f='${Package}\t${Version}\t${db:Status-Status}\t${Architecture}\n'`
+    for line in lines:
+        fields = line.rstrip("\n").split("\t")
+        if len(fields) >= 3 and fields[2] == "installed" and fields[1]:
+            arch = sys.intern(fields[3]) if len(fields) > 3 else ""
+            yield PackageRecord(fields[0], "now", fields[1], arch, tags_of("installed"))
+
+
+def parse_installed(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    for record in parse_installed_records(lines):
+        yield record.package, record.version
+
+
+def parse_cache_search(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    # `apt-cache search` prints `name - short description` per package
+    for line in lines:
+        name, separator, description = line.strip().partition(" - ")
+        if separator:
+            yield name, description
+
+
+def parse_search(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    found: Optional[Dict[str, str]] = None
+    for line in lines:
+        if found is not None and line.startswith(" "):
+            found["description"] = line.strip()
+            yield found
+            found = None
+            continue
+
+        match = SEARCH_PATTERN.match(line.strip())
+        if match:
+            if found is not None:
+                yield found
+
+            name, repo, version, arch = match.groups()
+            found = {
+                'name': name,
+                'repo': repo,
+                'version': version,
+                'architecture': arch,
+                'description': ''
+            }
+
+    if found is not None:
+        yield found
+
+
+def parse_show(lines: Iterable[str]) -> Dict[Union[str, None], Any]:
+    parsed_dict: Dict[Union[str, None], Any] = {}
+
+    current_key = None
+    for line in lines:
+        if not line.strip():
+            continue
+
+        if line.startswith(' '):
+            parsed_dict[current_key] += '\n' + line.strip()
+        else:
+            key, value = line.split(': ', 1)
+            current_key = key.strip()
+            if current_key == 'Depends':
+                parsed_dict[current_key] = [dep.strip() for dep in value.split(',')]
+            else:
+                parsed_dict[current_key] = value.strip()
+
+    return parsed_dict
+
+
+def parse_stanzas(lines: Iterable[str]) -> Iterator[Dict[Union[str, None], Any]]:
+    # RFC822 like paragraphs, as printed by `apt-cache show`, separated by blank lines
+    stanza: Dict[Union[str, None], Any] = {}
+    current_key = None
+    for line in lines:
+        if not line.strip():
+            if stanza:
+                yield stanza
+
+            stanza = {}
+            current_key = None
+            continue
+
+        if line[0] in " \t":
+            continuation = line.strip()
+            if isinstance(stanza.get(current_key), list):
+                stanza[current_key] += [dep.strip() for dep in continuation.split(',') if dep.strip()]
+            elif current_key is not None:
+                # A lone `.` keeps an empty line in multi-line fields such as Description
+                stanza[current_key] += "\n" + ("" if continuation == "." else continuation)
+            continue
+
+        key, _, value = line.partition(":")
+        current_key = key.strip()
+        if current_key == 'Depends':
+            stanza[current_key] = [dep.strip() for dep in value.split(',') if dep.strip()]
+        else:
+            stanza[current_key] = value.strip()
+
+    if stanza:
+        yield stanza
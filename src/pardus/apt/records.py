@@ -0,0 +1,62 @@
+import sys
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+UPGRADABLE_TAG = "upgradable from: "
+
+
+@lru_cache(maxsize=4096)
+def tags_of(raw: str) -> Tuple[str, ...]:
+    # Few distinct tag sets exist, every package with the same set shares one tuple
+    return tuple(sys.intern(each.strip()) for each in raw.lstrip("[").rstrip("]").split(",") if each.strip())
+
+
+class PackageRecord(NamedTuple):
+    package: str
+    repo: str
+    version: str
+    arch: str
+    tags: Tuple[str, ...]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "package": self.package,
+            "repo": self.repo,
+            "version": self.version,
+            "arch": self.arch,
+            "tags": list(self.tags)
+        }
+
+
+class RepoEntry(NamedTuple):
+    kind: str
+    options: Optional[Dict[str, str]]
+    url: str
+    distribution: str
+    components: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'kind': self.kind,
+            'options': self.options,
+            'url': self.url,
+            'distribution': self.distribution,
+            'components': self.components
+        }
+
+
+def installed_version(record: PackageRecord) -> Optional[str]:
+    state = installed_state(record.tags)
+    if state is True:
+        return record.version
+
+    return state or None
+
+
+def installed_state(tags: Tuple[str, ...]) -> Union[bool, str]:
+    # `apt list` shows the candidate of an upgradable package, the installed version is only in its tag
+    for tag in tags:
+        if tag.startswith(UPGRADABLE_TAG):
+            return tag[len(UPGRADABLE_TAG):]
+
+    return "installed" in tags
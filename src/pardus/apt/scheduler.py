@@ -0,0 +1,152 @@
+import time
+from logging import Logger, getLogger
+from random import Random
+from threading import Lock
+from typing import Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from pardus.apt.apt import Apt
+from pardus.apt.apt_list import AptList
+from pardus.utils.fanout import HostResult, fan_out
+
+T = TypeVar("T")
+
+
+def mirror_of(url: str) -> str:
+    """Host and port of a repository url, without credentials"""
+    return urlsplit(url).netloc.rpartition("@")[2].lower()
+
+
+class TokenBucket:
+    """Lets `rate` callers per second through on average and up to `burst` at once
+
+    Callers waiting for a token are served in the order they asked, each one reserving its slot before sleeping.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__tokens = float(burst)
+        self.__updated = clock()
+        self.__lock = Lock()
+
+    def reserve(self) -> float:
+        """Takes a token, returns the seconds to wait before using it"""
+        with self.__lock:
+            now = self.__clock()
+            self.__tokens = min(float(self.burst), self.__tokens + (now - self.__updated) * self.rate)
+            self.__updated = now
+            self.__tokens -= 1
+            return max(0.0, -self.__tokens / self.rate)
+
+    def acquire(self) -> float:
+        delay = self.reserve()
+        if delay > 0:
+            self.__sleep(delay)
+
+        return delay
+
+
+class UpdateScheduler:
+    """Runs `update` and `upgrade` over an AptList without every host hitting the mirrors at once
+
+    Each host waits a random `jitter`, then for one of `max_concurrent` slots, then for a token of every mirror in its
+    sources. Mirrors are told apart by host name and each one gets its own bucket of `rate` downloads per second.
+    The AptList's `timeout` is counted from the moment a host got its slot and tokens, the waiting is not charged.
+    """
+
+    def __init__(self, apts: AptList, rate: float = 1.0, burst: int = 1, jitter: float = 0.0, max_concurrent: int = 8,
+                 logger: Optional[Logger] = None, random: Optional[Random] = None) -> None:
+        if logger is None:
+            self.logger = getLogger(__name__)
+        else:
+            self.logger = logger
+
+        if jitter < 0:
+            raise ValueError("jitter must not be negative")
+
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be positive")
+
+        # Checked here rather than on the first bucket
+        TokenBucket(rate, burst)
+
+        self.apts = apts
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.max_concurrent = max_concurrent
+
+        self.__random = Random() if random is None else random
+        self.__buckets: Dict[str, TokenBucket] = {}
+        self.__lock = Lock()
+
+    def bucket(self, mirror: str) -> TokenBucket:
+        with self.__lock:
+            if mirror not in self.__buckets:
+                self.__buckets[mirror] = TokenBucket(self.rate, self.burst)
+
+            return self.__buckets[mirror]
+
+    @staticmethod
+    def mirrors(apt: Apt) -> List[str]:
+        # file: and cdrom: sources have no host and download nothing
+        return sorted({mirror for mirror in (mirror_of(entry.url) for entry in apt.repository_records()) if mirror})
+
+    def __delay(self) -> float:
+        with self.__lock:
+            return self.__random.uniform(0, self.jitter)
+
+    def __wait(self, mirrors: List[str]) -> None:
+        if self.jitter:
+            time.sleep(self.__delay())
+
+        # Tokens are taken while holding the slot, so hosts waiting for a slot can not bunch up on a mirror later
+        for mirror in mirrors:
+            waited = self.bucket(mirror).acquire()
+            if waited:
+                self.logger.debug(f"Waited {waited:.3f} seconds for {mirror}")
+
+    def __scheduled(self, operation: Callable[[Apt], T], fresh: Optional[Callable[[Apt], bool]] = None,
+                    skipped: Optional[T] = None) -> Dict[Apt, HostResult[T]]:
+        # The mirrors of every host are read first, within the AptList's timeout. A host whose lists are `fresh` is
+        # answered with `skipped` right away and takes neither a slot nor a token
+        plans = self.apts.map(lambda apt: None if fresh is not None and fresh(apt) else self.mirrors(apt))
+        ready = [apt for apt, plan in plans.items() if plan.ok and plan.value is not None]
+
+        # A slot is a worker of fan_out, the jitter and the tokens are waited for before the host's deadline starts
+        done = fan_out(ready, operation, max_workers=self.max_concurrent, timeout=self.apts.timeout, logger=self.apts.logger,
+                       prepare=lambda apt: self.__wait(plans[apt].unwrap() or []))
+
+        results: Dict[Apt, HostResult[T]] = {}
+        for apt, plan in plans.items():
+            if apt in done:
+                results[apt] = done[apt]
+            elif plan.ok:
+                results[apt] = HostResult(value=skipped, duration=plan.duration)
+            else:
+                results[apt] = HostResult(exception=plan.exception, duration=plan.duration)
+
+        return results
+
+    def map(self, operation: Callable[[Apt], T]) -> Dict[Apt, HostResult[T]]:
+        return self.__scheduled(operation)
+
+    def update(self, max_age: Optional[float] = None) -> Dict[Apt, HostResult[bool]]:
+        if max_age is None:
+            return self.map(lambda apt: apt.update())
+
+        return self.__scheduled(lambda apt: apt.update(max_age=max_age), fresh=lambda apt: apt.lists_fresh(max_age),
+                                skipped=False)
+
+    def upgrade(self, package_name: Optional[str] = None) -> Dict[Apt, HostResult[None]]:
+        return self.map(lambda apt: apt.upgrade(package_name=package_name))
@@ -0,0 +1,77 @@
+import re
+from bisect import bisect_left
+from heapq import nsmallest
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pardus.apt.fingerprint import FingerprintCache
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokens_of(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchIndex:
+    """Inverted index over the names and short descriptions of packages
+
+    `token` matches whole words, `prefix` matches words starting with the query as typed, `substring` matches anywhere
+    in the package name. Hits come back sorted by package name.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]) -> None:
+        packages = dict(entries)
+        self.names = sorted(packages)
+        self.descriptions = [packages[name] for name in self.names]
+
+        postings: Dict[str, List[int]] = {}
+        for i, (name, description) in enumerate(zip(self.names, self.descriptions)):
+            for token in set(tokens_of(name)).union(tokens_of(description)):
+                postings.setdefault(token, []).append(i)
+
+        self.__postings = postings
+        self.__tokens = sorted(postings)
+        self.__lower_names = [name.lower() for name in self.names]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __hits(self, ids: Iterable[int], limit: Optional[int]) -> List[Dict[str, str]]:
+        ordered = sorted(ids) if limit is None else nsmallest(limit, ids)
+        return [{"name": self.names[i], "description": self.descriptions[i]} for i in ordered]
+
+    @staticmethod
+    def __intersect(matches: List[Set[int]]) -> Set[int]:
+        if not matches:
+            return set()
+
+        matches.sort(key=len)
+        return matches[0].intersection(*matches[1:])
+
+    def __starting_with(self, prefix: str) -> Set[int]:
+        ids: Set[int] = set()
+        for i in range(bisect_left(self.__tokens, prefix), len(self.__tokens)):
+            if not self.__tokens[i].startswith(prefix):
+                break
+
+            ids.update(self.__postings[self.__tokens[i]])
+
+        return ids
+
+    def token(self, query: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """Packages having every word of the query"""
+        matches = [set(self.__postings.get(token, ())) for token in tokens_of(query)]
+        return self.__hits(self.__intersect(matches), limit)
+
+    def prefix(self, query: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """Packages having a word starting with each word of the query"""
+        matches = [self.__starting_with(token) for token in tokens_of(query)]
+        return self.__hits(self.__intersect(matches), limit)
+
+    def substring(self, query: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """Packages with the query anywhere in their name"""
+        query = query.lower()
+        return self.__hits((i for i, name in enumerate(self.__lower_names) if query in name), limit)
+
+
+SEARCH_INDEXES: FingerprintCache[SearchIndex] = FingerprintCache()
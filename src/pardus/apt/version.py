@@ -0,0 +1,86 @@
+import re
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+PART_PATTERN = re.compile(r"(\D*)(\d*)")
+
+PartKey = Tuple[Tuple[Tuple[int, ...], int], ...]
+VersionKey = Tuple[int, PartKey, PartKey]
+
+OPERATORS = {
+    "lt": lambda c: c < 0, "<<": lambda c: c < 0,
+    "le": lambda c: c <= 0, "<=": lambda c: c <= 0,
+    "eq": lambda c: c == 0, "=": lambda c: c == 0,
+    "ne": lambda c: c != 0,
+    "ge": lambda c: c >= 0, ">=": lambda c: c >= 0,
+    "gt": lambda c: c > 0, ">>": lambda c: c > 0,
+}
+
+
+def split_version(version: str) -> Tuple[int, str, str]:
+    version = version.strip()
+    if not version:
+        raise ValueError("Version string is empty")
+
+    epoch, colon, rest = version.partition(":")
+    if not colon:
+        epoch, rest = "0", version
+
+    if not epoch.isdigit():
+        raise ValueError(f"Epoch of `{version}` is not a number")
+
+    upstream, hyphen, revision = rest.rpartition("-")
+    if not hyphen:
+        upstream, revision = rest, ""
+
+    if not upstream:
+        raise ValueError(f"Upstream version of `{version}` is empty")
+
+    return int(epoch), upstream, revision
+
+
+def _order(character: str) -> int:
+    # dpkg sorts `~` before everything, even the end of the string, and letters before the other symbols
+    if character == "~":
+        return -1
+
+    if character.isascii() and character.isalpha():
+        return ord(character)
+
+    return ord(character) + 256
+
+
+@lru_cache(maxsize=1024)
+def _letters_key(letters: str) -> Tuple[int, ...]:
+    # Few distinct separators exist (`.`, `-`, `~rc`, `+deb`), they are converted once
+    return tuple(_order(character) for character in letters) + (0,)
+
+
+def _part_key(part: str) -> PartKey:
+    # An empty revision equals `0`. The trailing empty match of the pattern stands for the end of the string
+    return tuple((_letters_key(letters), int(digits or 0)) for letters, digits in PART_PATTERN.findall(part or "0"))
+
+
+@lru_cache(maxsize=65536)
+def version_key(version: str) -> VersionKey:
+    """Sort key ordering versions like `dpkg --compare-versions`"""
+    epoch, upstream, revision = split_version(version)
+    return epoch, _part_key(upstream), _part_key(revision)
+
+
+def compare_versions(first: str, second: str) -> int:
+    first_key = version_key(first)
+    second_key = version_key(second)
+    return (first_key > second_key) - (first_key < second_key)
+
+
+def check_versions(first: str, operator: str, second: str) -> bool:
+    """Same as `dpkg --compare-versions first operator second`"""
+    if operator not in OPERATORS:
+        raise ValueError(f"Unknown operator `{operator}`")
+
+    return bool(OPERATORS[operator](compare_versions(first, second)))
+
+
+def newest(versions: Iterable[str]) -> Optional[str]:
+    return max(versions, key=version_key, default=None)
@@ -0,0 +1,58 @@
+from functools import partial
+from logging import Logger
+from pathlib import Path
+from typing import Optional, Union, Dict, Any, Iterator
+
+from typing_extensions import Self
+
+from pardus.config.config import Config
+from pardus.connection.async_ssh_connector import AsyncSSHConnector
+
+
+class AsyncConfig:
+    def __init__(self, connector: AsyncSSHConnector, config: Config) -> None:
+        self.connector = connector
+        self.config = config
+        self.logger = config.logger
+
+    @classmethod
+    async def open(cls, connector: AsyncSSHConnector, path: Union[str, Path],
+                   create: bool = False, backup: bool = False, force: bool = False,
+                   sudo_passwd: Optional[str] = None,
+                   logger: Optional[Logger] = None) -> Self:
+        config = await connector.call(
+            partial(Config, connector.connector, path, create=create, backup=backup, force=force,
+                    sudo_passwd=sudo_passwd, logger=logger)
+        )
+        return cls(connector, config)
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        return dict(self.config[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.config
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.config)
+
+    def __len__(self) -> int:
+        return len(self.config)
+
+    @property
+    def path(self) -> Path:
+        return self.config.path
+
+    async def set(self, key: str, value: Dict[str, str]) -> None:
+        await self.connector.call(self.config.__setitem__, key, value)
+
+    async def delete(self, key: str) -> None:
+        await self.connector.call(self.config.__delitem__, key)
+
+    async def update(self, *args, **kwargs) -> None:
+        await self.connector.call(self.config.update, *args, **kwargs)
+
+    async def clear(self) -> None:
+        await self.connector.call(self.config.clear)
+
+    async def read(self) -> str:
+        return await self.connector.call(self.config.read)
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from pardus.connection.model_connector import ModelConnector
+
+BACKUP_WINDOW = 8
+
+
+def free_backup(connector: ModelConnector, path: Path) -> Path:
+    """First `path.N` that does not exist on the host"""
+    # Candidates are checked BACKUP_WINDOW at a time, in one round trip per window
+    counter = 0
+    while True:
+        candidates = [path.parent / (path.name + f".{counter + i}") for i in range(BACKUP_WINDOW)]
+        results = connector.run_many([f"test -e {candidate} && echo exist" for candidate in candidates])
+        for candidate, result in zip(candidates, results):
+            if "e" not in result.stdout.decode():
+                return candidate
+
+        counter += BACKUP_WINDOW
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Optional, Union, Dict, Any
 
 from pardus.config.model_config import ModelConfig
+from pardus.config.backup import free_backup
 from pardus.connection.model_connector import ModelConnector
 
 
@@ -57,10 +58,12 @@ class Config(Dict[str, Any], ModelConfig):
         self.__update()
 
     def touch(self) -> None:
-        _ = self.connector.sudo_run(
-            f"mkdir -p {self.path.parent.absolute().__str__()}", passwd=self.sudo_passwd
-        )
-        _ = self.connector.sudo_run(f"touch {self.path.absolute().__str__()}", passwd=self.sudo_passwd)
+        results = self.connector.sudo_run_many([
+            f"mkdir -p {self.path.parent.absolute().__str__()}",
+            f"touch {self.path.absolute().__str__()}",
+        ], passwd=self.sudo_passwd)
+        for result in results:
+            result.check()
 
     def exist(self, the_file: Optional[Union[str, Path]] = None) -> bool:
         if the_file is None:
@@ -75,16 +78,11 @@ class Config(Dict[str, Any], ModelConfig):
         return "e" in stdout.read().decode()
 
     def create_backup(self) -> None:
-        backup_base = self.path.parent / (self.path.name + ".0")
+        backup_base = free_backup(self.connector, self.path)
 
-        counter = 1
-        while self.exist(backup_base):
-            backup_base = backup_base.parent / (backup_base.stem + f".{counter}")
-            counter += 1
-
-        _ = self.connector.sudo_run(
+        self.connector.sudo_run(
             f"cp {self.path.absolute().__str__()} {backup_base.absolute().__str__()}", passwd=self.sudo_passwd
-        )
+        ).check()
 
     def read(self) -> str:
         stdout = self.connector.sudo_run(f"cat {self.path.absolute().__str__()}", passwd=self.sudo_passwd)
@@ -99,4 +97,4 @@ class Config(Dict[str, Any], ModelConfig):
         with io.StringIO() as ss:
             self.config.write(ss)
             ss.seek(0)
-            _ = self.connector.sudo_run(f"echo '{ss.read()}' > {self.path.absolute().__str__()}")
+            self.connector.sudo_run(f"echo '{ss.read()}' > {self.path.absolute().__str__()}").check()
@@ -2,6 +2,7 @@ from logging import Logger, getLogger
 from pathlib import Path
 from typing import Union, Optional
 
+from pardus.config.backup import free_backup
 from pardus.connection.model_connector import ModelConnector
 
 
@@ -66,22 +67,19 @@ class ConfigRaw:
         return "e" in stdout.read().decode()
 
     def create_backup(self) -> None:
-        backup_base = self.path.parent / (self.path.name + ".0")
+        backup_base = free_backup(self.connector, self.path)
 
-        counter = 1
-        while self.exist(backup_base):
-            backup_base = backup_base.parent / (backup_base.stem + f".{counter}")
-            counter += 1
-
-        _ = self.connector.sudo_run(
+        self.connector.sudo_run(
             f"cp {self.path.absolute().__str__()} {backup_base.absolute().__str__()}", passwd=self.sudo_passwd
-        )
+        ).check()
 
     def touch(self) -> None:
-        _ = self.connector.sudo_run(
-            f"mkdir -p {self.path.parent.absolute().__str__()}", passwd=self.sudo_passwd
-        )
-        _ = self.connector.sudo_run(f"touch {self.path.absolute().__str__()}", passwd=self.sudo_passwd)
+        results = self.connector.sudo_run_many([
+            f"mkdir -p {self.path.parent.absolute().__str__()}",
+            f"touch {self.path.absolute().__str__()}",
+        ], passwd=self.sudo_passwd)
+        for result in results:
+            result.check()
 
     def __update(self) -> None:
-        _ = self.connector.sudo_run(f"echo '{self.data}' > {self.path.absolute().__str__()}")
\ No newline at end of file
+        self.connector.sudo_run(f"echo '{self.data}' > {self.path.absolute().__str__()}").check()
\ No newline at end of file
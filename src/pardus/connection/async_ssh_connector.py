@@ -0,0 +1,94 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from logging import Logger, getLogger
+from threading import Lock
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+
+from typing_extensions import Self
+
+from pardus.connection.model_connector import ModelAsyncConnector, ModelConnector
+from pardus.connection.result import CommandResult
+from pardus.connection.ssh_connector import SSHConnector
+from pardus.connection.ssh_pool import SSHPool
+
+T = TypeVar("T")
+
+DEFAULT_WORKERS = 512
+
+_EXECUTOR: Optional[Executor] = None
+_EXECUTOR_LOCK = Lock()
+
+
+def default_executor() -> Executor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS, thread_name_prefix="pardus")
+
+        return _EXECUTOR
+
+
+async def run_blocking(func: Callable[[], T], semaphore: Optional[asyncio.Semaphore] = None,
+                       executor: Optional[Executor] = None) -> T:
+    loop = asyncio.get_running_loop()
+    if executor is None:
+        executor = default_executor()
+
+    if semaphore is None:
+        return await loop.run_in_executor(executor, func)
+
+    async with semaphore:
+        return await loop.run_in_executor(executor, func)
+
+
+class AsyncSSHConnector(ModelAsyncConnector):
+    def __init__(self, connector: ModelConnector, semaphore: Optional[asyncio.Semaphore] = None,
+                 executor: Optional[Executor] = None, logger: Optional[Logger] = None) -> None:
+        if logger is None:
+            self.logger = getLogger(__name__)
+        else:
+            self.logger = logger
+
+        if executor is None:
+            self.executor = default_executor()
+        else:
+            self.executor = executor
+
+        self.connector = connector
+        self.semaphore = semaphore
+
+    @classmethod
+    async def open(cls, address: str, port: int, user: str, passwd: str, logger: Optional[Logger] = None,
+                   pool: Optional[SSHPool] = None, semaphore: Optional[asyncio.Semaphore] = None,
+                   executor: Optional[Executor] = None) -> Self:
+        connector = await run_blocking(
+            partial(SSHConnector, address, port, user, passwd, logger=logger, pool=pool),
+            semaphore=semaphore, executor=executor
+        )
+        return cls(connector, semaphore=semaphore, executor=executor, logger=logger)
+
+    @property
+    def address(self) -> str:
+        return str(getattr(self.connector, "address", ""))
+
+    async def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await run_blocking(partial(func, *args, **kwargs), semaphore=self.semaphore, executor=self.executor)
+
+    async def close(self) -> None:
+        close = getattr(self.connector, "close", None)
+        if close is not None:
+            await self.call(close)
+
+    async def run(self, command: str, timeout: Optional[float] = None) -> CommandResult:
+        return await self.call(self.connector.run, command, timeout=timeout)
+
+    async def sudo_run(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> CommandResult:
+        return await self.call(self.connector.sudo_run, command, passwd=passwd, timeout=timeout)
+
+    async def run_many(self, commands: Sequence[str], timeout: Optional[float] = None) -> List[CommandResult]:
+        return await self.call(self.connector.run_many, commands, timeout=timeout)
+
+    async def sudo_run_many(self, commands: Sequence[str], passwd: Optional[str] = None,
+                            timeout: Optional[float] = None) -> List[CommandResult]:
+        return await self.call(self.connector.sudo_run_many, commands, passwd=passwd, timeout=timeout)
@@ -0,0 +1,48 @@
+import re
+from typing import List, Sequence, Tuple
+from uuid import uuid4
+
+from pardus.connection.result import CommandResult
+from pardus.utils.error import CommandError
+
+
+def new_token() -> str:
+    return f"PARDUS_{uuid4().hex}"
+
+
+def frame(command: str, marker: str) -> str:
+    # stdin is closed for the command, so it can not swallow the rest of the script.
+    # The leading newlines keep the markers on their own line when the output does not end with one.
+    return (
+        f"{{ {command}\n}} < /dev/null\n"
+        f"printf '\\n%s %d\\n' '{marker}' $?\n"
+        f"printf '\\n%s\\n' '{marker}' >&2\n"
+    )
+
+
+def script(commands: Sequence[str], token: str) -> Tuple[str, List[str]]:
+    markers = [f"{token}_{i}" for i in range(len(commands))]
+    return "".join(frame(command, marker) for command, marker in zip(commands, markers)), markers
+
+
+def split(commands: Sequence[str], markers: Sequence[str], stdout: bytes, stderr: bytes) -> List[CommandResult]:
+    results: List[CommandResult] = []
+    out_position = 0
+    err_position = 0
+    for command, marker in zip(commands, markers):
+        encoded = marker.encode()
+        out_match = re.compile(b"\n" + re.escape(encoded) + rb" (\d+)\n").search(stdout, out_position)
+        err_index = stderr.find(b"\n" + encoded + b"\n", err_position)
+        if out_match is None or err_index < 0:
+            raise CommandError(f"Batch was interrupted after {len(results)} of {len(commands)} commands")
+
+        results.append(CommandResult(
+            command=command,
+            stdout=stdout[out_position:out_match.start()],
+            stderr=stderr[err_position:err_index],
+            exit_status=int(out_match.group(1)),
+        ))
+        out_position = out_match.end()
+        err_position = err_index + len(encoded) + 2
+
+    return results
@@ -0,0 +1,82 @@
+from select import select
+from time import monotonic
+from typing import Iterator, Optional, Tuple
+
+from paramiko.channel import Channel
+
+from pardus.connection.result import CommandResult
+from pardus.utils.error import CommandTimeout
+
+BUFFER_SIZE = 32768
+
+
+def deadline(timeout: Optional[float]) -> Optional[float]:
+    if timeout is None:
+        return None
+
+    return monotonic() + timeout
+
+
+def wait(channel: Channel, until: Optional[float]) -> None:
+    if until is None:
+        select([channel], [], [], 1.0)
+        return
+
+    remaining = until - monotonic()
+    if remaining <= 0:
+        raise CommandTimeout("Command did not finish in time")
+
+    select([channel], [], [], min(remaining, 1.0))
+
+
+def chunks(channel: Channel, timeout: Optional[float] = None) -> Iterator[Tuple[bool, bytes]]:
+    """Yield `(is_stderr, data)` from both streams as it arrives, until the command exits"""
+    # Reading one stream to the end before the other can stall the remote side once the unread one fills up
+    until = deadline(timeout)
+    while True:
+        received = False
+        while channel.recv_ready():
+            yield False, channel.recv(BUFFER_SIZE)
+            received = True
+
+        while channel.recv_stderr_ready():
+            yield True, channel.recv_stderr(BUFFER_SIZE)
+            received = True
+
+        if received:
+            if until is not None and monotonic() > until:
+                raise CommandTimeout("Command did not finish in time")
+            continue
+
+        if channel.exit_status_ready() or channel.closed:
+            if not channel.recv_ready() and not channel.recv_stderr_ready():
+                return
+            continue
+
+        wait(channel, until)
+
+
+def collect(channel: Channel, timeout: Optional[float] = None) -> Tuple[bytes, bytes]:
+    stdout = bytearray()
+    stderr = bytearray()
+    for is_stderr, data in chunks(channel, timeout):
+        if is_stderr:
+            stderr += data
+        else:
+            stdout += data
+
+    return bytes(stdout), bytes(stderr)
+
+
+def execute(channel: Channel, command: str, timeout: Optional[float] = None) -> CommandResult:
+    start = monotonic()
+    try:
+        stdout, stderr = collect(channel, timeout)
+        exit_status = channel.recv_exit_status() if channel.exit_status_ready() else -1
+    except CommandTimeout:
+        raise CommandTimeout(f"`{command}` did not finish in {timeout} seconds") from None
+    finally:
+        channel.close()
+
+    return CommandResult(command=command, stdout=stdout, stderr=stderr, exit_status=exit_status,
+                         duration=monotonic() - start)
@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from pardus.connection.result import CommandResult
+
+VERSION = 1
+
+# Kinds of recordings holding the results of a whole batch, sent to the host in one round trip
+BATCH_KINDS = ("run_many", "sudo_run_many")
+
+Batch = Tuple[List[CommandResult], float]
+
+
+def encode(kind: str, result: CommandResult) -> Dict[str, Any]:
+    return {"kind": kind, **_output(result)}
+
+
+def encode_batch(kind: str, results: Sequence[CommandResult], duration: float) -> Dict[str, Any]:
+    return {
+        "kind": kind,
+        "commands": [result.command for result in results],
+        "results": [_output(result) for result in results],
+        "duration": duration,
+    }
+
+
+def _output(result: CommandResult) -> Dict[str, Any]:
+    # surrogateescape keeps output that is not valid utf-8 byte for byte
+    return {
+        "command": result.command,
+        "stdout": result.stdout.decode("utf-8", "surrogateescape"),
+        "stderr": result.stderr.decode("utf-8", "surrogateescape"),
+        "exit_status": result.exit_status,
+        "duration": result.duration,
+    }
+
+
+def decode(recording: Dict[str, Any]) -> CommandResult:
+    return CommandResult(
+        command=recording["command"],
+        stdout=recording["stdout"].encode("utf-8", "surrogateescape"),
+        stderr=recording["stderr"].encode("utf-8", "surrogateescape"),
+        exit_status=recording["exit_status"],
+        duration=recording["duration"],
+    )
+
+
+def save(recordings: List[Dict[str, Any]], path: Union[str, Path]) -> None:
+    with open(path, "w") as f:
+        json.dump({"version": VERSION, "recordings": recordings}, f, indent=1)
+
+
+def load(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        data = json.load(f)
+
+    if data.get("version") != VERSION:
+        raise ValueError(f"Unsupported fixture version: {data.get('version')}")
+
+    return list(data["recordings"])
+
+
+def index(recordings: List[Dict[str, Any]]) -> Dict[Tuple[str, str], List[CommandResult]]:
+    results: Dict[Tuple[str, str], List[CommandResult]] = {}
+    for recording in recordings:
+        if recording["kind"] not in BATCH_KINDS:
+            results.setdefault((recording["kind"], recording["command"]), []).append(decode(recording))
+
+    return results
+
+
+def index_batches(recordings: List[Dict[str, Any]]) -> Dict[Tuple[str, Tuple[str, ...]], List[Batch]]:
+    batches: Dict[Tuple[str, Tuple[str, ...]], List[Batch]] = {}
+    for recording in recordings:
+        if recording["kind"] in BATCH_KINDS:
+            batches.setdefault((recording["kind"], tuple(recording["commands"])), []).append(
+                ([decode(result) for result in recording["results"]], recording["duration"])
+            )
+
+    return batches
@@ -0,0 +1,137 @@
+import os
+import signal
+import subprocess
+from logging import Logger, getLogger
+from threading import Event, Thread, Timer
+from time import monotonic
+from typing import IO, Iterator, List, Optional, Tuple
+
+from pardus.connection.model_connector import ModelConnector
+from pardus.connection.result import CommandResult
+from pardus.connection.sudo import sudo_command
+from pardus.utils.error import CommandTimeout
+
+
+class LocalConnector(ModelConnector):
+    def __init__(self, passwd: Optional[str] = None, logger: Optional[Logger] = None) -> None:
+        if logger is None:
+            self.logger = getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.address = "localhost"
+        self.passwd = passwd
+
+    def close(self) -> None:
+        pass
+
+    def run(self, command: str, timeout: Optional[float] = None) -> CommandResult:
+        return self.__execute(command, command, timeout=timeout)
+
+    def sudo_run(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> CommandResult:
+        shell_command, stdin = self.__sudo(command, passwd)
+        return self.__execute(command, shell_command, stdin=stdin, timeout=timeout)
+
+    def run_lines(self, command: str, timeout: Optional[float] = None) -> Iterator[str]:
+        return self.__stream(command, command, timeout=timeout)
+
+    def sudo_run_lines(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> Iterator[str]:
+        shell_command, stdin = self.__sudo(command, passwd)
+        return self.__stream(command, shell_command, stdin=stdin, timeout=timeout)
+
+    def __sudo(self, command: str, passwd: Optional[str] = None) -> Tuple[str, Optional[bytes]]:
+        if os.geteuid() == 0:
+            return command, None
+
+        if passwd is None:
+            passwd_to_use = self.passwd
+        else:
+            passwd_to_use = passwd
+
+        if passwd_to_use is None:
+            # Without a password sudo must not wait for one
+            return f"sudo -n su -c \"{command}\"", None
+
+        # With a NOPASSWD rule or cached credentials sudo leaves stdin alone, the wrapper consumes the password line
+        return sudo_command(f"su -c \"{command}\""), (passwd_to_use + "\n").encode()
+
+    def __execute(self, command: str, shell_command: str, stdin: Optional[bytes] = None,
+                  timeout: Optional[float] = None) -> CommandResult:
+        start = monotonic()
+        process = self.__spawn(shell_command, stdin)
+        try:
+            stdout, stderr = process.communicate(input=stdin, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.__kill(process)
+            process.communicate()
+            raise CommandTimeout(f"`{command}` did not finish in {timeout} seconds") from None
+
+        self._validate(stderr)
+        return CommandResult(command=command, stdout=stdout, stderr=stderr,
+                             exit_status=process.returncode, duration=monotonic() - start)
+
+    @staticmethod
+    def __spawn(shell_command: str, stdin: Optional[bytes] = None) -> "subprocess.Popen[bytes]":
+        # A session of its own lets a timeout kill the whole pipeline, not only the shell
+        return subprocess.Popen(
+            shell_command, shell=True, start_new_session=True,
+            stdin=subprocess.DEVNULL if stdin is None else subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+
+    @staticmethod
+    def __kill(process: "subprocess.Popen[bytes]") -> None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def __stream(self, command: str, shell_command: str, stdin: Optional[bytes] = None,
+                 timeout: Optional[float] = None) -> Iterator[str]:
+        process = self.__spawn(shell_command, stdin)
+        if stdin is not None and process.stdin is not None:
+            process.stdin.write(stdin)
+            process.stdin.close()
+
+        # stderr is drained alongside stdout so a full pipe can not stall the command
+        stderr: List[bytes] = []
+        drainer = Thread(target=self.__drain, args=(process.stderr, stderr), daemon=True)
+        drainer.start()
+
+        expired = Event()
+        timer = None
+        if timeout is not None:
+            timer = Timer(timeout, self.__expire, args=(process, expired))
+            timer.start()
+
+        try:
+            if process.stdout is not None:
+                for line in process.stdout:
+                    yield line.decode().rstrip("\r\n")
+
+            process.wait()
+            if expired.is_set():
+                raise CommandTimeout(f"`{command}` did not finish in {timeout} seconds")
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+            if process.poll() is None:
+                self.__kill(process)
+
+            process.wait()
+            drainer.join()
+
+        self._validate(b"".join(stderr))
+        # A failed command must not look like one without output
+        CommandResult(command=command, stderr=b"".join(stderr), exit_status=process.returncode).check()
+
+    @classmethod
+    def __expire(cls, process: "subprocess.Popen[bytes]", expired: Event) -> None:
+        expired.set()
+        cls.__kill(process)
+
+    @staticmethod
+    def __drain(stream: Optional[IO[bytes]], chunks: List[bytes]) -> None:
+        if stream is not None:
+            chunks.extend(iter(lambda: stream.read(32768), b""))
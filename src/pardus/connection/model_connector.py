@@ -1,15 +1,69 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from logging import Logger
+from typing import Iterator, List, Optional, Sequence
 
-from paramiko.channel import ChannelFile
+from pardus.connection.result import CommandResult
+from pardus.utils.common import iter_lines
 
 
 class ModelConnector(ABC):
+    logger: Logger
 
     @abstractmethod
-    def run(self, command: str) -> ChannelFile:
+    def run(self, command: str, timeout: Optional[float] = None) -> CommandResult:
         """Run a command"""
 
     @abstractmethod
-    def sudo_run(self, command: str, passwd: Optional[str] = None) -> ChannelFile:
+    def sudo_run(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> CommandResult:
         """Run a command as root"""
+
+    def _validate(self, stderr: bytes) -> None:
+        """Log the warnings and errors a command printed"""
+        for line in stderr.decode(errors="replace").splitlines():
+            if line.startswith("W:") or line.startswith("WARNING:"):
+                self.logger.warning(line)
+            if line.startswith("E:") or line.startswith("ERROR:"):
+                self.logger.error(line)
+
+    def run_lines(self, command: str, timeout: Optional[float] = None) -> Iterator[str]:
+        """Run a command and yield its output line by line, a failed command raises CommandError
+
+        This fallback waits for the whole output. Connectors able to read the output as it arrives override it.
+        """
+        return iter_lines(self.run(command, timeout=timeout).check())
+
+    def sudo_run_lines(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> Iterator[str]:
+        """Run a command as root and yield its output line by line, a failed command raises CommandError
+
+        This fallback waits for the whole output. Connectors able to read the output as it arrives override it.
+        """
+        return iter_lines(self.sudo_run(command, passwd=passwd, timeout=timeout).check())
+
+    def run_many(self, commands: Sequence[str], timeout: Optional[float] = None) -> List[CommandResult]:
+        """Run commands one after another and return a result for each"""
+        return [self.run(command, timeout=timeout) for command in commands]
+
+    def sudo_run_many(self, commands: Sequence[str], passwd: Optional[str] = None,
+                      timeout: Optional[float] = None) -> List[CommandResult]:
+        """Run commands as root one after another and return a result for each"""
+        return [self.sudo_run(command, passwd=passwd, timeout=timeout) for command in commands]
+
+
+class ModelAsyncConnector(ABC):
+
+    @abstractmethod
+    async def run(self, command: str, timeout: Optional[float] = None) -> CommandResult:
+        """Run a command without blocking the event loop"""
+
+    @abstractmethod
+    async def sudo_run(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> CommandResult:
+        """Run a command as root without blocking the event loop"""
+
+    @abstractmethod
+    async def run_many(self, commands: Sequence[str], timeout: Optional[float] = None) -> List[CommandResult]:
+        """Run commands in a single round trip without blocking the event loop"""
+
+    @abstractmethod
+    async def sudo_run_many(self, commands: Sequence[str], passwd: Optional[str] = None,
+                            timeout: Optional[float] = None) -> List[CommandResult]:
+        """Run commands as root in a single round trip without blocking the event loop"""
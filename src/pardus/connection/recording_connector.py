@@ -0,0 +1,93 @@
+from logging import Logger, getLogger
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from pardus.connection import fixture
+from pardus.connection.model_connector import ModelConnector
+from pardus.connection.result import CommandResult
+from pardus.utils.error import CommandError
+
+
+class RecordingConnector(ModelConnector):
+    def __init__(self, connector: ModelConnector, logger: Optional[Logger] = None) -> None:
+        if logger is None:
+            self.logger = getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.connector = connector
+        self.address = str(getattr(connector, "address", ""))
+        self.__recordings: List[Dict[str, Any]] = []
+        self.__lock = Lock()
+
+    @property
+    def recordings(self) -> List[Dict[str, Any]]:
+        with self.__lock:
+            return list(self.__recordings)
+
+    def close(self) -> None:
+        close = getattr(self.connector, "close", None)
+        if close is not None:
+            close()
+
+    def save(self, path: Union[str, Path]) -> None:
+        fixture.save(self.recordings, path)
+
+    def run(self, command: str, timeout: Optional[float] = None) -> CommandResult:
+        return self.__record("run", self.connector.run(command, timeout=timeout))
+
+    def sudo_run(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> CommandResult:
+        return self.__record("sudo_run", self.connector.sudo_run(command, passwd=passwd, timeout=timeout))
+
+    def run_many(self, commands: Sequence[str], timeout: Optional[float] = None) -> List[CommandResult]:
+        # Batches are passed on whole and recorded as one round trip, replaying them one by one would not be the same
+        start = monotonic()
+        results = self.connector.run_many(commands, timeout=timeout)
+        return self.__record_batch("run_many", results, monotonic() - start)
+
+    def sudo_run_many(self, commands: Sequence[str], passwd: Optional[str] = None,
+                      timeout: Optional[float] = None) -> List[CommandResult]:
+        start = monotonic()
+        results = self.connector.sudo_run_many(commands, passwd=passwd, timeout=timeout)
+        return self.__record_batch("sudo_run_many", results, monotonic() - start)
+
+    def run_lines(self, command: str, timeout: Optional[float] = None) -> Iterator[str]:
+        return self.__record_lines("run", command, self.connector.run_lines(command, timeout=timeout))
+
+    def sudo_run_lines(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> Iterator[str]:
+        return self.__record_lines("sudo_run", command, self.connector.sudo_run_lines(command, passwd=passwd, timeout=timeout))
+
+    def __record_lines(self, kind: str, command: str, lines: Iterator[str]) -> Iterator[str]:
+        # Lines are passed on as they arrive and recorded as one result once the command finished.
+        # A caller stopping early leaves no recording, the output it saw is not the whole output
+        start = monotonic()
+        seen: List[str] = []
+        try:
+            for line in lines:
+                seen.append(line)
+                yield line
+        except CommandError as e:
+            self.__record(kind, CommandResult(command=command, stdout="".join(f"{line}\n" for line in seen).encode(),
+                                              stderr=str(e).encode(), exit_status=-1, duration=monotonic() - start))
+            raise
+        finally:
+            close = getattr(lines, "close", None)
+            if close is not None:
+                close()
+
+        self.__record(kind, CommandResult(command=command, stdout="".join(f"{line}\n" for line in seen).encode(),
+                                          duration=monotonic() - start))
+
+    def __record_batch(self, kind: str, results: List[CommandResult], duration: float) -> List[CommandResult]:
+        with self.__lock:
+            self.__recordings.append(fixture.encode_batch(kind, results, duration))
+
+        return results
+
+    def __record(self, kind: str, result: CommandResult) -> CommandResult:
+        with self.__lock:
+            self.__recordings.append(fixture.encode(kind, result))
+
+        return result
@@ -0,0 +1,104 @@
+from logging import Logger, getLogger
+from pathlib import Path
+from threading import Lock
+from time import sleep
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from typing_extensions import Self
+
+from pardus.connection import fixture
+from pardus.connection.model_connector import ModelConnector
+from pardus.connection.result import CommandResult
+from pardus.utils.error import CommandTimeout, NotFound
+
+T = TypeVar("T")
+
+
+class ReplayConnector(ModelConnector):
+    def __init__(self, results: Dict[Tuple[str, str], List[CommandResult]], address: str = "replay",
+                 replay_latency: bool = False, logger: Optional[Logger] = None,
+                 batches: Optional[Dict[Tuple[str, Tuple[str, ...]], List[fixture.Batch]]] = None) -> None:
+        if logger is None:
+            self.logger = getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.address = address
+        self.replay_latency = replay_latency
+
+        # The results are only read, many replayed hosts can share them
+        self.__results = results
+        self.__batches = {} if batches is None else batches
+
+        self.__played: Dict[Any, int] = {}
+        self.__lock = Lock()
+
+    @classmethod
+    def from_recordings(cls, recordings: List[Dict[str, Any]], address: str = "replay", replay_latency: bool = False,
+                        logger: Optional[Logger] = None) -> Self:
+        return cls(fixture.index(recordings), address=address, replay_latency=replay_latency, logger=logger,
+                   batches=fixture.index_batches(recordings))
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], address: str = "replay", replay_latency: bool = False,
+                  logger: Optional[Logger] = None) -> Self:
+        return cls.from_recordings(fixture.load(path), address=address, replay_latency=replay_latency, logger=logger)
+
+    def close(self) -> None:
+        pass
+
+    def run(self, command: str, timeout: Optional[float] = None) -> CommandResult:
+        return self.__replay("run", command, timeout)
+
+    def sudo_run(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> CommandResult:
+        return self.__replay("sudo_run", command, timeout)
+
+    def run_many(self, commands: Sequence[str], timeout: Optional[float] = None) -> List[CommandResult]:
+        return self.__replay_batch("run_many", commands, timeout)
+
+    def sudo_run_many(self, commands: Sequence[str], passwd: Optional[str] = None,
+                      timeout: Optional[float] = None) -> List[CommandResult]:
+        return self.__replay_batch("sudo_run_many", commands, timeout)
+
+    def __replay(self, kind: str, command: str, timeout: Optional[float] = None) -> CommandResult:
+        key = (kind, command)
+        if key not in self.__results:
+            raise NotFound(f"No recording of `{command}` ({kind})")
+
+        result = self.__next(key, self.__results[key])
+        self.__wait(command, result.duration, timeout)
+        return self.__copy(result)
+
+    def __replay_batch(self, kind: str, commands: Sequence[str], timeout: Optional[float] = None) -> List[CommandResult]:
+        key = (kind, tuple(commands))
+        if key not in self.__batches:
+            # Fixtures recorded command by command still replay, each command with its own latency
+            single = "run" if kind == "run_many" else "sudo_run"
+            return [self.__replay(single, command, timeout) for command in commands]
+
+        # A batch is one round trip, its latency is waited once
+        results, duration = self.__next(key, self.__batches[key])
+        self.__wait(f"{len(commands)} commands", duration, timeout)
+        return [self.__copy(result) for result in results]
+
+    def __next(self, key: Any, recordings: List[T]) -> T:
+        # Repeated commands get their recordings in order, the last one is repeated once they run out
+        with self.__lock:
+            played = self.__played.get(key, 0)
+            self.__played[key] = played + 1
+            return recordings[min(played, len(recordings) - 1)]
+
+    def __wait(self, command: str, duration: float, timeout: Optional[float]) -> None:
+        if not self.replay_latency:
+            return
+
+        if timeout is not None and duration > timeout:
+            sleep(timeout)
+            raise CommandTimeout(f"`{command}` did not finish in {timeout} seconds")
+
+        sleep(duration)
+
+    @staticmethod
+    def __copy(result: CommandResult) -> CommandResult:
+        return CommandResult(command=result.command, stdout=result.stdout, stderr=result.stderr,
+                             exit_status=result.exit_status, duration=result.duration)
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Iterator
+
+from pardus.utils.error import CommandError
+
+
+@dataclass
+class CommandResult:
+    command: str
+    stdout: bytes = b""
+    stderr: bytes = b""
+    exit_status: int = 0
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_status == 0
+
+    @property
+    def stdout_size(self) -> int:
+        return len(self.stdout)
+
+    @property
+    def stderr_size(self) -> int:
+        return len(self.stderr)
+
+    def read(self) -> bytes:
+        # Callers used to get a file like stdout back
+        return self.stdout
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.stdout.splitlines(keepends=True))
+
+    def check(self) -> "CommandResult":
+        if not self.ok:
+            error = self.stderr.decode(errors="replace").strip()
+            raise CommandError(f"`{self.command}` exited with {self.exit_status}: {error}")
+
+        return self
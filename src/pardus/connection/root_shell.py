@@ -0,0 +1,135 @@
+import re
+from logging import Logger, getLogger
+from threading import Lock
+from time import monotonic
+from typing import List, Optional, Sequence, Tuple
+
+from paramiko.channel import Channel
+from paramiko.client import SSHClient
+
+from pardus.connection import batch
+from pardus.connection.channel import BUFFER_SIZE, deadline, wait
+from pardus.connection.result import CommandResult
+from pardus.connection.sudo import sudo_command
+from pardus.utils.error import CommandError, CommandTimeout
+
+OPEN_TIMEOUT = 30.0
+
+
+class RootShell:
+    def __init__(self, client: SSHClient, passwd: str, logger: Optional[Logger] = None) -> None:
+        if logger is None:
+            self.logger = getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.client = client
+        self.passwd = passwd
+
+        self.__token = batch.new_token()
+        self.__counter = 0
+        self.__channel: Optional[Channel] = None
+        self.__lock = Lock()
+
+    def is_alive(self) -> bool:
+        return (
+                self.__channel is not None
+                and not self.__channel.closed
+                and not self.__channel.exit_status_ready()
+        )
+
+    def open(self) -> None:
+        transport = self.client.get_transport()
+        if transport is None or not transport.is_active():
+            raise CommandError("The ssh connection is not active")
+
+        channel = transport.open_session()
+        channel.exec_command(sudo_command("sh -s"))
+        channel.sendall((self.passwd + "\n").encode())
+        self.__channel = channel
+
+        try:
+            # A wrong password leaves sudo waiting for another one
+            self.__execute(["true"], OPEN_TIMEOUT)
+        except CommandError:
+            self.close()
+            raise CommandError("Could not open a root shell")
+
+    def close(self) -> None:
+        if self.__channel is not None:
+            try:
+                self.__channel.close()
+            except Exception as e:
+                self.logger.warning(e)
+
+            self.__channel = None
+
+    def run(self, command: str, timeout: Optional[float] = None) -> CommandResult:
+        return self.run_many([command], timeout=timeout)[0]
+
+    def run_many(self, commands: Sequence[str], timeout: Optional[float] = None) -> List[CommandResult]:
+        if not commands:
+            return []
+
+        with self.__lock:
+            if not self.is_alive():
+                self.open()
+
+            try:
+                return self.__execute(commands, timeout)
+            except CommandTimeout:
+                # The shell is still busy with the command, it can not be reused
+                self.close()
+                raise CommandTimeout(f"Root shell did not finish in {timeout} seconds") from None
+
+    def __execute(self, commands: Sequence[str], timeout: Optional[float] = None) -> List[CommandResult]:
+        if self.__channel is None:
+            raise CommandError("Root shell is not open")
+
+        start = monotonic()
+        self.__counter += 1
+        script, markers = batch.script(commands, f"{self.__token}_{self.__counter}")
+        self.__channel.sendall(script.encode())
+
+        stdout, stderr = self.__read_until(self.__channel, markers[-1].encode(), deadline(timeout))
+        results = batch.split(commands, markers, stdout, stderr)
+        for result in results:
+            result.duration = monotonic() - start
+
+        return results
+
+    @staticmethod
+    def __read_until(channel: Channel, marker: bytes, until: Optional[float]) -> Tuple[bytes, bytes]:
+        out_pattern = re.compile(b"\n" + re.escape(marker) + rb" (\d+)\n")
+        err_marker = b"\n" + marker + b"\n"
+
+        stdout = bytearray()
+        stderr = bytearray()
+        out_match = None
+        err_index = -1
+        while True:
+            received = False
+            while channel.recv_ready():
+                start = max(len(stdout) - len(marker) - 32, 0)
+                stdout += channel.recv(BUFFER_SIZE)
+                if out_match is None:
+                    out_match = out_pattern.search(stdout, start)
+                received = True
+
+            while channel.recv_stderr_ready():
+                start = max(len(stderr) - len(err_marker), 0)
+                stderr += channel.recv_stderr(BUFFER_SIZE)
+                if err_index < 0:
+                    err_index = stderr.find(err_marker, start)
+                received = True
+
+            if out_match is not None and err_index >= 0:
+                return bytes(stdout[:out_match.end()]), bytes(stderr[:err_index + len(err_marker)])
+
+            if not received:
+                if channel.closed or channel.eof_received:
+                    raise CommandError("Root shell was closed")
+
+                wait(channel, until)
+            elif until is not None and monotonic() > until:
+                raise CommandTimeout("Root shell did not finish in time")
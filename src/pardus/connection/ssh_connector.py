@@ -1,15 +1,25 @@
 from _socket import gaierror
 from logging import Logger, getLogger
-from typing import Optional
+from time import monotonic
+from typing import Iterator, List, Optional, Sequence
 
-from paramiko.channel import ChannelFile
+from paramiko.channel import Channel
 from paramiko.client import SSHClient, AutoAddPolicy
 
+from pardus.connection import batch
+from pardus.connection.channel import chunks, collect, execute
 from pardus.connection.model_connector import ModelConnector
+from pardus.connection.result import CommandResult
+from pardus.connection.root_shell import RootShell
+from pardus.connection.ssh_pool import SSHPool
+from pardus.connection.sudo import sudo_command
+from pardus.utils.common import iter_lines
+from pardus.utils.error import CommandTimeout
 
 
 class SSHConnector(ModelConnector):
-    def __init__(self, address: str, port: int, user: str, passwd: str, logger: Optional[Logger] = None) -> None:
+    def __init__(self, address: str, port: int, user: str, passwd: str, logger: Optional[Logger] = None,
+                 pool: Optional[SSHPool] = None, persistent_sudo: bool = False) -> None:
         if logger is None:
             self.logger = getLogger(__name__)
         else:
@@ -19,20 +29,33 @@ class SSHConnector(ModelConnector):
         self.port = port
         self.user = user
         self.passwd = passwd
-        self.client = self.connect()
+        self.pool = pool
+        self.persistent_sudo = persistent_sudo
+        self.root_shell: Optional[RootShell] = None
+        self.client: Optional[SSHClient] = self.connect()
 
     def __del__(self):
         self.close()
 
     def close(self):
         try:
+            if self.root_shell is not None:
+                self.root_shell.close()
+                self.root_shell = None
+
             if self.client is not None:
-                self.client.close()
-                del self.client
+                if self.pool is None:
+                    self.client.close()
+                else:
+                    self.pool.release(self.client)
+                self.client = None
         except Exception as e:
             self.logger.warning(e)
 
     def connect(self) -> SSHClient:
+        if self.pool is not None:
+            return self.pool.acquire(self.address, self.port, self.user, self.passwd)
+
         client = SSHClient()
         client.set_missing_host_key_policy(AutoAddPolicy())
         try:
@@ -45,34 +68,129 @@ class SSHConnector(ModelConnector):
             self.logger.error(e)
             raise ValueError(e)
 
-    def _validate(self, stderr):
-        # https://stackoverflow.com/questions/35266753/paramiko-python-module-hangs-at-stdout-read
-        pass
-        # error = stderr.read().decode()
-        # if error:
-        #     for line in error.split("\n"):
-        #         if line:
-        #             if line.startswith("W:") or line.startswith("WARNING:"):
-        #                 self.logger.warning(line)
-        #             if line.startswith("E:") or line.startswith("ERROR:"):
-        #                 self.logger.warning(line)
-        #                 raise CommandError(error)
-
-    def run(self, command: str) -> ChannelFile:
-        stdin, stdout, stderr = self.client.exec_command(command)
-        self._validate(stderr)
-
-        return stdout
-
-    def sudo_run(self, command: str, passwd: Optional[str] = None) -> ChannelFile:
+    def _get_client(self) -> SSHClient:
+        if self.client is None:
+            self.client = self.connect()
+        elif self.pool is not None and not SSHPool.is_alive(self.client):
+            self.pool.release(self.client)
+            self.client = self.connect()
+
+        return self.client
+
+    def run(self, command: str, timeout: Optional[float] = None) -> CommandResult:
+        result = execute(self.__open(command), command, timeout)
+        self._validate(result.stderr)
+        return result
+
+    def sudo_run(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> CommandResult:
+        if self.persistent_sudo:
+            result = self.__root_shell(passwd).run(command, timeout=timeout)
+        else:
+            result = execute(self.__sudo_open(command, passwd), command, timeout)
+
+        self._validate(result.stderr)
+        return result
+
+    def run_lines(self, command: str, timeout: Optional[float] = None) -> Iterator[str]:
+        return self.__stream(self.__open(command), command, timeout)
+
+    def sudo_run_lines(self, command: str, passwd: Optional[str] = None, timeout: Optional[float] = None) -> Iterator[str]:
+        if self.persistent_sudo:
+            # The root shell answers one command at a time and reads it whole to find its end marker
+            return iter_lines(self.sudo_run(command, passwd=passwd, timeout=timeout).check())
+
+        return self.__stream(self.__sudo_open(command, passwd), command, timeout)
+
+    def run_many(self, commands: Sequence[str], timeout: Optional[float] = None) -> List[CommandResult]:
+        if not commands:
+            return []
+
+        return self.__batch(commands, "sh -s", timeout=timeout)
+
+    def sudo_run_many(self, commands: Sequence[str], passwd: Optional[str] = None,
+                      timeout: Optional[float] = None) -> List[CommandResult]:
+        if not commands:
+            return []
+
+        if self.persistent_sudo:
+            return self.__root_shell(passwd).run_many(commands, timeout=timeout)
+
+        return self.__batch(commands, sudo_command("sh -s"), self.passwd if passwd is None else passwd, timeout)
+
+    def __batch(self, commands: Sequence[str], shell: str, passwd: Optional[str] = None,
+                timeout: Optional[float] = None) -> List[CommandResult]:
+        script, markers = batch.script(commands, batch.new_token())
+        if passwd is not None:
+            script = passwd + "\n" + script
+
+        start = monotonic()
+        channel = self.__open(shell)
+        try:
+            channel.sendall(script.encode())
+            channel.shutdown_write()
+            stdout, stderr = collect(channel, timeout)
+        except CommandTimeout:
+            raise CommandTimeout(f"Batch of {len(commands)} commands did not finish in {timeout} seconds") from None
+        finally:
+            channel.close()
+
+        results = batch.split(commands, markers, stdout, stderr)
+        for result in results:
+            result.duration = monotonic() - start
+            self._validate(result.stderr)
+
+        return results
+
+    def __root_shell(self, passwd: Optional[str] = None) -> RootShell:
+        client = self._get_client()
+        if self.root_shell is None or self.root_shell.client is not client:
+            if self.root_shell is not None:
+                self.root_shell.close()
+
+            self.root_shell = RootShell(client, self.passwd if passwd is None else passwd, logger=self.logger)
+
+        return self.root_shell
+
+    def __open(self, command: str) -> Channel:
+        transport = self._get_client().get_transport()
+        if transport is None:
+            raise ValueError("The ssh connection is not active")
+
+        channel = transport.open_session()
+        channel.exec_command(command)
+        return channel
+
+    def __sudo_open(self, command: str, passwd: Optional[str] = None) -> Channel:
         if passwd is None:
             passwd_to_use = self.passwd
         else:
             passwd_to_use = passwd
 
-        sudo_command = f"sudo -S -p '' su -c \"{command}\""
-        stdin, stdout, stderr = self.client.exec_command(sudo_command)
-        stdin.write(passwd_to_use + "\n")
-        stdin.flush()
-        self._validate(stderr)
-        return stdout
+        channel = self.__open(sudo_command(f"su -c \"{command}\""))
+        channel.sendall((passwd_to_use + "\n").encode())
+        return channel
+
+    def __stream(self, channel: Channel, command: str, timeout: Optional[float] = None) -> Iterator[str]:
+        # stderr is drained alongside stdout. Closing the channel lets the caller stop reading early
+        stderr = bytearray()
+        pending = b""
+        try:
+            for is_stderr, data in chunks(channel, timeout):
+                if is_stderr:
+                    stderr += data
+                    continue
+
+                *lines, pending = (pending + data).split(b"\n")
+                for line in lines:
+                    yield line.decode().rstrip("\r")
+
+            if pending:
+                yield pending.decode().rstrip("\r")
+
+            exit_status = channel.recv_exit_status() if channel.exit_status_ready() else -1
+        finally:
+            channel.close()
+
+        self._validate(bytes(stderr))
+        # A failed command must not look like one without output
+        CommandResult(command=command, stderr=bytes(stderr), exit_status=exit_status).check()
@@ -0,0 +1,186 @@
+import hmac
+import os
+from _socket import gaierror
+from hashlib import sha256
+from logging import Logger, getLogger
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+from paramiko.client import SSHClient, AutoAddPolicy
+
+from pardus.utils.error import PoolExhausted
+
+# address, port, user and a digest of the password
+PoolKey = Tuple[str, int, str, str]
+
+
+class _PoolEntry:
+    def __init__(self, client: SSHClient) -> None:
+        self.client = client
+        self.users = 0
+        self.last_used = monotonic()
+
+
+class SSHPool:
+    def __init__(self, max_connections: int = 512, idle_timeout: float = 300.0, logger: Optional[Logger] = None) -> None:
+        if logger is None:
+            self.logger = getLogger(__name__)
+        else:
+            self.logger = logger
+
+        if max_connections < 1:
+            raise ValueError("max_connections must be positive")
+
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+
+        self.__entries: Dict[PoolKey, _PoolEntry] = {}
+        self.__opening = 0
+        self.__lock = Lock()
+        # Passwords are only kept as a keyed digest, the key never leaves the pool
+        self.__secret = os.urandom(32)
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+    def __contains__(self, key: PoolKey) -> bool:
+        with self.__lock:
+            return key in self.__entries
+
+    def key(self, address: str, port: int, user: str, passwd: str) -> PoolKey:
+        """A connection is only shared by callers with the same credentials"""
+        return address, port, user, hmac.new(self.__secret, passwd.encode(), sha256).hexdigest()
+
+    @staticmethod
+    def is_alive(client: SSHClient) -> bool:
+        transport = client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+
+        try:
+            transport.send_ignore()
+        except Exception:
+            return False
+
+        return True
+
+    def acquire(self, address: str, port: int, user: str, passwd: str) -> SSHClient:
+        key = self.key(address, port, user, passwd)
+        while True:
+            with self.__lock:
+                entry = self.__entries.get(key)
+                if entry is None:
+                    break
+
+                client = self.__lease(entry)
+
+            # The liveness check talks to the host, other callers must not wait for it
+            if self.is_alive(client):
+                return client
+
+            self.logger.info(f"Dropping dead connection to {user}@{address}:{port}")
+            with self.__lock:
+                dead = [self.__entries.pop(key).client] if self.__entries.get(key) is entry else []
+            self.__close(dead)
+
+        with self.__lock:
+            closing = self.__evict_idle()
+            if len(self.__entries) + self.__opening >= self.max_connections:
+                closing += self.__evict_oldest_unused()
+
+            exhausted = len(self.__entries) + self.__opening >= self.max_connections
+            if not exhausted:
+                self.__opening += 1
+
+        self.__close(closing)
+        if exhausted:
+            self.logger.error("Connection pool is exhausted")
+            raise PoolExhausted(f"Can not open more than {self.max_connections} connections")
+
+        try:
+            client = self.__open(address, port, user, passwd)
+        finally:
+            with self.__lock:
+                self.__opening -= 1
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                entry = _PoolEntry(client)
+                self.__entries[key] = entry
+                return self.__lease(entry)
+
+            pooled = self.__lease(entry)
+
+        # Another caller opened the same connection meanwhile
+        client.close()
+        return pooled
+
+    def release(self, client: SSHClient) -> None:
+        with self.__lock:
+            for entry in self.__entries.values():
+                if entry.client is client:
+                    entry.users = max(entry.users - 1, 0)
+                    entry.last_used = monotonic()
+                    closing: List[SSHClient] = []
+                    break
+            else:
+                closing = [client]
+
+            closing += self.__evict_idle()
+
+        self.__close(closing)
+
+    def evict_idle(self) -> None:
+        with self.__lock:
+            closing = self.__evict_idle()
+
+        self.__close(closing)
+
+    def close(self) -> None:
+        with self.__lock:
+            closing = [entry.client for entry in self.__entries.values()]
+            self.__entries.clear()
+
+        self.__close(closing)
+
+    def __open(self, address: str, port: int, user: str, passwd: str) -> SSHClient:
+        client = SSHClient()
+        client.set_missing_host_key_policy(AutoAddPolicy())
+        try:
+            client.connect(hostname=address, port=port, username=user, password=passwd)
+            return client
+        except gaierror as e:
+            self.logger.error(e)
+            raise ValueError(e)
+
+    @staticmethod
+    def __lease(entry: _PoolEntry) -> SSHClient:
+        entry.users += 1
+        entry.last_used = monotonic()
+        return entry.client
+
+    def __close(self, clients: List[SSHClient]) -> None:
+        # Closing sends a disconnect to the host, it is done after the lock is released
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                self.logger.warning(e)
+
+    def __evict_idle(self) -> List[SSHClient]:
+        now = monotonic()
+        return [
+            self.__entries.pop(key).client for key, entry in list(self.__entries.items())
+            if entry.users == 0 and now - entry.last_used > self.idle_timeout
+        ]
+
+    def __evict_oldest_unused(self) -> List[SSHClient]:
+        unused = [(entry.last_used, key) for key, entry in self.__entries.items() if entry.users == 0]
+        if not unused:
+            return []
+
+        _, key = min(unused)
+        return [self.__entries.pop(key).client]
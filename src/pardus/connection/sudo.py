@@ -0,0 +1,15 @@
+import shlex
+
+
+def sudo_command(command: str) -> str:
+    """Runs `command` as root with the password expected on the first line of stdin
+
+    With a NOPASSWD rule or cached credentials sudo does not read stdin, and `sh -s` would run the password as a command.
+    The first line is therefore always consumed, by sudo when it needs the password and by the shell otherwise.
+    """
+    return "sh -c " + shlex.quote(
+        "if sudo -n true 2>/dev/null; then "
+        f"IFS= read -r line; exec sudo -n {command}; "
+        # -k makes sudo always consume the password line, even if credentials were cached meanwhile
+        f"else exec sudo -k -S -p '' {command}; fi"
+    )
@@ -0,0 +1,3 @@
+from .inventory import Inventory, Snapshot
+
+__all__ = ["Inventory", "Snapshot"]
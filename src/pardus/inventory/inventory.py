@@ -0,0 +1,284 @@
+import json
+import sqlite3
+from collections import Counter
+from logging import Logger, getLogger
+from pathlib import Path
+from time import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from pardus.apt.apt import Apt
+from pardus.apt.records import PackageRecord, RepoEntry, installed_version
+from pardus.apt.version import compare_versions
+from pardus.connection.model_connector import ModelConnector
+from pardus.service.records import UnitRecord
+from pardus.service.service import Service
+from pardus.utils.common import host_name, iter_lines
+from pardus.utils.fanout import DEFAULT_MAX_WORKERS, HostResult, fan_out
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    host TEXT PRIMARY KEY,
+    fingerprint TEXT,
+    refreshed REAL NOT NULL,
+    facts TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS packages (
+    host TEXT NOT NULL REFERENCES hosts(host) ON DELETE CASCADE,
+    package TEXT NOT NULL,
+    arch TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    candidate TEXT NOT NULL,
+    installed TEXT,
+    PRIMARY KEY (host, package, arch)
+);
+CREATE INDEX IF NOT EXISTS packages_by_package ON packages (package, host);
+CREATE TABLE IF NOT EXISTS repositories (
+    host TEXT NOT NULL REFERENCES hosts(host) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    distribution TEXT NOT NULL,
+    components TEXT NOT NULL,
+    options TEXT
+);
+CREATE INDEX IF NOT EXISTS repositories_by_host ON repositories (host);
+CREATE TABLE IF NOT EXISTS units (
+    host TEXT NOT NULL REFERENCES hosts(host) ON DELETE CASCADE,
+    unit TEXT NOT NULL,
+    load TEXT NOT NULL,
+    active TEXT NOT NULL,
+    substate TEXT NOT NULL,
+    description TEXT NOT NULL,
+    PRIMARY KEY (host, unit)
+);
+CREATE INDEX IF NOT EXISTS units_by_unit ON units (unit, host);
+CREATE INDEX IF NOT EXISTS units_by_state ON units (active, host);
+"""
+
+FACT_COMMANDS = ["hostname", "uname -r", "cat /etc/os-release"]
+
+
+class Snapshot(NamedTuple):
+    fingerprint: str
+    facts: Dict[str, str]
+    packages: List[PackageRecord]
+    repositories: List[RepoEntry]
+    units: List[UnitRecord]
+
+
+def _debver_cmp(first: Optional[str], second: Optional[str]) -> Optional[int]:
+    if first is None or second is None:
+        return None
+
+    return compare_versions(first, second)
+
+
+class Inventory:
+    """Packages, repositories, units and facts of many hosts kept in a SQLite database
+
+    `refresh` only asks hosts whose data is older than `max_age` seconds, or whose package lists changed, so queries
+    run against the local copy instead of a round trip to every host. Versions compare with the `debver_cmp` SQL
+    function and sort with the `DEBVERSION` collation.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:", max_age: float = 3600.0, logger: Optional[Logger] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, timeout: Optional[float] = None) -> None:
+        if logger is None:
+            self.logger = getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.path = str(path)
+        self.max_age = max_age
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.create_function("debver_cmp", 2, _debver_cmp, deterministic=True)
+        self.connection.create_collation("DEBVERSION", compare_versions)
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "Inventory":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def address(connector: ModelConnector) -> str:
+        # The same name on every refresh, hosts behind one address are told apart by user and port
+        return host_name(connector)
+
+    def refreshed(self) -> Dict[str, Tuple[Optional[str], float]]:
+        return {
+            host: (fingerprint, refreshed)
+            for host, fingerprint, refreshed in self.connection.execute("SELECT host, fingerprint, refreshed FROM hosts")
+        }
+
+    def stale(self, connectors: Iterable[ModelConnector], now: Optional[float] = None) -> List[ModelConnector]:
+        """Hosts never seen or seen more than `max_age` seconds ago"""
+        if now is None:
+            now = time()
+
+        known = self.refreshed()
+        return [
+            connector for connector in connectors
+            if self.address(connector) not in known or now - known[self.address(connector)][1] > self.max_age
+        ]
+
+    def refresh(self, connectors: Sequence[ModelConnector], force: bool = False) -> Dict[str, HostResult[bool]]:
+        """Update the stored hosts, the value of each result tells whether the host was read again"""
+        shared = [host for host, count in Counter(self.address(connector) for connector in connectors).items() if count > 1]
+        if shared:
+            raise ValueError(f"Connectors share the host names {', '.join(shared)}, one would overwrite the other")
+
+        known = self.refreshed()
+        stale = {id(connector) for connector in (connectors if force else self.stale(connectors))}
+
+        def collect(connector: ModelConnector) -> Optional[Snapshot]:
+            if id(connector) in stale:
+                return self.snapshot(connector)
+
+            # A fresh host is only read again when its package lists changed
+            fingerprint = Apt(connector, logger=self.logger).fingerprint()
+            if known[self.address(connector)][0] == fingerprint:
+                return None
+
+            return self.snapshot(connector, fingerprint)
+
+        snapshots = fan_out(connectors, collect, max_workers=self.max_workers, timeout=self.timeout, logger=self.logger)
+
+        results: Dict[str, HostResult[bool]] = {}
+        now = time()
+        for connector, snapshot in snapshots.items():
+            host = self.address(connector)
+            if snapshot.ok and snapshot.value is not None:
+                self.store(host, snapshot.value, now)
+
+            results[host] = HostResult(value=snapshot.value is not None if snapshot.ok else None,
+                                       exception=snapshot.exception, duration=snapshot.duration)
+
+        return results
+
+    def snapshot(self, connector: ModelConnector, fingerprint: Optional[str] = None) -> Snapshot:
+        apt = Apt(connector, logger=self.logger)
+
+        fact_results = connector.run_many(FACT_COMMANDS)
+        facts = {"hostname": fact_results[0].read().decode().strip(), "kernel": fact_results[1].read().decode().strip()}
+        for line in iter_lines(fact_results[2]):
+            key, separator, value = line.partition("=")
+            if separator:
+                facts[key.strip().lower()] = value.strip().strip('"')
+
+        return Snapshot(
+            fingerprint=apt.fingerprint() if fingerprint is None else fingerprint,
+            facts=facts,
+            packages=apt.shared_list_records(),
+            repositories=apt.repository_records(),
+            units=Service(connector, logger=self.logger).list_records(),
+        )
+
+    def store(self, host: str, snapshot: Snapshot, refreshed: Optional[float] = None) -> None:
+        if refreshed is None:
+            refreshed = time()
+
+        with self.connection:
+            # Deleting the host cascades to everything stored for it
+            self.connection.execute("DELETE FROM hosts WHERE host = ?", (host,))
+            self.connection.execute(
+                "INSERT INTO hosts (host, fingerprint, refreshed, facts) VALUES (?, ?, ?, ?)",
+                (host, snapshot.fingerprint, refreshed, json.dumps(snapshot.facts)),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO packages (host, package, arch, repo, candidate, installed) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (host, record.package, record.arch, record.repo, record.version, installed_version(record))
+                    for record in snapshot.packages
+                ),
+            )
+            self.connection.executemany(
+                "INSERT INTO repositories (host, kind, url, distribution, components, options) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (host, entry.kind, entry.url, entry.distribution, entry.components,
+                     None if entry.options is None else json.dumps(entry.options))
+                    for entry in snapshot.repositories
+                ),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO units (host, unit, load, active, substate, description) VALUES (?, ?, ?, ?, ?, ?)",
+                ((host, *unit) for unit in snapshot.units),
+            )
+
+    def forget(self, host: str) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM hosts WHERE host = ?", (host,))
+
+    def query(self, sql: str, parameters: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        return self.connection.execute(sql, parameters).fetchall()
+
+    def hosts(self) -> List[str]:
+        return [host for host, in self.connection.execute("SELECT host FROM hosts ORDER BY host")]
+
+    def facts(self, host: str) -> Dict[str, str]:
+        row = self.connection.execute("SELECT facts FROM hosts WHERE host = ?", (host,)).fetchone()
+        return {} if row is None else json.loads(row[0])
+
+    def installed(self, package: str) -> Dict[str, str]:
+        """Installed version of the package on each host having it"""
+        return dict(self.connection.execute(
+            "SELECT host, installed FROM packages WHERE package = ? AND installed IS NOT NULL ORDER BY host", (package,)
+        ))
+
+    def older_than(self, package: str, version: str) -> Dict[str, str]:
+        """Hosts with an installed version of the package lower than `version`"""
+        return dict(self.connection.execute(
+            "SELECT host, installed FROM packages WHERE package = ? AND debver_cmp(installed, ?) < 0 ORDER BY host",
+            (package, version),
+        ))
+
+    def upgradable(self, package: Optional[str] = None) -> Dict[str, List[str]]:
+        """Packages installed at a version lower than their candidate on each host"""
+        # Versions compare the dpkg way, a locally newer or pinned higher version is not upgradable
+        sql = "SELECT host, package FROM packages WHERE debver_cmp(installed, candidate) < 0"
+        parameters: Tuple[str, ...] = ()
+        if package is not None:
+            sql += " AND package = ?"
+            parameters = (package,)
+
+        return self.__grouped(self.connection.execute(sql + " ORDER BY host, package", parameters))
+
+    def units(self, active: Optional[str] = None, unit: Optional[str] = None) -> Dict[str, List[str]]:
+        """Units of each host, optionally only the ones with the given `active` state or name"""
+        sql = "SELECT host, unit FROM units WHERE 1"
+        parameters: List[str] = []
+        if active is not None:
+            sql += " AND active = ?"
+            parameters.append(active)
+
+        if unit is not None:
+            sql += " AND unit = ?"
+            parameters.append(unit)
+
+        return self.__grouped(self.connection.execute(sql + " ORDER BY host, unit", parameters))
+
+    def failed_units(self) -> Dict[str, List[str]]:
+        return self.units(active="failed")
+
+    def repositories(self, host: str) -> List[Dict[str, Any]]:
+        return [
+            RepoEntry(kind, None if options is None else json.loads(options), url, distribution, components).as_dict()
+            for kind, options, url, distribution, components in self.connection.execute(
+                "SELECT kind, options, url, distribution, components FROM repositories WHERE host = ?", (host,)
+            )
+        ]
+
+    @staticmethod
+    def __grouped(rows: Iterable[Tuple[str, str]]) -> Dict[str, List[str]]:
+        grouped: Dict[str, List[str]] = {}
+        for host, name in rows:
+            grouped.setdefault(host, []).append(name)
+
+        return grouped
@@ -0,0 +1,37 @@
+from datetime import datetime
+from logging import Logger
+from typing import Optional, List, Dict, Union
+
+from pardus.connection.async_ssh_connector import AsyncSSHConnector
+from pardus.service.service import Service
+
+
+class AsyncService:
+    def __init__(self, connector: AsyncSSHConnector, sudo_passwd: Optional[str] = None, logger: Optional[Logger] = None) -> None:
+        self.connector = connector
+        self.service = Service(connector.connector, sudo_passwd=sudo_passwd, logger=logger)
+        self.logger = self.service.logger
+
+    async def check(self, service: str) -> None:
+        await self.connector.call(self.service.check, service)
+
+    async def list(self) -> List[Dict[str, str]]:
+        return await self.connector.call(self.service.list)
+
+    async def start(self, service: str) -> None:
+        await self.connector.call(self.service.start, service)
+
+    async def stop(self, service: str) -> None:
+        await self.connector.call(self.service.stop, service)
+
+    async def restart(self, service: str) -> None:
+        await self.connector.call(self.service.restart, service)
+
+    async def enable(self, service: str) -> None:
+        await self.connector.call(self.service.enable, service)
+
+    async def disable(self, service: str) -> None:
+        await self.connector.call(self.service.disable, service)
+
+    async def logs(self, service: str) -> List[Dict[str, Union[str, datetime]]]:
+        return await self.connector.call(self.service.logs, service)
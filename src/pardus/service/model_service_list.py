@@ -7,6 +7,7 @@ from typing_extensions import Self
 
 from pardus import Service
 from pardus.connection.model_connector import ModelConnector
+from pardus.utils.fanout import HostResult
 
 
 class ModelServiceList(ABC):
@@ -32,29 +33,33 @@ class ModelServiceList(ABC):
         """Returns a Service from a given connection list"""
 
     @abstractmethod
-    def list(self) -> Dict[Service, List[Dict[str, str]]]:
+    def list(self) -> Dict[Service, HostResult[List[Dict[str, str]]]]:
         """Lists all services of Service"""
 
     @abstractmethod
-    def activate(self, service: str) -> None:
+    def start(self, service: str) -> Dict[Service, HostResult[None]]:
+        """Starts a service on all ServiceList"""
+
+    @abstractmethod
+    def activate(self, service: str) -> Dict[Service, HostResult[None]]:
         """Activates a service on all Service"""
 
     @abstractmethod
-    def stop(self, service: str) -> None:
+    def stop(self, service: str) -> Dict[Service, HostResult[None]]:
         """Stops a service on all ServiceList"""
 
     @abstractmethod
-    def restart(self, service: str) -> None:
+    def restart(self, service: str) -> Dict[Service, HostResult[None]]:
         """Restart a service on all ServiceList"""
 
     @abstractmethod
-    def enable(self, service: str) -> None:
+    def enable(self, service: str) -> Dict[Service, HostResult[None]]:
         """Enables a service on all ServiceList"""
 
     @abstractmethod
-    def disable(self, service: str) -> None:
+    def disable(self, service: str) -> Dict[Service, HostResult[None]]:
         """Disables a service on all ServiceList"""
 
     @abstractmethod
-    def logs(self, service) -> dict[Service, List[dict[str, str | datetime]]]:
+    def logs(self, service) -> Dict[Service, HostResult[List[Dict[str, Union[str, datetime]]]]]:
         """Retrieves logs of a service of ServiceList"""
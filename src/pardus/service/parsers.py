@@ -0,0 +1,42 @@
+import re
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Union
+
+from pardus.service.records import LogEntry, UnitRecord
+
+LOG_PATTERN = re.compile(r'(?P<timestamp>[\d\-T:+]+)\s+(?P<domain>\S+)\s+systemd\[\d+\]:\s+(?P<message>.+)')
+
+
+def parse_unit_records(lines: Iterable[str]) -> Iterator[UnitRecord]:
+    for row in lines:
+        if row:
+            columns = row.split()
+            yield UnitRecord(
+                columns[0],
+                sys.intern(columns[1]),
+                sys.intern(columns[2]),
+                sys.intern(columns[3]),
+                " ".join(columns[4:])
+            )
+
+
+def parse_units(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    for record in parse_unit_records(lines):
+        yield record.as_dict()
+
+
+def parse_log_records(lines: Iterable[str]) -> Iterator[LogEntry]:
+    for line in lines:
+        match = LOG_PATTERN.match(line)
+        if match:
+            yield LogEntry(
+                datetime.strptime(match.group('timestamp'), "%Y-%m-%dT%H:%M:%S%z"),
+                sys.intern(match.group('domain')),
+                match.group('message')
+            )
+
+
+def parse_logs(lines: Iterable[str]) -> Iterator[Dict[str, Union[str, datetime]]]:
+    for record in parse_log_records(lines):
+        yield record.as_dict()
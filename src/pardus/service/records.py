@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Dict, NamedTuple, Union
+
+
+class UnitRecord(NamedTuple):
+    unit: str
+    load: str
+    active: str
+    substate: str
+    description: str
+
+    def as_dict(self) -> Dict[str, str]:
+        return {
+            "unit": self.unit,
+            "load": self.load,
+            "active": self.active,
+            "substate": self.substate,
+            "description": self.description
+        }
+
+
+class LogEntry(NamedTuple):
+    timestamp: datetime
+    domain: str
+    message: str
+
+    def as_dict(self) -> Dict[str, Union[str, datetime]]:
+        return {
+            'timestamp': self.timestamp,
+            'domain': self.domain,
+            'message': self.message
+        }
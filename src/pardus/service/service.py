@@ -1,13 +1,17 @@
-import re
 from datetime import datetime
+from itertools import chain
 from logging import Logger, getLogger
-from typing import Optional, List, Dict, Union, Self
+from typing import Iterator, Optional, List, Dict, Union
 
 from pardus.connection.model_connector import ModelConnector
 from pardus.service.model_service import ModelService
+from pardus.service.parsers import parse_log_records, parse_logs, parse_unit_records, parse_units
+from pardus.service.records import LogEntry, UnitRecord
 from pardus.utils.common import escape_string
 from pardus.utils.error import NotFound
 
+NOT_FOUND_MARK = "PARDUS_UNIT_NOT_FOUND"
+
 
 class Service(ModelService):
     def __init__(self, connector: ModelConnector, sudo_passwd: Optional[str] = None, logger: Optional[Logger] = None) -> None:
@@ -20,89 +24,70 @@ class Service(ModelService):
         self.connector = connector
 
     def check(self, service: str):
-        services = [service["unit"] for service in self.list()]
-        if service not in services:
+        escape_string(service)
+        stdout = self.connector.run(self.__unit_query(service))
+        if not stdout.read().decode().strip():
             raise NotFound("No service was found with the given name")
 
-    def list(self) -> List[Dict[str, str]]:
-        command = "systemctl list-units -all --no-pager --no-legend | tr -cd '\11\12\15\40-\176'"
-        stdout = self.connector.run(command)
-
-        table_to_return = []
-        for row in stdout.read().decode().split("\n"):
-            if row:
-                columns = row.split()
-                table_to_return.append(
-                    {
-                        "unit": columns[0],
-                        "load": columns[1],
-                        "active": columns[2],
-                        "substate": columns[3],
-                        "description": " ".join(columns[4:])
-                    }
-                )
-
-        return table_to_return
+    @staticmethod
+    def __unit_query(service: str) -> str:
+        return f"systemctl list-units --all --no-pager --no-legend {service}"
 
-    def start(self, service: str) -> None:
-        self.check(service)
+    def __guarded(self, service: str, command: str) -> str:
+        # Checks the unit and runs the command in the same round trip
+        return f"if {self.__unit_query(service)} | grep -q .; then {command}; else echo {NOT_FOUND_MARK}; fi"
 
+    def __control(self, action: str, service: str) -> None:
         escape_string(service)
-        command = f"systemctl start {service}"
+        command = self.__guarded(service, f"systemctl {action} {service}")
 
-        _ = self.connector.sudo_run(command, passwd=self.sudo_passwd)
+        result = self.connector.sudo_run(command, passwd=self.sudo_passwd)
+        if NOT_FOUND_MARK in result.stdout.decode():
+            raise NotFound("No service was found with the given name")
 
-    def stop(self, service: str) -> None:
-        self.check(service)
+        result.check()
 
-        escape_string(service)
-        command = f"systemctl stop {service}"
-        _ = self.connector.sudo_run(command, passwd=self.sudo_passwd)
+    def list(self) -> List[Dict[str, str]]:
+        return list(parse_units(self.connector.run_lines(self.__list_command())))
 
-    def restart(self, service: str) -> None:
-        self.check(service)
+    def list_records(self) -> List[UnitRecord]:
+        return list(parse_unit_records(self.connector.run_lines(self.__list_command())))
 
-        escape_string(service)
-        command = f"systemctl restart {service}"
+    @staticmethod
+    def __list_command() -> str:
+        return "systemctl list-units -all --no-pager --no-legend | tr -cd '\11\12\15\40-\176'"
 
-        _ = self.connector.sudo_run(command, passwd=self.sudo_passwd)
+    def start(self, service: str) -> None:
+        self.__control("start", service)
 
-    def enable(self, service: str) -> None:
-        self.check(service)
+    def stop(self, service: str) -> None:
+        self.__control("stop", service)
 
-        escape_string(service)
-        command = f"systemctl enable {service}"
+    def restart(self, service: str) -> None:
+        self.__control("restart", service)
 
-        _ = self.connector.sudo_run(command, passwd=self.sudo_passwd)
+    def enable(self, service: str) -> None:
+        self.__control("enable", service)
 
     def disable(self, service: str) -> None:
-        self.check(service)
-
-        escape_string(service)
-        command = f"systemctl disable {service}"
-
-        _ = self.connector.sudo_run(command, passwd=self.sudo_passwd)
+        self.__control("disable", service)
 
     def logs(self, service) -> List[Dict[str, Union[str, datetime]]]:
-        self.check(service)
-
-        escape_string(service)
-        command = f"journalctl -u {service} -b -o short-iso"
+        return list(parse_logs(self.__log_lines(service)))
 
-        stdout = self.connector.run(command)
+    def log_records(self, service: str) -> List[LogEntry]:
+        return list(parse_log_records(self.__log_lines(service)))
 
-        parsed_log = []
-        log_pattern = re.compile(r'(?P<timestamp>[\d\-T:+]+)\s+(?P<domain>\S+)\s+systemd\[\d+\]:\s+(?P<message>.+)')
+    def __log_lines(self, service: str) -> Iterator[str]:
+        escape_string(service)
+        command = self.__guarded(service, f"journalctl -u {service} -b -o short-iso")
 
-        for line in stdout.read().decode().strip().splitlines():
-            match = log_pattern.match(line)
-            if match:
-                entry = {
+        lines = self.connector.run_lines(command)
+        first = next(lines, None)
+        if first == NOT_FOUND_MARK:
+            raise NotFound("No service was found with the given name")
 
-                    'timestamp': datetime.strptime(match.group('timestamp'), "%Y-%m-%dT%H:%M:%S%z"),
-                    'domain': match.group('domain'),
-                    'message': match.group('message')
-                }
-                parsed_log.append(entry)
+        if first is None:
+            return iter([])
 
-        return parsed_log
+        return chain([first], lines)
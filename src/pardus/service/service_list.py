@@ -1,26 +1,33 @@
 from datetime import datetime
 from logging import Logger, getLogger
-from typing import List, Optional, Iterator, Union, Dict
+from typing import List, Optional, Iterator, Union, Dict, Callable, TypeVar
 
 from typing_extensions import Self
 
 from pardus import Service
 from pardus.connection.model_connector import ModelConnector
 from pardus.service.model_service_list import ModelServiceList
+from pardus.service.records import LogEntry, UnitRecord
 from pardus.utils.error import NumberOfElementsError
+from pardus.utils.fanout import HostResult, fan_out, DEFAULT_MAX_WORKERS
+
+T = TypeVar("T")
 
 
 class ServiceList(ModelServiceList):
-    def __init__(self, services: List[Service], logger: Optional[Logger] = None) -> None:
+    def __init__(self, services: List[Service], logger: Optional[Logger] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, timeout: Optional[float] = None) -> None:
         if logger is None:
             self.logger = getLogger(__name__)
         else:
             self.logger = logger
 
         if len(services) == 0:
-            NumberOfElementsError("services can not be empty")
+            raise NumberOfElementsError("services can not be empty")
 
         self.services = services
+        self.max_workers = max_workers
+        self.timeout = timeout
 
     def __iter__(self) -> Iterator[Service]:
         for x in self.services:
@@ -31,7 +38,7 @@ class ServiceList(ModelServiceList):
         if isinstance(key, int):
             return self.services[key]
         elif isinstance(key, slice):
-            return self.__class__(self.services[key])
+            return self.__class__(self.services[key], logger=self.logger, max_workers=self.max_workers, timeout=self.timeout)
 
         self.logger.error("Wrong slice")
         raise ValueError("Wrong slice")
@@ -43,69 +50,46 @@ class ServiceList(ModelServiceList):
         return len(self.services)
 
     @classmethod
-    def from_connections(cls, connections: List[ModelConnector], logger: Optional[Logger] = None) -> Self:
+    def from_connections(cls, connections: List[ModelConnector], logger: Optional[Logger] = None,
+                         max_workers: int = DEFAULT_MAX_WORKERS, timeout: Optional[float] = None) -> Self:
 
         return cls(
             [
                 Service(connection, logger=logger)
                 for connection in connections
-            ]
+            ],
+            logger=logger, max_workers=max_workers, timeout=timeout
         )
 
-    def list(self) -> Dict[Service, List[Dict[str, str]]]:
-        lists = {}
-        for each_service in self.services:
-            try:
-                lists[each_service] = each_service.list()
-            except Exception as e:
-                self.logger.error(e)
-        return lists
-
-    def activate(self, service: str) -> None:
-
-        for each_service in self.services:
-            try:
-                each_service.activate(service)
-            except Exception as e:
-                self.logger.error(e)
-
-    def stop(self, service: str) -> None:
-
-        for each_service in self.services:
-            try:
-                each_service.stop(service)
-            except Exception as e:
-                self.logger.error(e)
-
-    def restart(self, service: str) -> None:
-
-        for each_service in self.services:
-            try:
-                each_service.restart(service)
-            except Exception as e:
-                self.logger.error(e)
-
-    def enable(self, service: str) -> None:
-
-        for each_service in self.services:
-            try:
-                each_service.enable(service)
-            except Exception as e:
-                self.logger.error(e)
-
-    def disable(self, service: str) -> None:
-
-        for each_service in self.services:
-            try:
-                each_service.disable(service)
-            except Exception as e:
-                self.logger.error(e)
-
-    def logs(self, service) -> dict[Service, List[dict[str, str | datetime]]]:
-        lists = {}
-        for each_service in self.services:
-            try:
-                lists[each_service] = each_service.logs(service)
-            except Exception as e:
-                self.logger.error(e)
-        return lists
+    def map(self, func: Callable[[Service], T]) -> Dict[Service, HostResult[T]]:
+        return fan_out(self.services, func, max_workers=self.max_workers, timeout=self.timeout, logger=self.logger)
+
+    def list(self) -> Dict[Service, HostResult[List[Dict[str, str]]]]:
+        return self.map(lambda each_service: each_service.list())
+
+    def list_records(self) -> Dict[Service, HostResult[List[UnitRecord]]]:
+        return self.map(lambda each_service: each_service.list_records())
+
+    def start(self, service: str) -> Dict[Service, HostResult[None]]:
+        return self.map(lambda each_service: each_service.start(service))
+
+    def activate(self, service: str) -> Dict[Service, HostResult[None]]:
+        return self.start(service)
+
+    def stop(self, service: str) -> Dict[Service, HostResult[None]]:
+        return self.map(lambda each_service: each_service.stop(service))
+
+    def restart(self, service: str) -> Dict[Service, HostResult[None]]:
+        return self.map(lambda each_service: each_service.restart(service))
+
+    def enable(self, service: str) -> Dict[Service, HostResult[None]]:
+        return self.map(lambda each_service: each_service.enable(service))
+
+    def disable(self, service: str) -> Dict[Service, HostResult[None]]:
+        return self.map(lambda each_service: each_service.disable(service))
+
+    def logs(self, service) -> Dict[Service, HostResult[List[Dict[str, Union[str, datetime]]]]]:
+        return self.map(lambda each_service: each_service.logs(service))
+
+    def log_records(self, service: str) -> Dict[Service, HostResult[List[LogEntry]]]:
+        return self.map(lambda each_service: each_service.log_records(service))
@@ -1,5 +1,5 @@
 import re
-from typing import Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
 
 from pardus.utils.error import NopeError
 
@@ -70,3 +70,25 @@ def option_matcher(option: str) -> Optional[Dict[str, str]]:
 def escape_string(name: str) -> None:
     if any(nope in name for nope in NOPES):
         raise NopeError(f"Not cool! {name}")
+
+
+def iter_lines(stream: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    for line in stream:
+        if isinstance(line, bytes):
+            line = line.decode()
+
+        yield line.rstrip("\r\n")
+
+
+def host_name(connector: Any) -> str:
+    """`user@address:port` of a connector, with the parts it has"""
+    name = str(getattr(connector, "address", connector))
+    user = getattr(connector, "user", None)
+    port = getattr(connector, "port", None)
+    if user is not None:
+        name = f"{user}@{name}"
+
+    if port is not None:
+        name = f"{name}:{port}"
+
+    return name
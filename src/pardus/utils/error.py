@@ -16,3 +16,11 @@ class NotFound(Exception):
 
 class NumberOfElementsError(Exception):
     """Insufficient number of elements"""
+
+
+class PoolExhausted(Exception):
+    """No more connections can be opened"""
+
+
+class CommandTimeout(CommandError):
+    """Raised when a command does not finish in time"""
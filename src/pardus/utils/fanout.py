@@ -0,0 +1,105 @@
+from collections import deque
+from dataclasses import dataclass
+from logging import Logger
+from queue import Empty, Queue
+from threading import Thread
+from time import monotonic
+from typing import Callable, Dict, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 32
+
+
+@dataclass
+class HostResult(Generic[T]):
+    value: Optional[T] = None
+    exception: Optional[Exception] = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.exception is None
+
+    def unwrap(self) -> T:
+        if self.exception is not None:
+            raise self.exception
+
+        return self.value  # type: ignore[return-value]
+
+
+def _timed(func: Callable[[K], T], item: K, done: "Queue[Tuple[K, Optional[HostResult[T]]]]",
+           prepare: Optional[Callable[[K], None]] = None) -> None:
+    if prepare is not None:
+        try:
+            prepare(item)
+        except Exception as e:
+            done.put((item, HostResult(exception=e)))
+            return
+
+        # Tells the caller the deadline of the item starts now
+        done.put((item, None))
+
+    start = monotonic()
+    try:
+        result: HostResult[T] = HostResult(value=func(item), duration=monotonic() - start)
+    except Exception as e:
+        result = HostResult(exception=e, duration=monotonic() - start)
+
+    done.put((item, result))
+
+
+def fan_out(items: Iterable[K], func: Callable[[K], T], max_workers: int = DEFAULT_MAX_WORKERS,
+            timeout: Optional[float] = None, logger: Optional[Logger] = None,
+            prepare: Optional[Callable[[K], None]] = None) -> Dict[K, HostResult[T]]:
+    """Calls `func` on every item with up to `max_workers` at once, results come back in the order of `items`
+
+    `timeout` is counted for each item from the moment its call starts, items waiting for a worker are not charged.
+    Neither is `prepare`, called on the worker right before `func`, an item failing it is not passed to `func`.
+    A running call can not be interrupted. A timed out call gets a `TimeoutError` and its worker is given to the next
+    item, but the call goes on in the background, so the host may still be changed after its result was reported.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be positive")
+
+    items = list(items)
+    waiting = deque(items)
+    # Start of each running call, None while it is being prepared
+    running: Dict[K, Optional[float]] = {}
+    results: Dict[K, HostResult[T]] = {}
+    done: "Queue[Tuple[K, Optional[HostResult[T]]]]" = Queue()
+    while waiting or running:
+        while waiting and len(running) < max_workers:
+            item = waiting.popleft()
+            running[item] = None if prepare is not None else monotonic()
+            Thread(target=_timed, args=(func, item, done, prepare), name="pardus-fan-out", daemon=True).start()
+
+        wait = None
+        starts = [started for started in running.values() if started is not None]
+        if timeout is not None and starts:
+            wait = max(min(starts) + timeout - monotonic(), 0.0)
+
+        try:
+            item, result = done.get(timeout=wait)
+            if result is None:
+                running[item] = monotonic()
+            # Results of calls that already timed out are dropped
+            elif item in running:
+                del running[item]
+                results[item] = result
+        except Empty:
+            now = monotonic()
+            for item, started in list(running.items()):
+                if timeout is not None and started is not None and now - started >= timeout:
+                    del running[item]
+                    results[item] = HostResult(exception=TimeoutError(f"Deadline of {timeout} seconds exceeded"),
+                                               duration=now - started)
+
+    ordered = {item: results[item] for item in items}
+    if logger is not None:
+        for result in ordered.values():
+            if result.exception is not None:
+                logger.warning(result.exception)
+
+    return ordered
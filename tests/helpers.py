@@ -0,0 +1,32 @@
+from pardus.connection.model_connector import ModelConnector
+from pardus.connection.result import CommandResult
+
+
+class ScriptedConnector(ModelConnector):
+    """Answers a command with the output of the first prefix it starts with, and nothing when none matches
+
+    An output is either the stdout bytes or a CommandResult, a recording from `fixture.decode` for example.
+    Every command run is kept in `commands`, root or not.
+    """
+
+    def __init__(self, outputs=None, address="scripted"):
+        self.address = address
+        self.outputs = {} if outputs is None else outputs
+        self.commands = []
+
+    def run(self, command, timeout=None):
+        self.commands.append(command)
+        for prefix, output in self.outputs.items():
+            if command.startswith(prefix):
+                if isinstance(output, CommandResult):
+                    return CommandResult(command, output.stdout, output.stderr, output.exit_status, output.duration)
+
+                return CommandResult(command, output)
+
+        return CommandResult(command, b"")
+
+    def sudo_run(self, command, passwd=None, timeout=None):
+        return self.run(command, timeout=timeout)
+
+    def count(self, prefix):
+        return len([command for command in self.commands if command.startswith(prefix)])
@@ -1,6 +1,60 @@
 import unittest
 
 from pardus import SSHConnector, Apt
+from pardus.apt.fingerprint import FingerprintCache
+from pardus.apt.records import PackageRecord
+from pardus.utils.error import NotFound
+
+from tests.helpers import ScriptedConnector
+
+APT_LIST = b"""Listing...
+bash/jammy,now 5.1-6ubuntu1 amd64 [installed]
+htop/jammy 3.0.5-7build2 amd64
+vim/jammy-updates 2:8.2.3995-1ubuntu2.15 amd64 [installed,automatic]
+"""
+
+APT_CACHE_POLICY = b"""bash:
+  Installed: 5.1-6ubuntu1
+  Candidate: 5.1-6ubuntu1
+  Version table:
+ *** 5.1-6ubuntu1 500
+        500 http://archive.ubuntu.com/ubuntu jammy/main amd64 Packages
+        100 /var/lib/dpkg/status
+htop:
+  Installed: (none)
+  Candidate: 3.0.5-7build2
+  Version table:
+     3.0.5-7build2 500
+        500 http://archive.ubuntu.com/ubuntu jammy/main amd64 Packages
+"""
+
+APT_SEARCH = b"""Sorting...
+Full Text Search...
+bash/jammy,now 5.1-6ubuntu1 amd64 [installed]
+  GNU Bourne Again SHell
+
+bash-builtins/jammy 5.1-6ubuntu1 amd64
+  Bash loadable builtins - headers & examples
+"""
+
+APT_CACHE_SHOW = b"""Package: bash
+Version: 5.1-6ubuntu1
+Priority: required
+Pre-Depends: libc6 (>= 2.34), libtinfo6 (>= 6)
+Depends: base-files (>= 2.1.12), debianutils (>= 2.15)
+Description-en: GNU Bourne Again SHell
+ Bash is an sh-compatible command language interpreter.
+ .
+ Bash can be configured to be POSIX-conformant by default.
+Description-md5: 3522aa7b4374048d6450e348a5bb45d9
+
+Package: htop
+Version: 3.0.5-7build2
+Depends: libc6 (>= 2.34),
+ libncursesw6 (>= 6)
+Description: interactive processes viewer
+
+"""
 
 
 class TestApt(unittest.TestCase):
@@ -42,6 +96,196 @@ class TestApt(unittest.TestCase):
     def test_show(self):
         self.assertTrue(True)
 
+    def test_state(self):
+        connector = ScriptedConnector({"LC_ALL=C apt-cache policy": APT_CACHE_POLICY})
+        apt = Apt(connector)
+
+        states = apt.state(["bash", "htop", "nothing"])
+        self.assertEqual(states["bash"]["installed"], "5.1-6ubuntu1")
+        self.assertIsNone(states["htop"]["installed"])
+        self.assertEqual(states["htop"]["candidate"], "3.0.5-7build2")
+        self.assertNotIn("nothing", states)
+        self.assertEqual(connector.commands, ["LC_ALL=C apt-cache policy bash htop nothing"])
+
+    def test_install_preflight(self):
+        connector = ScriptedConnector({"LC_ALL=C apt-cache policy": APT_CACHE_POLICY})
+        apt = Apt(connector)
+
+        apt.install(["bash", "htop", "nothing"])
+        self.assertEqual(connector.count("apt list"), 0)
+        self.assertEqual(connector.commands[-1], "apt install htop -y")
+
+        with self.assertRaises(NotFound):
+            apt.remove("htop")
+
+    def test_list_lines(self):
+        apt = Apt(ScriptedConnector({"apt list": APT_LIST}))
+
+        packages = apt.list()
+        self.assertEqual([p["package"] for p in packages], ["bash", "htop", "vim"])
+        self.assertEqual(packages[2]["version"], "2:8.2.3995-1ubuntu2.15")
+        self.assertEqual(packages[1]["tags"], [])
+
+    def test_search_lines(self):
+        apt = Apt(ScriptedConnector({"apt list": APT_LIST, "apt search": APT_SEARCH}))
+
+        found = apt.search("bash")
+        self.assertEqual([p["name"] for p in found], ["bash", "bash-builtins"])
+        self.assertEqual(found[1]["description"], "Bash loadable builtins - headers & examples")
+        self.assertEqual(found[0]["repo"], "jammy,now")
+
+    def test_show_many(self):
+        connector = ScriptedConnector({"LC_ALL=C apt-cache show": APT_CACHE_SHOW})
+        apt = Apt(connector)
+
+        information = apt.show_many(["bash", "htop", "nothing"])
+        self.assertEqual(sorted(information), ["bash", "htop"])
+        self.assertEqual(information["bash"]["Version"], "5.1-6ubuntu1")
+        self.assertEqual(information["bash"]["Depends"], ["base-files (>= 2.1.12)", "debianutils (>= 2.15)"])
+        self.assertEqual(information["bash"]["Description"].split("\n")[2], "")
+        self.assertEqual(information["htop"]["Depends"], ["libc6 (>= 2.34)", "libncursesw6 (>= 6)"])
+        self.assertEqual(connector.commands, ["LC_ALL=C apt-cache show --no-all-versions bash htop nothing"])
+        self.assertEqual(apt.show_many([]), {})
+
+    def test_show_not_found(self):
+        connector = ScriptedConnector({})
+        with self.assertRaises(NotFound):
+            Apt(connector).show("nothing")
+
+        self.assertEqual(connector.commands, ["apt show nothing"])
+
+    def test_shared_list_records(self):
+        cache = FingerprintCache()
+        first = ScriptedConnector({
+            "{ dpkg": b"f00d  -\n",
+            "dpkg-query": b"bash\t5.1-6ubuntu1\tinstalled\tamd64\nvim\t2:8.2.3995-1ubuntu2.15\tinstalled\tamd64\n",
+            "apt list": APT_LIST,
+        })
+        second = ScriptedConnector({
+            "{ dpkg": b"f00d  -\n",
+            "dpkg-query": b"bash\t5.1-5\tinstalled\tamd64\nhtop\t3.0.5-7build2\tinstalled\tamd64\n"
+                          b"tool\t1.0\tinstalled\tall\nvim\t2:8.2.3995-1ubuntu2.15\tconfig-files\tamd64\n",
+        })
+
+        records = Apt(first).shared_list_records(cache=cache)
+        self.assertEqual(records[0], Apt(first).list_records()[0])
+        self.assertEqual(records[2].repo, "jammy-updates,now")
+        self.assertEqual(records[2].tags, ("installed",))
+
+        records = {record.package: record for record in Apt(second).shared_list_records(cache=cache)}
+        self.assertEqual(second.count("apt list"), 0)
+        self.assertEqual(records["bash"].version, "5.1-6ubuntu1")
+        self.assertEqual(records["bash"].tags, ("upgradable from: 5.1-5",))
+        self.assertEqual(records["htop"].repo, "jammy,now")
+        self.assertEqual(records["tool"].tags, ("installed", "local"))
+        self.assertEqual(records["vim"].tags, ())
+
+        upgradeable = Apt(second).shared_list_records(upgradeable=True, cache=cache)
+        self.assertEqual([record.package for record in upgradeable], ["bash"])
+        installed = Apt(second).shared_list_records(installed=True, cache=cache)
+        self.assertEqual([record.package for record in installed], ["bash", "htop", "tool"])
+
+    def test_shared_list_records_local(self):
+        cache = FingerprintCache()
+        # The index host built its own htop and has an orphaned `.deb`
+        first = ScriptedConnector({
+            "{ dpkg": b"f00d  -\n",
+            "dpkg-query": b"htop\t3.2.0-1\tinstalled\tamd64\nmine\t1.0\tinstalled\tall\n",
+            "apt list": b"Listing...\nbash/jammy 5.1-6ubuntu1 amd64\nhtop/now 3.2.0-1 amd64 [installed,local]\n"
+                        b"mine/now 1.0 all [installed,local]\n",
+            "LC_ALL=C apt-cache policy": b"htop:\n  Installed: 3.2.0-1\n  Candidate: 3.2.0-1\n  Version table:\n"
+                                         b" *** 3.2.0-1 100\n        100 /var/lib/dpkg/status\n"
+                                         b"     3.0.5-7build2 500\n"
+                                         b"        500 http://archive.ubuntu.com/ubuntu jammy/main amd64 Packages\n"
+                                         b"mine:\n  Installed: 1.0\n  Candidate: 1.0\n  Version table:\n"
+                                         b" *** 1.0 100\n        100 /var/lib/dpkg/status\n",
+        })
+        second = ScriptedConnector({"{ dpkg": b"f00d  -\n", "dpkg-query": b"bash\t5.1-6ubuntu1\tinstalled\tamd64\n"})
+
+        records = Apt(first).shared_list_records(cache=cache)
+        self.assertEqual(records, Apt(first).list_records())
+        self.assertIn("htop:amd64 mine:all", first.commands[-2])
+
+        records = {record.package: record for record in Apt(second).shared_list_records(cache=cache)}
+        self.assertEqual(records["htop"], PackageRecord("htop", "jammy", "3.0.5-7build2", "amd64", ()))
+        self.assertNotIn("mine", records)
+
+        # Other components enabled on the same suites give another fingerprint, the index is not shared
+        third = ScriptedConnector({"{ dpkg": b"beef  -\n", "apt list": APT_LIST})
+        Apt(third).shared_list_records(cache=cache)
+        self.assertEqual(third.count("apt list"), 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_list_records(self):
+        apt = Apt(ScriptedConnector({"apt list": APT_LIST * 2}))
+
+        records = apt.list_records()
+        self.assertEqual([r.as_dict() for r in records], apt.list())
+        self.assertEqual(records[2].tags, ("installed", "automatic"))
+        self.assertIs(records[0].repo, records[3].repo)
+        self.assertIs(records[2].tags, records[5].tags)
+
+    def test_search_limit(self):
+        connector = ScriptedConnector({"apt search": APT_SEARCH * 1000})
+        read = []
+
+        def run_lines(command, timeout=None):
+            for line in ScriptedConnector.run_lines(connector, command):
+                read.append(line)
+                yield line
+
+        connector.run_lines = run_lines
+        apt = Apt(connector)
+
+        found = apt.search("bash", limit=3)
+        self.assertEqual([p["name"] for p in found], ["bash", "bash-builtins", "bash"])
+        self.assertLess(len(read), 20)
+        self.assertEqual(connector.count("apt list"), 0)
+
+        with self.assertRaises(NotFound):
+            Apt(ScriptedConnector({"apt search": b"Sorting...\nFull Text Search...\n"})).search("nothing")
+
+        for limit in (0, -1):
+            with self.subTest(limit=limit), self.assertRaises(ValueError):
+                apt.iter_search("bash", limit=limit)
+
+    def test_index_cache(self):
+        connector = ScriptedConnector({"apt list": APT_LIST})
+        apt = Apt(connector)
+
+        self.assertEqual(apt.index()["vim"], ("installed", "automatic"))
+        self.assertIn("htop", apt.index())
+        self.assertEqual(connector.count("apt list"), 1)
+
+        apt.update()
+        apt.index()
+        self.assertEqual(connector.count("apt list"), 2)
+
+        apt.refresh()
+        apt.index()
+        self.assertEqual(connector.count("apt list"), 3)
+
+    def test_update_max_age(self):
+        connector = ScriptedConnector({"apt list": APT_LIST, "find /var/lib/apt/lists": b"PARDUS_LISTS_FRESH\n"})
+        apt = Apt(connector)
+        apt.index()
+
+        self.assertFalse(apt.update(max_age=600))
+        self.assertIn("-mmin -10.000", connector.commands[-1])
+        apt.index()
+        self.assertEqual(connector.count("apt list"), 1)
+
+        connector.outputs["find /var/lib/apt/lists"] = b"Reading package lists...\n"
+        self.assertTrue(apt.update(max_age=600))
+        apt.index()
+        self.assertEqual(connector.count("apt list"), 2)
+
+        self.assertTrue(apt.update())
+        self.assertEqual(connector.commands[-1], "apt update")
+
+        with self.assertRaises(ValueError):
+            apt.update(max_age=-1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,14 @@
+import io
+import json
+import time
 import unittest
 
-from pardus import SSHConnector, AptList
+from pardus import SSHConnector, Apt, AptList
+from pardus.apt.drift import write_jsonl
+from pardus.apt.matrix import np
+from pardus.utils.fanout import fan_out
+
+from tests.helpers import ScriptedConnector
 
 
 class TestAptList(unittest.TestCase):
@@ -13,6 +21,59 @@ class TestAptList(unittest.TestCase):
 
         self.apt_list = AptList.from_connections
 
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_matrix(self):
+        apts = AptList.from_connections([
+            ScriptedConnector({"": b"bash/jammy 5.1-6 amd64 [installed]\nvim/jammy 2:8.2 amd64 [installed,automatic]\n"}, address="host1"),
+            ScriptedConnector({"": b"bash/jammy 5.2-1 amd64 [installed,upgradable to: 5.3-1]\nhtop/jammy 3.0 amd64 [installed]\n"}, address="host2"),
+            ScriptedConnector({"": b"bash/jammy 5.3-1 amd64 [upgradable from: 5.1-6]\nvim/jammy 2:8.2 amd64\n"}, address="host3"),
+        ])
+
+        matrix = apts.matrix()
+        self.assertEqual(matrix.codes.shape, (3, 3))
+        self.assertEqual(matrix.version("host3", "bash"), "5.1-6")
+        self.assertIsNone(matrix.version("host3", "vim"))
+        self.assertEqual(matrix.lacking("vim"), ["host2", "host3"])
+        self.assertEqual(matrix.lacking("nano"), ["host1", "host2", "host3"])
+        self.assertEqual(matrix.having("htop"), ["host2"])
+        self.assertEqual(matrix.differs("bash", "5.1-6"), ["host2"])
+        self.assertEqual(matrix.on_all(), ["bash"])
+        self.assertEqual(sorted(matrix.on_any()), ["bash", "htop", "vim"])
+
+    def test_drift(self):
+        apts = AptList.from_connections([
+            ScriptedConnector({"": b"openssl\t3.0.11-1~deb12u2\tinstalled\nbash\t5.2.15-2\tinstalled\n"}, address="host1"),
+            ScriptedConnector({"": b"openssl\t3.0.9-1\tinstalled\nbash\t5.2.15-2\tinstalled\nvim\t2:9.0\tconfig-files\n"}, address="host2"),
+            ScriptedConnector({"": b"openssl\t3.0.11-1\tinstalled\n"}, address="host3"),
+        ])
+
+        entries = {entry.package: entry for entry in apts.drift()}
+        self.assertEqual(sorted(entries), ["bash", "openssl"])
+        self.assertEqual(entries["openssl"].versions, ("3.0.9-1", "3.0.11-1~deb12u2", "3.0.11-1"))
+        self.assertEqual(entries["openssl"].newest, "3.0.11-1")
+        self.assertEqual(entries["openssl"].lagging, ("host2", "host1"))
+        self.assertFalse(entries["bash"].drifting)
+        self.assertEqual(entries["bash"].missing, ("host3",))
+
+        stream = io.StringIO()
+        self.assertEqual(write_jsonl(apts.drift(drifting_only=True), stream), 1)
+        self.assertEqual(json.loads(stream.getvalue())["lagging"], ["host2", "host1"])
+
+    def test_host_names(self):
+        connectors = [ScriptedConnector({"": b"bash\t5.2.15-2\tinstalled\n"}, address="host1"),
+                      ScriptedConnector({"": b"bash\t5.1-6\tinstalled\n"}, address="host1"),
+                      ScriptedConnector(address="host1"), ScriptedConnector(address="host2")]
+        connectors[0].user, connectors[0].port = "root", 22
+        connectors[1].user, connectors[1].port = "root", 2222
+        apts = AptList.from_connections(connectors)
+
+        # Hosts behind one address are not merged into one
+        self.assertEqual(list(AptList.host_names(apts.apts).values()), ["root@host1:22", "root@host1:2222", "host1", "host2"])
+        self.assertEqual(next(apts.drift()).lagging, ("root@host1:2222",))
+
+        twins = AptList.from_connections([ScriptedConnector(address="replay"), ScriptedConnector(address="replay")])
+        self.assertEqual(list(AptList.host_names(twins.apts).values()), ["replay", "replay#2"])
+
     def test_repositories(self):
         self.assertTrue(True)
 
@@ -46,6 +107,59 @@ class TestAptList(unittest.TestCase):
     def test_show(self):
         self.assertTrue(True)
 
+    def test_map(self):
+        apts = AptList([Apt(None) for _ in range(20)], max_workers=20)
+
+        def work(apt):
+            time.sleep(0.2)
+            if apt is apts[0]:
+                raise ValueError("Broken host")
+            return id(apt)
+
+        start = time.monotonic()
+        results = apts.map(work)
+        self.assertLess(time.monotonic() - start, 1)
+
+        self.assertIsInstance(results[apts[0]].exception, ValueError)
+        self.assertFalse(results[apts[0]].ok)
+        for apt in apts[1:]:
+            self.assertEqual(results[apt].unwrap(), id(apt))
+            self.assertGreaterEqual(results[apt].duration, 0.2)
+
+    def test_map_timeout(self):
+        apts = AptList([Apt(None), Apt(None)], timeout=0.2)
+
+        results = apts.map(lambda apt: time.sleep(0.5 if apt is apts[0] else 0))
+        self.assertIsInstance(results[apts[0]].exception, TimeoutError)
+        self.assertTrue(results[apts[1]].ok)
+
+    def test_map_timeout_per_host(self):
+        # Each host has 0.3 seconds from its own start, the last one waits 0.4 seconds for a worker
+        apts = AptList([Apt(None) for _ in range(5)], max_workers=2, timeout=0.3)
+        started = {}
+
+        def work(apt):
+            started[apt] = time.monotonic()
+            time.sleep(1 if apt is apts[0] else 0.2)
+
+        start = time.monotonic()
+        results = apts.map(work)
+        self.assertIsInstance(results[apts[0]].exception, TimeoutError)
+        self.assertEqual(list(results), apts.apts)
+        for apt in apts[1:]:
+            self.assertTrue(results[apt].ok)
+
+        # The worker of the timed out host went to the next one
+        self.assertGreaterEqual(started[apts[4]] - start, 0.3)
+        self.assertLess(time.monotonic() - start, 0.9)
+
+        # Time spent in prepare is not charged, an item failing it is not called
+        results = fan_out(["slow", "broken"], started.setdefault, max_workers=1, timeout=0.2,
+                          prepare=lambda item: time.sleep(0.3) if item == "slow" else int(item))
+        self.assertTrue(results["slow"].ok)
+        self.assertIsInstance(results["broken"].exception, ValueError)
+        self.assertNotIn("broken", started)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,30 @@
 import unittest
 
 from pardus import SSHConnector, Config
+from pardus.connection.result import CommandResult
+
+from tests.helpers import ScriptedConnector
+
+
+class FileConnector(ScriptedConnector):
+    """A host with the given files, `touch` adds one and every file reads as the same config"""
+
+    def __init__(self, files):
+        super().__init__({"cat ": b"[section]\nkey = value\n"})
+        self.files = set(files)
+
+    def run(self, command, timeout=None):
+        result = super().run(command, timeout=timeout)
+        if command.startswith("test -e ") and command.split()[2] in self.files:
+            return CommandResult(command, b"exist\n")
+
+        return result
+
+    def sudo_run(self, command, passwd=None, timeout=None):
+        if command.startswith("touch "):
+            self.files.add(command.split()[1])
+
+        return super().sudo_run(command, passwd=passwd, timeout=timeout)
 
 
 class TestConfig(unittest.TestCase):
@@ -19,13 +43,21 @@ class TestConfig(unittest.TestCase):
         self.assertTrue(True)
 
     def test_touch(self):
-        self.assertTrue(True)
+        connector = FileConnector([])
+        config = Config(connector, "/etc/pardus/new.conf", create=True)
+        self.assertIn("mkdir -p /etc/pardus", connector.commands)
+        self.assertIn("touch /etc/pardus/new.conf", connector.commands)
+        self.assertEqual(config["section"], {"key": "value"})
 
     def test_exist(self):
         self.assertTrue(True)
 
     def test_create_backup(self):
-        self.assertTrue(True)
+        existing = ["/etc/smb.conf"] + [f"/etc/smb.conf.{i}" for i in range(10)]
+        connector = FileConnector(existing)
+        Config(connector, "/etc/smb.conf", backup=True)
+        self.assertEqual(connector.commands[-2], "cp /etc/smb.conf /etc/smb.conf.10")
+        self.assertEqual(len([call for call in connector.commands if call.startswith("test -e")]), 17)
 
     def test_read(self):
         self.assertTrue(True)
@@ -1,6 +1,172 @@
+import asyncio
+import os
+import subprocess
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 
-from pardus import SSHConnector
+from pardus import SSHConnector, LocalConnector, SSHPool, AsyncSSHConnector, ConfigRaw, RecordingConnector, ReplayConnector
+from pardus.connection.result import CommandResult
+from pardus.connection import batch, fixture
+from pardus.connection.channel import execute
+from pardus.connection.root_shell import RootShell
+from pardus.connection.sudo import sudo_command
+from pardus.utils.error import CommandError, CommandTimeout, NotFound, PoolExhausted
+
+from tests.helpers import ScriptedConnector
+
+
+class FakeTransport:
+    def __init__(self):
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+    def send_ignore(self):
+        if not self.active:
+            raise EOFError()
+
+
+class FakeClient:
+    def __init__(self, address, port, user, passwd):
+        self.credentials = (address, port, user, passwd)
+        self.transport = FakeTransport()
+        self.closed = False
+
+    def get_transport(self):
+        return self.transport
+
+    def close(self):
+        self.closed = True
+
+
+FAKE_SUDO = """#!/bin/sh
+# Without FAKE_SUDO_NOPASSWD the password `secret` is read from stdin, like `sudo -S`
+nonint=
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -n) nonint=1 ;;
+        -k|-S) ;;
+        -p) shift ;;
+        *) break ;;
+    esac
+    shift
+done
+if [ -z "$FAKE_SUDO_NOPASSWD" ]; then
+    if [ -n "$nonint" ]; then
+        echo "sudo: a password is required" >&2
+        exit 1
+    fi
+    IFS= read -r password
+    if [ "$password" != secret ]; then
+        echo "Sorry, try again." >&2
+        exit 1
+    fi
+fi
+exec "$@"
+"""
+
+
+def fake_sudo_env(nopasswd=False):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "sudo")
+    with open(path, "w") as f:
+        f.write(FAKE_SUDO)
+    os.chmod(path, 0o755)
+
+    env = dict(os.environ, PATH=directory + os.pathsep + os.environ["PATH"])
+    if nopasswd:
+        env["FAKE_SUDO_NOPASSWD"] = "1"
+    return env
+
+
+class ShellChannel:
+    """Stands in for a paramiko channel running the command locally, `sudo` is a fake one from `env`"""
+
+    def __init__(self, env=None):
+        self.env = env
+        self.process = None
+        self.out = bytearray()
+        self.err = bytearray()
+        self.lock = threading.Lock()
+        self.readers = []
+        self.closed = False
+        self.wake, writer = os.pipe()
+        os.write(writer, b"x")
+
+    def exec_command(self, command):
+        self.process = subprocess.Popen(["sh", "-c", command], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE, env=self.env)
+        for stream, buffer in ((self.process.stdout, self.out), (self.process.stderr, self.err)):
+            reader = threading.Thread(target=self.pump, args=(stream, buffer), daemon=True)
+            reader.start()
+            self.readers.append(reader)
+
+    def pump(self, stream, buffer):
+        for chunk in iter(lambda: stream.read1(1024), b""):
+            with self.lock:
+                buffer += chunk
+
+    def sendall(self, data):
+        self.process.stdin.write(data)
+        self.process.stdin.flush()
+
+    def take(self, buffer, size):
+        with self.lock:
+            data = bytes(buffer[:size])
+            del buffer[:size]
+            return data
+
+    def recv_ready(self):
+        return len(self.out) > 0
+
+    def recv_stderr_ready(self):
+        return len(self.err) > 0
+
+    def recv(self, size):
+        return self.take(self.out, size)
+
+    def recv_stderr(self, size):
+        return self.take(self.err, size)
+
+    @property
+    def eof_received(self):
+        return self.process.poll() is not None and not any(reader.is_alive() for reader in self.readers)
+
+    def exit_status_ready(self):
+        return self.eof_received
+
+    def recv_exit_status(self):
+        return self.process.wait()
+
+    def shutdown_write(self):
+        self.process.stdin.close()
+
+    def fileno(self):
+        return self.wake
+
+    def close(self):
+        self.closed = True
+        self.process.kill()
+        self.process.wait()
+
+
+class ShellClient:
+    def __init__(self, nopasswd=False):
+        self.transport = self
+        self.env = fake_sudo_env(nopasswd)
+
+    def get_transport(self):
+        return self
+
+    def is_active(self):
+        return True
+
+    def open_session(self):
+        return ShellChannel(self.env)
 
 
 class TestConnection(unittest.TestCase):
@@ -13,6 +179,285 @@ class TestConnection(unittest.TestCase):
     def test_sudo_run(self):
         self.assertTrue(True)
 
+    def test_run_lines(self):
+        connector = ScriptedConnector({"lines": b"first\nsecond\r\n"})
+        self.assertEqual(list(connector.run_lines("lines")), ["first", "second"])
+        self.assertEqual(list(connector.sudo_run_lines("nothing")), [])
+
+        failing = ReplayConnector.from_recordings([fixture.encode("run", CommandResult("missing", stderr=b"no such file\n", exit_status=2))])
+        with self.assertRaises(CommandError):
+            list(failing.run_lines("missing"))
+
+    def test_sudo_command(self):
+        for nopasswd in (False, True):
+            with self.subTest(nopasswd=nopasswd):
+                process = subprocess.run(["sh", "-c", sudo_command("sh -s")], input=b"secret\necho root\n",
+                                         capture_output=True, env=fake_sudo_env(nopasswd))
+                self.assertEqual((process.stdout, process.stderr, process.returncode), (b"root\n", b"", 0))
+
+        process = subprocess.run(["sh", "-c", sudo_command("sh -s")], input=b"wrong\necho root\n",
+                                 capture_output=True, env=fake_sudo_env())
+        self.assertNotEqual(process.returncode, 0)
+        self.assertNotIn(b"root", process.stdout)
+
+    def test_root_shell_nopasswd(self):
+        # sudo does not read the password, it must not reach the shell as a command
+        shell = RootShell(ShellClient(nopasswd=True), "secret")
+        result = shell.run("echo hello")
+        self.assertEqual((result.stdout, result.stderr), (b"hello\n", b""))
+        shell.close()
+
+        with self.assertRaises(CommandError):
+            RootShell(ShellClient(), "wrong").run("echo hello")
+
+    def test_root_shell(self):
+        shell = RootShell(ShellClient(), "secret")
+
+        result = shell.run("echo hello; echo oops >&2")
+        self.assertEqual((result.stdout, result.stderr, result.exit_status), (b"hello\n", b"oops\n", 0))
+        result = shell.run("printf partial; exit_code() { return 3; }; exit_code")
+        self.assertEqual((result.stdout, result.stderr, result.exit_status), (b"partial", b"", 3))
+        result = shell.run("cat")
+        self.assertEqual((result.stdout, result.stderr, result.exit_status), (b"", b"", 0))
+        self.assertTrue(shell.is_alive())
+
+        results = shell.run_many(["echo one", "false", "echo three >&2"])
+        self.assertEqual([r.stdout for r in results], [b"one\n", b"", b""])
+        self.assertEqual([r.exit_status for r in results], [0, 1, 0])
+        self.assertEqual(results[2].stderr, b"three\n")
+
+        shell.close()
+        self.assertFalse(shell.is_alive())
+        self.assertEqual(shell.run("echo again").stdout, b"again\n")
+        shell.close()
+
+    def test_batch(self):
+        commands = ["echo one", "printf two; echo err >&2", "test -e /nonexistent", "cat"]
+        script, markers = batch.script(commands, batch.new_token())
+        process = subprocess.run(["sh", "-s"], input=script.encode(), capture_output=True)
+
+        results = batch.split(commands, markers, process.stdout, process.stderr)
+        self.assertEqual([r.command for r in results], commands)
+        self.assertEqual([r.stdout for r in results], [b"one\n", b"two", b"", b""])
+        self.assertEqual([r.stderr for r in results], [b"", b"err\n", b"", b""])
+        self.assertEqual([r.ok for r in results], [True, True, False, True])
+
+        process = subprocess.run(["sh", "-s"], input=script.replace("cat", "exit 4").encode(), capture_output=True)
+        with self.assertRaises(CommandError):
+            batch.split(commands, markers, process.stdout, process.stderr)
+
+        self.assertEqual([r.stdout for r in ScriptedConnector({"a": b"a", "b": b"b"}).run_many(["a", "b"])], [b"a", b"b"])
+
+    def test_execute(self):
+        channel = ShellChannel()
+        channel.exec_command("sh -s")
+        channel.sendall(b"head -c 300000 /dev/zero >&2; echo done; exit 3\n")
+        channel.shutdown_write()
+
+        result = execute(channel, "noisy")
+        self.assertEqual((result.stdout, result.stderr_size, result.exit_status), (b"done\n", 300000, 3))
+        self.assertEqual(result.read(), b"done\n")
+        self.assertEqual(list(result), [b"done\n"])
+        self.assertFalse(result.ok)
+        with self.assertRaises(CommandError):
+            result.check()
+
+        channel = ShellChannel()
+        channel.exec_command("sh -s")
+        channel.sendall(b"sleep 5\n")
+        start = time.monotonic()
+        with self.assertRaises(CommandTimeout):
+            execute(channel, "sleep 5", timeout=0.2)
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertTrue(channel.closed)
+
+    def test_local(self):
+        connector = LocalConnector()
+
+        result = connector.run("echo hello; echo W: careful >&2; exit 2")
+        self.assertEqual((result.stdout, result.stderr, result.exit_status), (b"hello\n", b"W: careful\n", 2))
+        self.assertEqual(list(connector.run_lines("printf 'a\\nb\\n'; head -c 300000 /dev/zero >&2")), ["a", "b"])
+        self.assertEqual([r.exit_status for r in connector.run_many(["true", "false"])], [0, 1])
+
+        with self.assertRaises(CommandTimeout):
+            connector.run("sleep 5", timeout=0.2)
+
+        with self.assertRaises(CommandTimeout):
+            list(connector.run_lines("echo first; sleep 5", timeout=0.2))
+
+        # Lines already printed are handed out, the exit status is only known once they ran out
+        lines = connector.run_lines("echo a; echo gone >&2; exit 3")
+        self.assertEqual(next(lines), "a")
+        with self.assertRaisesRegex(CommandError, "exited with 3: gone"):
+            next(lines)
+
+    def test_local_sudo_nopasswd(self):
+        # A fake sudo on PATH stands in for the real one, as if not running as root
+        for nopasswd in (False, True):
+            with self.subTest(nopasswd=nopasswd), mock.patch.dict(os.environ, fake_sudo_env(nopasswd)), \
+                    mock.patch("pardus.connection.local_connector.os.geteuid", return_value=1000):
+                connector = LocalConnector(passwd="secret")
+                self.assertEqual(connector.sudo_run("cat; echo root").stdout, b"root\n")
+                self.assertEqual(list(connector.sudo_run_lines("cat; echo root")), ["root"])
+
+    @unittest.skipUnless(os.geteuid() == 0, "sudo_run needs a password unless running as root")
+    def test_local_sudo(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pardus", "raw.conf")
+            config = ConfigRaw(LocalConnector(), path, create=True)
+            config.data = "key = value"
+            self.assertEqual(ConfigRaw(LocalConnector(), path).data.strip(), "key = value")
+
+    def test_record_replay(self):
+        recorder = RecordingConnector(LocalConnector())
+        recorder.run("printf 'caf\\303\\251 \\377'; echo W: odd >&2; exit 4")
+        recorder.run("echo one")
+        recorder.run("echo two")
+        self.assertEqual(list(recorder.run_lines("printf 'x\\ny\\n'")), ["x", "y"])
+        with self.assertRaises(CommandError):
+            list(recorder.run_lines("echo half; exit 1"))
+
+        # A caller that stops early did not see the whole output, nothing is recorded
+        next(recorder.run_lines("echo early; echo late"))
+        self.assertEqual(len(recorder.recordings), 5)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "fixture.json")
+            recorder.save(path)
+            replay = ReplayConnector.from_file(path)
+
+        result = replay.run("printf 'caf\\303\\251 \\377'; echo W: odd >&2; exit 4")
+        self.assertEqual((result.stdout, result.stderr, result.exit_status), ("café ".encode() + b"\xff", b"W: odd\n", 4))
+        self.assertEqual(list(replay.run_lines("printf 'x\\ny\\n'")), ["x", "y"])
+        with self.assertRaises(CommandError):
+            list(replay.run_lines("echo half; exit 1"))
+
+        # Recordings of the same command are replayed in order, the last one keeps repeating
+        recordings = [fixture.encode("run", CommandResult("date", b"1\n")), fixture.encode("run", CommandResult("date", b"2\n"))]
+        replay = ReplayConnector.from_recordings(recordings)
+        self.assertEqual([replay.run("date").stdout for _ in range(3)], [b"1\n", b"2\n", b"2\n"])
+        self.assertEqual(list(replay.run_lines("date")), ["2"])
+
+        with self.assertRaises(NotFound):
+            replay.sudo_run("date")
+
+        # A batch is recorded as one round trip and replayed with one latency
+        recorder = RecordingConnector(LocalConnector())
+        self.assertEqual([r.exit_status for r in recorder.run_many(["echo a", "false"])], [0, 1])
+        self.assertEqual([(r["kind"], r["commands"]) for r in recorder.recordings], [("run_many", ["echo a", "false"])])
+        replay = ReplayConnector.from_recordings(recorder.recordings)
+        self.assertEqual([(r.stdout, r.exit_status) for r in replay.run_many(["echo a", "false"])], [(b"a\n", 0), (b"", 1)])
+        with self.assertRaises(NotFound):
+            replay.run("echo a")
+
+        batch_results = [CommandResult("one", duration=0.2), CommandResult("two", duration=0.2)]
+        slow = ReplayConnector.from_recordings([fixture.encode_batch("sudo_run_many", batch_results, 0.25)], replay_latency=True)
+        start = time.monotonic()
+        slow.sudo_run_many(["one", "two"])
+        self.assertTrue(0.25 <= time.monotonic() - start < 0.4)
+
+        # Fixtures recorded command by command still answer a batch
+        replay = ReplayConnector.from_recordings(recordings)
+        self.assertEqual([r.stdout for r in replay.run_many(["date", "date"])], [b"1\n", b"2\n"])
+
+        slow = ReplayConnector.from_recordings([fixture.encode("run", CommandResult("slow", duration=0.3))], replay_latency=True)
+        start = time.monotonic()
+        slow.run("slow")
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+        with self.assertRaises(CommandTimeout):
+            slow.run("slow", timeout=0.1)
+
+    def test_pool(self):
+        pool = SSHPool(max_connections=2)
+        self.assertEqual(len(pool), 0)
+        self.assertNotIn(pool.key("address", 22, "user", "passwd"), pool)
+
+        with self.assertRaises(ValueError):
+            SSHPool(max_connections=0)
+
+    def test_pool_reuse(self):
+        pool = SSHPool(max_connections=2)
+        with mock.patch.object(pool, "_SSHPool__open", FakeClient):
+            client = pool.acquire("address", 22, "user", "passwd")
+            self.assertIs(pool.acquire("address", 22, "user", "passwd"), client)
+            self.assertIn(pool.key("address", 22, "user", "passwd"), pool)
+
+            # Another password must authenticate on its own instead of getting the pooled client
+            other = pool.acquire("address", 22, "user", "wrong")
+            self.assertIsNot(other, client)
+            self.assertEqual(other.credentials[3], "wrong")
+
+            pool.release(client)
+            pool.release(client)
+            self.assertEqual(len(pool), 2)
+            self.assertFalse(client.closed)
+
+            # Unknown clients are closed on release
+            stray = FakeClient("stray", 22, "user", "passwd")
+            pool.release(stray)
+            self.assertTrue(stray.closed)
+
+            pool.close()
+            self.assertEqual(len(pool), 0)
+            self.assertTrue(client.closed and other.closed)
+
+    def test_pool_idle(self):
+        pool = SSHPool(max_connections=2, idle_timeout=0.01)
+        with mock.patch.object(pool, "_SSHPool__open", FakeClient):
+            busy = pool.acquire("busy", 22, "user", "passwd")
+            idle = pool.acquire("idle", 22, "user", "passwd")
+            pool.release(idle)
+
+            time.sleep(0.02)
+            pool.evict_idle()
+            self.assertTrue(idle.closed)
+            self.assertFalse(busy.closed)
+            self.assertEqual(len(pool), 1)
+
+    def test_pool_exhausted(self):
+        pool = SSHPool(max_connections=2)
+        with mock.patch.object(pool, "_SSHPool__open", FakeClient):
+            first = pool.acquire("first", 22, "user", "passwd")
+            pool.acquire("second", 22, "user", "passwd")
+            with self.assertRaises(PoolExhausted):
+                pool.acquire("third", 22, "user", "passwd")
+
+            # The oldest unused connection makes room
+            pool.release(first)
+            third = pool.acquire("third", 22, "user", "passwd")
+            self.assertEqual(third.credentials[0], "third")
+            self.assertTrue(first.closed)
+            self.assertEqual(len(pool), 2)
+
+    def test_pool_dead(self):
+        pool = SSHPool(max_connections=2)
+        with mock.patch.object(pool, "_SSHPool__open", FakeClient):
+            dead = pool.acquire("address", 22, "user", "passwd")
+            dead.transport.active = False
+
+            client = pool.acquire("address", 22, "user", "passwd")
+            self.assertIsNot(client, dead)
+            self.assertTrue(dead.closed)
+            self.assertEqual(len(pool), 1)
+
+            # A transport failing the keepalive is dead as well
+            client.transport.send_ignore = mock.Mock(side_effect=EOFError())
+            self.assertIsNot(pool.acquire("address", 22, "user", "passwd"), client)
+            self.assertTrue(client.closed)
+
+    def test_async_run(self):
+        async def fleet():
+            semaphore = asyncio.Semaphore(50)
+            replays = [ReplayConnector(results, replay_latency=True) for _ in range(50)]
+            connectors = [AsyncSSHConnector(replay, semaphore=semaphore) for replay in replays]
+            return await asyncio.gather(*(connector.run(f"echo {i}") for i, connector in enumerate(connectors)))
+
+        results = fixture.index([fixture.encode("run", CommandResult(f"echo {i}", f"{i}\n".encode(), duration=0.2)) for i in range(50)])
+        start = time.monotonic()
+        outputs = asyncio.run(fleet())
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual([output.read() for output in outputs], [f"{i}\n".encode() for i in range(50)])
+
 
 if __name__ == '__main__':
     unittest.main()
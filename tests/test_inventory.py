@@ -0,0 +1,113 @@
+import unittest
+
+from pardus import Inventory
+from pardus.apt.package_index import PACKAGE_INDEXES
+
+from tests.helpers import ScriptedConnector
+
+APT_LIST = b"""Listing...
+bash/jammy,now 5.1-6ubuntu1 amd64 [installed]
+openssl/jammy-security 3.0.2-0ubuntu1.15 amd64 [upgradable from: 3.0.2-0ubuntu1.10]
+vim/jammy 2:8.2.3995-1ubuntu2 amd64
+"""
+
+SOURCES = b"""deb http://archive.ubuntu.com/ubuntu jammy main restricted
+deb [arch=amd64] http://security.ubuntu.com/ubuntu jammy-security main
+"""
+
+OS_RELEASE = b"""PRETTY_NAME="Pardus 23.0"
+ID=pardus
+VERSION_ID="23.0"
+"""
+
+
+def host(address, installed, units, fingerprint="f00d"):
+    return ScriptedConnector({
+        "{ dpkg": f"{fingerprint}  -\n".encode(),
+        "dpkg-query": installed,
+        "apt list": APT_LIST,
+        "grep --no-filename": SOURCES,
+        "systemctl list-units": units,
+        "hostname": address.encode(),
+        "uname -r": b"6.1.0-13-amd64\n",
+        "cat /etc/os-release": OS_RELEASE,
+    }, address=address)
+
+
+class TestInventory(unittest.TestCase):
+    def setUp(self):
+        PACKAGE_INDEXES.clear()
+        self.connectors = [
+            host("host1", b"bash\t5.1-6ubuntu1\tinstalled\tamd64\nopenssl\t3.0.2-0ubuntu1.10\tinstalled\tamd64\n",
+                          b"ssh.service loaded active running OpenBSD Secure Shell server\n"),
+            host("host2", b"bash\t5.1-6ubuntu1\tinstalled\tamd64\nopenssl\t3.0.2-0ubuntu1.15\tinstalled\tamd64\n",
+                          b"ssh.service loaded failed failed OpenBSD Secure Shell server\n"),
+        ]
+        self.inventory = Inventory(max_age=3600)
+
+    def tearDown(self):
+        self.inventory.close()
+
+    def test_queries(self):
+        results = self.inventory.refresh(self.connectors)
+        self.assertEqual({host: result.value for host, result in results.items()}, {"host1": True, "host2": True})
+
+        self.assertEqual(self.inventory.hosts(), ["host1", "host2"])
+        self.assertEqual(self.inventory.facts("host1")["pretty_name"], "Pardus 23.0")
+        self.assertEqual(self.inventory.facts("host2")["kernel"], "6.1.0-13-amd64")
+        self.assertEqual(self.inventory.installed("openssl"),
+                         {"host1": "3.0.2-0ubuntu1.10", "host2": "3.0.2-0ubuntu1.15"})
+        self.assertEqual(self.inventory.older_than("openssl", "3.0.2-0ubuntu1.12"), {"host1": "3.0.2-0ubuntu1.10"})
+        self.assertEqual(self.inventory.older_than("vim", "9.0"), {})
+        self.assertEqual(self.inventory.upgradable(), {"host1": ["openssl"]})
+        # Installed above the candidate, the strings differ but nothing is upgradable
+        with self.inventory.connection:
+            self.inventory.connection.execute(
+                "UPDATE packages SET installed = ? WHERE host = ? AND package = ?", ("2:9.0.1378-2", "host2", "vim")
+            )
+        self.assertEqual(self.inventory.upgradable(), {"host1": ["openssl"]})
+        self.assertEqual(self.inventory.upgradable("vim"), {})
+        self.assertEqual(self.inventory.failed_units(), {"host2": ["ssh.service"]})
+        self.assertEqual(self.inventory.repositories("host2")[1]["options"], {"arch": "amd64"})
+
+        ordered = self.inventory.query(
+            "SELECT installed FROM packages WHERE package = 'openssl' ORDER BY installed COLLATE DEBVERSION DESC"
+        )
+        self.assertEqual(ordered[0], ("3.0.2-0ubuntu1.15",))
+
+    def test_incremental_refresh(self):
+        self.inventory.refresh(self.connectors)
+        for connector in self.connectors:
+            connector.commands.clear()
+
+        self.connectors[1].outputs["{ dpkg"] = b"beef  -\n"
+        results = self.inventory.refresh(self.connectors)
+        self.assertFalse(results["host1"].value)
+        self.assertTrue(results["host2"].value)
+        self.assertEqual(len(self.connectors[0].commands), 1)
+
+        results = self.inventory.refresh(self.connectors, force=True)
+        self.assertTrue(all(result.value for result in results.values()))
+
+        self.inventory.forget("host1")
+        self.assertEqual(self.inventory.hosts(), ["host2"])
+        self.assertEqual(self.inventory.query("SELECT COUNT(*) FROM packages WHERE host = 'host1'"), [(0,)])
+
+    def test_shared_address(self):
+        # Two hosts behind one address, reached on different ports
+        connectors = [host("10.0.0.1", b"bash\t5.1-6ubuntu1\tinstalled\tamd64\n", b""),
+                      host("10.0.0.1", b"bash\t5.2-1\tinstalled\tamd64\n", b"")]
+        for connector, port in zip(connectors, (22, 2222)):
+            connector.user, connector.port = "root", port
+
+        results = self.inventory.refresh(connectors)
+        self.assertEqual(list(results), ["root@10.0.0.1:22", "root@10.0.0.1:2222"])
+        self.assertEqual(self.inventory.installed("bash"), {"root@10.0.0.1:22": "5.1-6ubuntu1", "root@10.0.0.1:2222": "5.2-1"})
+
+        connectors[1].port = 22
+        with self.assertRaises(ValueError):
+            self.inventory.refresh(connectors)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pardus import Apt
+from pardus.apt.fingerprint import FingerprintCache
+from pardus.apt.search_index import SearchIndex
+
+from tests.helpers import ScriptedConnector
+
+APT_CACHE_SEARCH = b"""bash - GNU Bourne Again SHell
+bash-builtins - Bash loadable builtins - headers & examples
+htop - interactive processes viewer
+libssl3 - Secure Sockets Layer toolkit - shared libraries
+openssl - Secure Sockets Layer toolkit - cryptographic utility
+"""
+
+
+def host(fingerprint):
+    return ScriptedConnector({"apt-cache search": APT_CACHE_SEARCH, "": f"{fingerprint}  -\n".encode()})
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = Apt(host("a")).search_index(FingerprintCache())
+
+    def names(self, hits):
+        return [hit["name"] for hit in hits]
+
+    def test_token(self):
+        self.assertEqual(self.names(self.index.token("bash")), ["bash", "bash-builtins"])
+        self.assertEqual(self.names(self.index.token("Sockets toolkit")), ["libssl3", "openssl"])
+        self.assertEqual(self.names(self.index.token("sock")), [])
+        self.assertEqual(self.names(self.index.token("")), [])
+
+    def test_prefix(self):
+        self.assertEqual(self.names(self.index.prefix("sock tool")), ["libssl3", "openssl"])
+        self.assertEqual(self.names(self.index.prefix("sock lib")), ["libssl3"])
+        self.assertEqual(self.names(self.index.prefix("ba", limit=1)), ["bash"])
+        self.assertEqual(self.index.prefix("interactive proc")[0]["description"], "interactive processes viewer")
+
+    def test_substring(self):
+        self.assertEqual(self.names(self.index.substring("SSL")), ["libssl3", "openssl"])
+        self.assertEqual(self.names(self.index.substring("built")), ["bash-builtins"])
+        self.assertEqual(len(self.index), 5)
+
+    def test_shared_by_fingerprint(self):
+        cache = FingerprintCache(max_size=2)
+        connectors = [host("a") for _ in range(20)] + [host("b")]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            indexes = list(executor.map(lambda connector: Apt(connector).search_index(cache), connectors))
+
+        self.assertEqual(len({id(index) for index in indexes[:20]}), 1)
+        self.assertIsNot(indexes[0], indexes[-1])
+        built = [c for c in connectors if any(command.startswith("apt-cache search") for command in c.commands)]
+        self.assertEqual(len(built), 2)
+
+        Apt(host("c")).search_index(cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_empty(self):
+        index = SearchIndex([])
+        self.assertEqual(index.prefix("a"), [])
+        self.assertEqual(index.substring("a"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from datetime import datetime
+
+from pardus import Service
+from pardus.service.service import NOT_FOUND_MARK
+from pardus.utils.error import NotFound
+
+from tests.helpers import ScriptedConnector
+
+UNITS = b"""cron.service loaded active running Regular background program processing daemon
+ssh.service loaded active running OpenBSD Secure Shell server
+ufw.service loaded inactive dead Uncomplicated firewall
+"""
+
+JOURNAL = b"""-- Journal begins at 2024-01-01T10:00:00+0300 --
+2024-01-01T10:00:00+0300 pardus systemd[1]: Starting OpenBSD Secure Shell server...
+2024-01-01T10:00:01+0300 pardus systemd[1]: Started OpenBSD Secure Shell server.
+"""
+
+
+class TestService(unittest.TestCase):
+    def test_list_records(self):
+        service = Service(ScriptedConnector({"": UNITS}))
+
+        records = service.list_records()
+        self.assertEqual([r.as_dict() for r in records], service.list())
+        self.assertEqual(records[2].description, "Uncomplicated firewall")
+        self.assertIs(records[0].active, records[1].active)
+
+    def test_log_records(self):
+        service = Service(ScriptedConnector({"": JOURNAL}))
+
+        records = service.log_records("ssh")
+        self.assertEqual([r.as_dict() for r in records], service.logs("ssh"))
+        self.assertEqual(records[1].message, "Started OpenBSD Secure Shell server.")
+        self.assertEqual(records[0].timestamp, datetime.strptime("2024-01-01T10:00:00+0300", "%Y-%m-%dT%H:%M:%S%z"))
+
+        with self.assertRaises(NotFound):
+            Service(ScriptedConnector({"": NOT_FOUND_MARK.encode()})).log_records("ssh")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from pardus import Service, ServiceList
+from pardus.service.service import NOT_FOUND_MARK
+from pardus.utils.error import NotFound, NumberOfElementsError
+
+from tests.helpers import ScriptedConnector
+
+
+class TestServiceList(unittest.TestCase):
+    def setUp(self):
+        self.connectors = [ScriptedConnector(), ScriptedConnector(), ScriptedConnector({"": NOT_FOUND_MARK.encode()})]
+        self.service_list = ServiceList.from_connections(self.connectors)
+
+    def test_create(self):
+        with self.assertRaises(NumberOfElementsError):
+            ServiceList([])
+
+    def test_restart(self):
+        results = self.service_list.restart("ssh.service")
+
+        for connector in self.connectors:
+            self.assertEqual(len(connector.commands), 1)
+            self.assertIn("systemctl restart ssh.service", connector.commands[0])
+
+        self.assertTrue(results[self.service_list[0]].ok)
+        self.assertIsInstance(results[self.service_list[2]].exception, NotFound)
+
+    def test_activate(self):
+        results = self.service_list.activate("ssh.service")
+        self.assertIn("systemctl start ssh.service", self.connectors[0].commands[0])
+        self.assertEqual(len(results), 3)
+
+    def test_get_element(self):
+        self.assertIsInstance(self.service_list[0], Service)
+        self.assertEqual(len(self.service_list[1:]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
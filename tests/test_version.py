@@ -0,0 +1,83 @@
+import unittest
+
+from pardus.apt.version import check_versions, compare_versions, newest, split_version, version_key
+
+# Taken from the version tests of dpkg (lib/dpkg/t/t-version.c and the deb-version examples)
+VECTORS = [
+    ("1.0", "1.0", 0),
+    ("0:1.0", "1.0", 0),
+    ("0:0-0", "0:0", 0),
+    ("0:0-00", "0:0-0", 0),
+    ("1:0", "0:0", 1),
+    ("0:1", "0:0", 1),
+    ("0:0-1", "0:0-0", 1),
+    ("0:a", "0:0", 1),
+    ("0:0~", "0:0", -1),
+    ("0:0~~", "0:0~", -1),
+    ("1.0~~", "1.0~~a", -1),
+    ("1.0~~a", "1.0~", -1),
+    ("1.0~", "1.0", -1),
+    ("1.0", "1.0a", -1),
+    ("1.0~beta1~svn1245", "1.0~beta1", -1),
+    ("1.0~beta1", "1.0", -1),
+    ("1.0a", "1.0.a", -1),
+    ("1.0", "1.0+b1", -1),
+    ("1.0-1", "1.0-1ubuntu1", -1),
+    ("1.0-1~bpo1", "1.0-1", -1),
+    ("1.0", "1.0-1", -1),
+    ("1.2.3", "1.2.10", -1),
+    ("2.30", "2.4", 1),
+    ("A", "a", -1),
+    ("7.6p2-4", "7.6-0", 1),
+    ("1.0.3-3", "1.0-1", 1),
+    ("1.3", "1.2.2-2", 1),
+    ("0-pre", "0-pre", 0),
+    ("0-pre", "0-pree", -1),
+    ("1.1.6r2-2", "1.1.6r-1", 1),
+    ("2.6b2-1", "2.6b-2", 1),
+    ("98.1p5-1", "98.1-pre2-b6-2", -1),
+    ("0.4a6-2", "0.4-1", 1),
+    ("1:3.0.5-2", "1:3.0.5.1", -1),
+    ("10.3", "1:0.4", -1),
+    ("1:1.25-4", "1:1.25-8", -1),
+    ("0:1.18.36", "1.18.36", 0),
+    ("1.18.36", "1.18.35", 1),
+    ("0:1.18.36", "1.18.35", 1),
+    ("9:1.18.36:5.4-20", "10:0.5.1-22", -1),
+    ("9:1.18.36:5.4-20", "9:1.18.37:4.3-22", -1),
+    ("9:1.18.36-0.17.35-18", "9:1.18.36-19", 1),
+    ("1:1.2.13-3", "1:1.2.13-3.1", -1),
+    ("2.0.7pre1-4", "2.0.7r-1", -1),
+]
+
+
+class TestVersion(unittest.TestCase):
+    def test_compare_versions(self):
+        for first, second, expected in VECTORS:
+            with self.subTest(first=first, second=second):
+                self.assertEqual(compare_versions(first, second), expected)
+                self.assertEqual(compare_versions(second, first), -expected)
+
+    def test_check_versions(self):
+        self.assertTrue(check_versions("1.0~rc1", "lt", "1.0"))
+        self.assertTrue(check_versions("1.0", ">=", "1.0-0"))
+        self.assertFalse(check_versions("2:1.0", "<<", "1:9.9"))
+        with self.assertRaises(ValueError):
+            check_versions("1.0", "older", "2.0")
+
+    def test_split_version(self):
+        self.assertEqual(split_version("2:1.18.36-0.17-18"), (2, "1.18.36-0.17", "18"))
+        self.assertEqual(split_version("1.0"), (0, "1.0", ""))
+        for version in ["", "a:1.0", "1:-1"]:
+            with self.assertRaises(ValueError):
+                split_version(version)
+
+    def test_sort(self):
+        versions = ["1.0", "1.0~rc1", "1:0.1", "1.0-1", "0.9", "1.0+b1"]
+        self.assertEqual(sorted(versions, key=version_key), ["0.9", "1.0~rc1", "1.0", "1.0-1", "1.0+b1", "1:0.1"])
+        self.assertEqual(newest(versions), "1:0.1")
+        self.assertIsNone(newest([]))
+
+
+if __name__ == '__main__':
+    unittest.main()